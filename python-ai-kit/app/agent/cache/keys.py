@@ -0,0 +1,6 @@
+import hashlib
+
+
+def content_hash(*parts: str) -> str:
+    """Short, stable hash of the given strings."""
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()[:16]
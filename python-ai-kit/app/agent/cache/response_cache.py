@@ -0,0 +1,61 @@
+import time
+from typing import Any
+
+from app.agent.cache.backends import CacheBackend, build_cache_backend
+from app.agent.cache.keys import content_hash
+from app.config import settings
+from app.utils.metrics import metrics
+from app.utils.text_vectors import normalize_text
+
+
+class ResponseCache:
+    """Cache of complete workflow responses for messages sent without chat history.
+
+    Keys cover the normalized message, the language and a fingerprint of every agent
+    in the manager (model string, instructions hash, tools and MCP URLs), so changing
+    the model, a prompt or the enabled tools never serves a stale response.
+    """
+
+    def __init__(self, backend: CacheBackend) -> None:
+        self.backend = backend
+
+    @staticmethod
+    def fingerprint(agents: dict[str, Any]) -> str:
+        """Hash the configuration of the agents taking part in the workflow.
+
+        Args:
+            agents: Graph deps, as returned by ``AgentManager.to_deps()``
+
+        Returns:
+            Hash of model strings, instructions, tools and MCP URLs of all agents
+        """
+        parts = [
+            f"{name}|{agent.model_string}|{agent.instructions_hash}|"
+            f"{','.join(sorted(agent.tool_names))}|{','.join(sorted(agent.mcp_urls))}"
+            for name, agent in sorted(agents.items())
+            if hasattr(agent, "instructions_hash")
+        ]
+        return content_hash(*parts)
+
+    def key(self, message: str, language: str, fingerprint: str) -> str:
+        return f"response:{fingerprint}:{content_hash(language, normalize_text(message))}"
+
+    async def get(self, key: str) -> tuple[str, int] | None:
+        """Return the cached response and its age in seconds."""
+        if (entry := await self.backend.get(key)) is None:
+            metrics.inc("response_cache_lookups_total", outcome="miss")
+            return None
+        metrics.inc("response_cache_lookups_total", outcome="hit")
+        return entry["response"], int(time.time() - entry["created_at"])
+
+    async def set(self, key: str, response: str) -> None:
+        await self.backend.set(key, {"response": response, "created_at": time.time()})
+
+
+response_cache = ResponseCache(
+    build_cache_backend(
+        "response",
+        ttl=settings.response_cache_ttl,
+        max_size=settings.response_cache_max_size,
+    )
+)
@@ -0,0 +1,80 @@
+from collections import Counter, OrderedDict
+from typing import Any
+
+from app.agent.cache.backends import CacheBackend, build_cache_backend
+from app.agent.cache.keys import content_hash
+from app.agent.workflows.instrumentation import record_cache_hit
+from app.config import settings
+from app.utils.metrics import metrics
+from app.utils.text_vectors import char_ngrams, cosine_similarity, normalize_text
+
+
+class RoutingCache:
+    """Cache of router decisions keyed by the normalized message.
+
+    Keys include a hash of the router instructions and model, so changing the
+    routing prompt invalidates previous decisions. With ``similarity_threshold``
+    set, messages whose character n-gram vectors are close enough to a recently
+    cached message reuse its decision as well.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        instructions: str,
+        model: str,
+        similarity_threshold: float | None = None,
+        max_vectors: int = 1_000,
+    ) -> None:
+        self.backend = backend
+        self.namespace = content_hash(instructions, model)
+        self.similarity_threshold = similarity_threshold
+        self.max_vectors = max_vectors
+        self._vectors: OrderedDict[str, Counter[str]] = OrderedDict()
+
+    def key(self, message: str) -> str:
+        return f"route:{self.namespace}:{content_hash(normalize_text(message))}"
+
+    async def get(self, message: str) -> dict[str, Any] | None:
+        """Return the cached decision for the message, if any."""
+        key = self.key(message)
+        if (decision := await self.backend.get(key)) is not None:
+            metrics.inc("routing_cache_lookups_total", outcome="hit")
+            record_cache_hit("routing")
+            return decision
+
+        if self.similarity_threshold is not None and (similar_key := self._find_similar(message)):
+            if (decision := await self.backend.get(similar_key)) is not None:
+                metrics.inc("routing_cache_lookups_total", outcome="similar_hit")
+                record_cache_hit("routing")
+                return decision
+            # expired in the backend
+            self._vectors.pop(similar_key, None)
+
+        metrics.inc("routing_cache_lookups_total", outcome="miss")
+        return None
+
+    async def set(self, message: str, decision: dict[str, Any]) -> None:
+        """Cache the decision made for the message."""
+        key = self.key(message)
+        await self.backend.set(key, decision)
+        if self.similarity_threshold is not None:
+            self._vectors[key] = char_ngrams(message)
+            self._vectors.move_to_end(key)
+            while len(self._vectors) > self.max_vectors:
+                self._vectors.popitem(last=False)
+
+    def _find_similar(self, message: str) -> str | None:
+        vector = char_ngrams(message)
+        best_key, best_score = None, self.similarity_threshold or 0.0
+        for key, cached in self._vectors.items():
+            if (score := cosine_similarity(vector, cached)) >= best_score:
+                best_key, best_score = key, score
+        return best_key
+
+
+routing_cache_backend = build_cache_backend(
+    "routing",
+    ttl=settings.routing_cache_ttl,
+    max_size=settings.routing_cache_max_size,
+)
@@ -1,14 +1,68 @@
+import inspect
 from abc import ABC
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
-from typing import Any, Callable, Type
+from typing import Any, Callable, Literal, Type
 
 from pydantic_ai import Agent, RunContext, UsageLimits
-from pydantic_ai.mcp import MCPToolset
-from pydantic_ai.messages import ModelMessage
+from pydantic_ai.messages import ModelMessage, ModelResponse, TextPart, ToolCallPart, UserPromptPart
+from pydantic_ai.models import Model
+from pydantic_ai.result import StreamedRunResult
 from pydantic_ai.run import AgentRunResult
-
+from pydantic_ai.settings import CacheConfig, ModelSettings
+from pydantic_ai.usage import RunUsage
+
+from app.agent.cache.keys import content_hash
+from app.agent.engines.rate_limiter import RateLimitedModel, provider_limiters
+from app.agent.prompts.agent_prompts import RESPONSE_LANGUAGE_PROMPT
+from app.agent.prompts.registry import prompt_registry
+from app.agent.tools.side_effects import has_side_effects
+from app.agent.toolsets.mcp import mcp_connections
+from app.agent.workflows.instrumentation import record_usage as record_node_usage
 from app.config import settings
 from app.utils.llm_vendor import set_api_key_for_vendor
+from app.utils.metrics import metrics
+
+type PromptCaching = Literal["off", "prefix", "conversation"]
+
+
+def _instructions_source(instructions: str | Callable[..., str] | None) -> str:
+    """Text identifying the instructions: the text itself, the template hash of registry instructions,
+    or a callable's source and the prompt constants it uses."""
+    if instructions is None or isinstance(instructions, str):
+        return instructions or ""
+    if (prompt_hash := getattr(instructions, "prompt_hash", None)) is not None:
+        return prompt_hash
+    try:
+        source = inspect.getsource(instructions)
+    except (OSError, TypeError):
+        source = getattr(instructions, "__qualname__", repr(instructions))
+    namespace = getattr(instructions, "__globals__", {})
+    constants = [
+        value
+        for name in getattr(getattr(instructions, "__code__", None), "co_names", ())
+        if isinstance(value := namespace.get(name), str)
+    ]
+    return "\n".join([source, *constants])
+
+
+def prompt_cache_settings(
+    caching: PromptCaching, retention: Literal["5m", "30m", "1h"] | None = settings.prompt_cache_retention
+) -> ModelSettings | None:
+    """Model settings marking cacheable prompt segments for the provider.
+
+    "prefix" caches tool definitions and static instructions, "conversation" also the
+    message history. pydantic-ai places the cache-control breakpoints where the provider
+    supports them (Anthropic, Bedrock, OpenRouter, recent OpenAI models) and ignores
+    the setting elsewhere; providers caching implicitly (e.g. OpenAI, Gemini) do so anyway.
+    """
+    if caching == "off":
+        return None
+    config = CacheConfig(messages=caching == "conversation")
+    if retention is not None:
+        config["retention"] = retention
+    return ModelSettings(cache=config)
 
 
 @dataclass
@@ -36,11 +90,11 @@ class BaseAgent(ABC):
         instructions: str | Callable[..., str] | None = None,
         mcp_urls: list[str] | None = None,
         usage_limits: UsageLimits | None = None,
+        prompt_caching: PromptCaching = settings.prompt_caching,
         **kwargs,
     ) -> None:
         self.language = language
         self.verbose = verbose
-        self.chat_history: list[ModelMessage] = []
         self.mcp_urls = mcp_urls or []
         self.usage_limits = usage_limits
 
@@ -48,6 +102,14 @@ class BaseAgent(ABC):
 
         final_instructions = system_prompt or instructions
         model_string = f"{llm_vendor}:{llm_model}"
+        self.model_string = model_string
+        self.limiter = provider_limiters.get(model_string)
+        language_instructions = prompt_registry.instructions(RESPONSE_LANGUAGE_PROMPT.name)
+        self.instructions_hash = content_hash(
+            _instructions_source(final_instructions), _instructions_source(language_instructions)
+        )
+        self.tool_names = [tool.__name__ for tool in tool_list or []]
+        self._pure_tool_names = {tool.__name__ for tool in tool_list or [] if not has_side_effects(tool)}
 
         toolsets = []
         if self.mcp_urls:
@@ -58,8 +120,8 @@ class BaseAgent(ABC):
                             print(f"Invalid MCP URL format: {mcp_url}")
                         continue
 
-                    mcp_toolset = MCPToolset(mcp_url)
-                    toolsets.append(mcp_toolset)
+                    # sessions are shared by all agents connected to the server
+                    toolsets.append(mcp_connections.toolset(mcp_url))
                     if self.verbose:
                         print(f"MCP server enabled: {mcp_url}")
                 except Exception as e:
@@ -67,35 +129,126 @@ class BaseAgent(ABC):
                         print(f"Failed to initialize MCP server {mcp_url}: {e}")
                     continue
 
+        model: Model | str = model_string
+        if llm_vendor == "fake":
+            # load-testing stand-in, imported only when used
+            from app.agent.engines.fake_model import FakeModel
+
+            model = FakeModel()
+
         self.agent: Agent[Any, Any] = Agent(
-            model_string,
+            RateLimitedModel(model, self.limiter),
             tools=tool_list or [],
             deps_type=deps_type,
             toolsets=toolsets or None,
             instructions=final_instructions,
             output_type=output_type if output_type is not None else str,
+            model_settings=prompt_cache_settings(prompt_caching),
+            # recorded on the agent run span, so traces show which prompt version produced a response
+            metadata=lambda ctx: {"instructions_hash": self.instructions_hash},
+        )
+        # static instructions (strings) are sent first and end the cached prefix, dynamic ones
+        # (functions, such as the language line) follow them and are not cached
+        self.agent.instructions(language_instructions)
+
+    def add_instructions(self, instructions: Callable[[RunContext[Any]], str]) -> None:
+        """Append dynamic instructions (e.g. ``prompt_registry.instructions(name)``) and cover them by the hash."""
+        self.agent.instructions(instructions)
+        self.instructions_hash = content_hash(self.instructions_hash, _instructions_source(instructions))
+
+    def record_usage(self, usage: RunUsage) -> None:
+        """Count the tokens of a run, including the input tokens read from and written to the prompt cache."""
+        labels = {"agent": type(self).__name__, "model": self.model_string}
+        metrics.inc("llm_input_tokens_total", usage.input_tokens, **labels)
+        metrics.inc("llm_output_tokens_total", usage.output_tokens, **labels)
+        metrics.inc("llm_cache_read_tokens_total", usage.cache_read_tokens, **labels)
+        metrics.inc("llm_cache_write_tokens_total", usage.cache_write_tokens, **labels)
+        record_node_usage(usage)
+
+    def has_side_effects(self, tool_names: list[str]) -> bool:
+        """Check whether any of the called tools may have changed external state.
+
+        Tools marked with ``@side_effects`` and tools not registered locally
+        (e.g. provided by MCP servers) are treated as having side effects.
+        """
+        return any(name not in self._pure_tool_names for name in tool_names)
+
+    @staticmethod
+    def called_tools(messages: list[ModelMessage]) -> list[str]:
+        """Names of the function tools called in the given messages."""
+        return [
+            part.tool_name
+            for message in messages
+            if isinstance(message, ModelResponse)
+            for part in message.parts
+            if isinstance(part, ToolCallPart) and not part.tool_name.startswith("final_result")
+        ]
+
+    @staticmethod
+    def message_text(message: ModelMessage) -> str:
+        """Concatenated user prompt / text parts of a message."""
+        return "\n".join(
+            part.content
+            for part in message.parts
+            if isinstance(part, (UserPromptPart, TextPart)) and isinstance(part.content, str)
         )
 
-        @self.agent.instructions
-        def add_language_context(ctx: RunContext[BaseAgentDeps]) -> str:
-            return f"Please respond in {ctx.deps.language} language."
+    async def run_agent(self, user_prompt: str, **kwargs: Any) -> AgentRunResult:
+        """Run the agent and record its token usage; each model request goes through the provider limiter."""
+        result = await self.agent.run(user_prompt, **kwargs)
+        self.record_usage(result.usage)
+        return result
+
+    @asynccontextmanager
+    async def run_agent_stream(self, user_prompt: str, **kwargs: Any) -> AsyncIterator[StreamedRunResult]:
+        """Stream an agent run and record its token usage; each model request goes through the provider limiter."""
+        async with self.agent.run_stream(user_prompt, **kwargs) as result:
+            yield result
+        self.record_usage(result.usage)
 
     async def generate_response(
         self,
         query: str,
         chat_history: list[ModelMessage],
+        usage: RunUsage | None = None,
     ) -> AgentRunResult:
-        """Generate response using Pydantic AI agent."""
+        """Generate response using Pydantic AI agent.
+
+        Tokens are added to ``usage`` as requests complete, so they stay readable if the run is cancelled.
+        """
         deps = BaseAgentDeps(language=self.language)
 
-        result = await self.agent.run(
+        result = await self.run_agent(
             query,
             message_history=chat_history,
             deps=deps,
             usage_limits=self.usage_limits,
+            usage=usage,
         )
 
         if self.verbose:
-            print(f"Usage: {result.usage}")
+            print(f"Usage: {result.usage} (cached input tokens: {result.usage.cache_read_tokens})")
 
         return result
+
+    async def stream_response(
+        self,
+        query: str,
+        chat_history: list[ModelMessage],
+        usage: RunUsage | None = None,
+    ) -> AsyncIterator[str]:
+        """Stream response text deltas using Pydantic AI agent."""
+        deps = BaseAgentDeps(language=self.language)
+
+        async with self.run_agent_stream(
+            query,
+            message_history=chat_history,
+            deps=deps,
+            usage_limits=self.usage_limits,
+            usage=usage,
+        ) as result:
+            async for delta in result.stream_text(delta=True):
+                yield delta
+
+        if self.verbose:
+            print(f"Usage: {result.usage} (cached input tokens: {result.usage.cache_read_tokens})")
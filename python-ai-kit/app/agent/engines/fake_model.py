@@ -0,0 +1,189 @@
+import asyncio
+import json
+import re
+import zlib
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any
+from urllib.parse import urlsplit
+
+from pydantic_ai.messages import (
+    ModelMessage,
+    ModelRequest,
+    ModelResponse,
+    ModelResponsePart,
+    TextPart,
+    ToolCallPart,
+    ToolReturnPart,
+    UserPromptPart,
+)
+from pydantic_ai.models.function import AgentInfo, DeltaToolCall, DeltaToolCalls, FunctionModel
+from pydantic_ai.toolsets import FunctionToolset
+from pydantic_ai.usage import RequestUsage
+
+from app.config import settings
+
+VOCABULARY = [
+    "the",
+    "agent",
+    "answer",
+    "request",
+    "model",
+    "result",
+    "tool",
+    "message",
+    "workflow",
+    "response",
+    "user",
+    "context",
+    "value",
+    "system",
+    "data",
+    "query",
+    "step",
+    "node",
+    "token",
+    "stream",
+]
+
+SENTENCE_WORDS = 12
+
+
+def fake_value(schema: dict[str, Any]) -> Any:
+    """Smallest deterministic value matching a JSON schema (enough for flat output and tool schemas)."""
+    if "enum" in schema:
+        return schema["enum"][0]
+    if "const" in schema:
+        return schema["const"]
+    if options := schema.get("anyOf") or schema.get("oneOf"):
+        return fake_value(options[0])
+    match schema.get("type"):
+        case "integer":
+            return schema.get("minimum", 1)
+        case "number":
+            return schema.get("minimum", 1.0)
+        case "boolean":
+            return False
+        case "array":
+            return []
+        case "object":
+            properties = schema.get("properties", {})
+            return {name: fake_value(properties[name]) for name in schema.get("required", [])}
+        case "null":
+            return None
+    return "fake"
+
+
+class FakeModel(FunctionModel):
+    """Deterministic local stand-in for an LLM provider, used with ``AI_PROVIDER=fake``.
+
+    Answers after ``latency`` seconds with ``output_words`` words derived from the user
+    prompt; streamed answers arrive in chunks of ``chunk_words`` words, ``chunk_delay``
+    seconds apart. Structured outputs get the smallest arguments valid for their schema,
+    and the first ``tool_calls`` function tools are called once per run. Nothing leaves
+    the process, so load tests measure the framework's own overhead.
+    """
+
+    def __init__(
+        self,
+        latency: float = settings.fake_model_latency,
+        output_words: int = settings.fake_model_output_words,
+        chunk_words: int = settings.fake_model_chunk_words,
+        chunk_delay: float = settings.fake_model_chunk_delay,
+        tool_calls: int = settings.fake_model_tool_calls,
+    ) -> None:
+        self.latency = latency
+        self.output_words = output_words
+        self.chunk_words = max(1, chunk_words)
+        self.chunk_delay = chunk_delay
+        self.tool_calls = tool_calls
+        super().__init__(self._respond, stream_function=self._stream, model_name="fake")
+
+    def text(self, messages: list[ModelMessage]) -> str:
+        """Answer text, the same for the same user prompt."""
+        prompt = next(
+            (
+                part.content
+                for message in reversed(messages)
+                if isinstance(message, ModelRequest)
+                for part in message.parts
+                if isinstance(part, UserPromptPart) and isinstance(part.content, str)
+            ),
+            "",
+        )
+        seed = zlib.crc32(prompt.encode())
+        words = [VOCABULARY[(seed + index * 7) % len(VOCABULARY)] for index in range(self.output_words)]
+        sentences = [" ".join(words[i : i + SENTENCE_WORDS]) for i in range(0, len(words), SENTENCE_WORDS)]
+        return " ".join(f"{sentence.capitalize()}." for sentence in sentences)
+
+    def parts(self, messages: list[ModelMessage], info: AgentInfo) -> list[ModelResponsePart]:
+        answered_tools = isinstance(messages[-1], ModelRequest) and any(
+            isinstance(part, ToolReturnPart) for part in messages[-1].parts
+        )
+        if self.tool_calls and info.function_tools and not answered_tools:
+            return [
+                ToolCallPart(tool.name, fake_value(tool.parameters_json_schema))
+                for tool in info.function_tools[: self.tool_calls]
+            ]
+        if info.output_tools and not info.allow_text_output:
+            tool = info.output_tools[0]
+            return [ToolCallPart(tool.name, fake_value(tool.parameters_json_schema))]
+        return [TextPart(self.text(messages))]
+
+    async def _respond(self, messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        await asyncio.sleep(self.latency)
+        parts = self.parts(messages, info)
+        input_words = sum(
+            len(str(part.content).split())
+            for message in messages
+            if isinstance(message, ModelRequest)
+            for part in message.parts
+            if hasattr(part, "content")
+        )
+        output_words = sum(len(part.content.split()) for part in parts if isinstance(part, TextPart))
+        return ModelResponse(
+            parts=parts,
+            usage=RequestUsage(input_tokens=input_words, output_tokens=output_words or 10),
+            model_name="fake",
+        )
+
+    async def _stream(self, messages: list[ModelMessage], info: AgentInfo) -> AsyncIterator[str | DeltaToolCalls]:
+        await asyncio.sleep(self.latency)
+        parts = self.parts(messages, info)
+        if not isinstance(parts[0], TextPart):
+            yield {
+                index: DeltaToolCall(name=part.tool_name, json_args=json.dumps(part.args))
+                for index, part in enumerate(parts)
+                if isinstance(part, ToolCallPart)
+            }
+            return
+        words = parts[0].content.split(" ")
+        for start in range(0, len(words), self.chunk_words):
+            if start:
+                await asyncio.sleep(self.chunk_delay)
+            chunk = " ".join(words[start : start + self.chunk_words])
+            yield chunk if start + self.chunk_words >= len(words) else f"{chunk} "
+
+
+def _lookup_tool(index: int, latency: float) -> Callable[[str], Awaitable[str]]:
+    async def lookup(query: str) -> str:
+        await asyncio.sleep(latency)
+        return f"Result {index} for {query}"
+
+    return lookup
+
+
+def fake_mcp_toolset(url: str, tools: int = 2, latency: float = settings.fake_model_latency) -> FunctionToolset[Any]:
+    """Local stand-in for the MCP server at ``url``: ``tools`` lookup tools answering after ``latency`` seconds.
+
+    Install it with ``mcp_connections.toolset_factory = fake_mcp_toolset`` before agents are created.
+    """
+    toolset: FunctionToolset[Any] = FunctionToolset(id=url)
+    # tool names are unique across servers, as agents list the tools of all their servers together
+    server = re.sub(r"\W", "_", urlsplit(url).netloc)
+    for index in range(tools):
+        toolset.add_function(
+            _lookup_tool(index, latency),
+            name=f"{server}_lookup_{index}",
+            description=f"Look up records in collection {index} of {url}",
+        )
+    return toolset
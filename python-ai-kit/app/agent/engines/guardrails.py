@@ -1,21 +1,113 @@
-from dataclasses import dataclass
-from typing import Type
+import re
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from typing import Literal, Type
 
 from app.agent.engines.agent_base import BaseAgent, BaseAgentDeps
-from app.agent.prompts.worker_prompts import get_guardrails_instructions
+from app.agent.prompts.registry import prompt_registry
+from app.agent.prompts.worker_prompts import GUARDRAILS_LIMITS_PROMPT, TEXT_GUARDRAILS_RULES
+from app.agent.static.guardrails_rules import ANSWER_PREFIX_PATTERN, EMOJI_PATTERN, REASONING_LEAK_PATTERNS
+from app.config import settings
+from app.utils.metrics import metrics
+
+type GuardrailsPolicy = Literal["always", "auto", "never"]
 
 
 @dataclass
 class GuardrailsDeps(BaseAgentDeps):
     """Dependencies for the guardrails."""
-    pass
+    soft_word_limit: int = 250
+
+
+@dataclass
+class GuardrailsCheck:
+    """Result of the local guardrails pre-check."""
+
+    text: str
+    failures: list[str] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return not self.failures
+
+
+def _drop_emoji(match: re.Match[str]) -> str:
+    """Keep indentation before a leading emoji and one space between the words it separated."""
+    text, start, end = match.string, match.start(), match.end()
+    if start == 0 or text[start - 1] == "\n":
+        return match["before"]
+    if end == len(text) or text[end] in "\r\n":
+        return ""
+    return " "
+
+
+def check_output(message: str, soft_word_limit: int = 250) -> GuardrailsCheck:
+    """Apply the deterministic part of the formatting rules.
+
+    Emoji and an "Answer:" prefix are removed locally; responses over the word
+    limit or leaking the agent's reasoning fail the check and need the LLM reformatter.
+
+    Args:
+        message: Generated response
+        soft_word_limit: Maximum word count
+
+    Returns:
+        Cleaned text and the list of failed checks
+    """
+    text = EMOJI_PATTERN.sub(_drop_emoji, message)
+    text = ANSWER_PREFIX_PATTERN.sub("", text).strip()
+
+    failures = []
+    if len(text.split()) > soft_word_limit:
+        failures.append("word_limit")
+    if any(pattern.search(text) for pattern in REASONING_LEAK_PATTERNS):
+        failures.append("reasoning_leak")
+    return GuardrailsCheck(text=text, failures=failures)
 
 
 class OutputReformatterWorker(BaseAgent):
-    """Output reformatter using Pydantic AI."""
+    """Output reformatter using Pydantic AI.
+
+    With the "auto" policy, the LLM reformatter runs only for responses failing the
+    local pre-check (see ``check_output``); "always" sends every response to the LLM
+    and "never" applies the local post-processing only.
+    """
     
-    def __init__(self, deps_type: Type[BaseAgentDeps] = GuardrailsDeps, **kwargs):
-        super().__init__(deps_type=deps_type, instructions=get_guardrails_instructions, **kwargs)
+    def __init__(
+        self,
+        deps_type: Type[BaseAgentDeps] = GuardrailsDeps,
+        policy: GuardrailsPolicy = settings.guardrails_policy,
+        **kwargs,
+    ):
+        # the rules are static (cacheable by the provider), the limits follow them
+        super().__init__(deps_type=deps_type, instructions=TEXT_GUARDRAILS_RULES, **kwargs)
+        self.add_instructions(prompt_registry.instructions(GUARDRAILS_LIMITS_PROMPT.name))
+        self.policy = policy
+
+    def precheck(self, message: str, soft_word_limit: int = 250) -> GuardrailsCheck | None:
+        """Run the local pre-check according to the policy.
+
+        Args:
+            message: Message to reformat
+            soft_word_limit: Maximum word count
+
+        Returns:
+            Check result whose text can be returned as is, or None when the LLM reformatter is needed
+        """
+        if self.policy == "always":
+            metrics.inc("guardrails_path_total", path="llm", reason="policy")
+            return None
+
+        check = check_output(message, soft_word_limit)
+        for failure in check.failures:
+            metrics.inc("guardrails_check_failures_total", reason=failure)
+
+        if check.passed or self.policy == "never":
+            metrics.inc("guardrails_path_total", path="local", reason="passed" if check.passed else "policy")
+            return check
+
+        metrics.inc("guardrails_path_total", path="llm", reason="check_failed")
+        return None
 
     async def refformat(self, message: str, api_key: str | None = None, soft_word_limit: int = 250) -> str:
         """Reformat and validate output message.
@@ -30,10 +122,13 @@ class OutputReformatterWorker(BaseAgent):
         """
         if self.verbose:
             print(f"Formatting: \n -------- \n *Input* -> {message}")
+
+        if (check := self.precheck(message, soft_word_limit)) is not None:
+            return check.text
         
-        deps = GuardrailsDeps(language=self.language)
+        deps = GuardrailsDeps(language=self.language, soft_word_limit=soft_word_limit)
         
-        result = await self.agent.run(
+        result = await self.run_agent(
             user_prompt=message,
             deps=deps,
         )
@@ -43,4 +138,27 @@ class OutputReformatterWorker(BaseAgent):
         if self.verbose:
             print(f"\n *Output* -> {formatted_message}")
         
-        return formatted_message
\ No newline at end of file
+        return formatted_message
+
+    async def refformat_stream(self, message: str, soft_word_limit: int = 250) -> AsyncIterator[str]:
+        """Reformat and validate output message, yielding formatted text deltas.
+
+        Args:
+            message: Message to reformat
+            soft_word_limit: Maximum word count
+
+        Yields:
+            Chunks of the reformatted message as they are generated
+        """
+        if self.verbose:
+            print(f"Formatting (stream): \n -------- \n *Input* -> {message}")
+
+        if (check := self.precheck(message, soft_word_limit)) is not None:
+            yield check.text
+            return
+
+        deps = GuardrailsDeps(language=self.language, soft_word_limit=soft_word_limit)
+
+        async with self.run_agent_stream(user_prompt=message, deps=deps) as result:
+            async for delta in result.stream_text(delta=True):
+                yield delta
@@ -0,0 +1,134 @@
+import json
+import re
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Protocol
+
+from app.agent.static.routing_rules import ROUTING_RULE_REASONS, ROUTING_RULES
+from app.config import settings
+from app.schemas.agent import TaskType
+from app.utils.metrics import metrics
+from app.utils.text_vectors import char_ngrams, cosine_similarity
+
+
+@dataclass
+class PreRoutingDecision:
+    """Route chosen locally, without calling the LLM router."""
+
+    route: int
+    reasoning: str
+    confidence: float
+    classifier: str
+
+
+class RouteClassifier(Protocol):
+    name: str
+
+    def classify(self, message: str) -> PreRoutingDecision | None: ...
+
+
+class RuleRouteClassifier:
+    """Keyword / regex rules for messages whose route is obvious."""
+
+    name = "rules"
+
+    def __init__(self, rules: list[tuple[TaskType, str, float]] = ROUTING_RULES) -> None:
+        self.rules = [(route, re.compile(pattern, re.IGNORECASE), confidence) for route, pattern, confidence in rules]
+
+    def classify(self, message: str) -> PreRoutingDecision | None:
+        for route, pattern, confidence in self.rules:
+            if pattern.search(message):
+                return PreRoutingDecision(
+                    route=route.value,
+                    reasoning=ROUTING_RULE_REASONS[route],
+                    confidence=confidence,
+                    classifier=self.name,
+                )
+        return None
+
+
+class NGramRouteClassifier:
+    """Nearest-centroid classifier over character trigrams of labelled example messages.
+
+    The model file is JSON mapping route numbers to example messages, e.g.
+    ``{"1": ["what's the weather like?"], "3": ["translate to german: good night"]}``.
+    Confidence is the cosine similarity to the closest centroid; messages about as close
+    to another centroid are left undecided.
+    """
+
+    name = "ngram"
+    min_margin = 0.1
+
+    def __init__(self, examples: dict[int, list[str]]) -> None:
+        self.centroids: dict[int, dict[str, float]] = {}
+        for route, texts in examples.items():
+            total: Counter[str] = Counter()
+            for text in texts:
+                total.update(char_ngrams(text))
+            self.centroids[route] = {gram: count / len(texts) for gram, count in total.items()}
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "NGramRouteClassifier":
+        raw = json.loads(Path(path).read_text(encoding="utf-8"))
+        return cls({int(route): texts for route, texts in raw.items() if texts})
+
+    def classify(self, message: str) -> PreRoutingDecision | None:
+        if not self.centroids:
+            return None
+        vector = char_ngrams(message)
+        scores = sorted(
+            ((cosine_similarity(vector, centroid), route) for route, centroid in self.centroids.items()),
+            reverse=True,
+        )
+        best, route = scores[0]
+        runner_up = scores[1][0] if len(scores) > 1 else 0.0
+        if best - runner_up < self.min_margin:
+            return None
+        return PreRoutingDecision(
+            route=route,
+            reasoning=ROUTING_RULE_REASONS[TaskType(route)],
+            confidence=best,
+            classifier=self.name,
+        )
+
+
+class PreRouter:
+    """Cheap local classification stage consulted before the LLM router.
+
+    Classifiers are tried in order; the first decision reaching the confidence
+    threshold wins. Otherwise the message is left to the LLM router.
+    """
+
+    def __init__(self, classifiers: list[RouteClassifier], threshold: float = settings.pre_router_threshold) -> None:
+        self.classifiers = classifiers
+        self.threshold = threshold
+
+    @classmethod
+    def from_settings(cls) -> "PreRouter":
+        classifiers: list[RouteClassifier] = [RuleRouteClassifier()]
+        if settings.pre_router_model_path:
+            classifiers.append(NGramRouteClassifier.from_file(settings.pre_router_model_path))
+        return cls(classifiers)
+
+    def classify(self, message: str) -> PreRoutingDecision | None:
+        """Classify the message locally.
+
+        Args:
+            message: Message to classify
+
+        Returns:
+            Decision if any classifier is confident enough, None otherwise
+        """
+        for classifier in self.classifiers:
+            decision = classifier.classify(message)
+            if decision is not None and decision.confidence >= self.threshold:
+                metrics.inc(
+                    "pre_router_decisions_total", outcome="hit", classifier=classifier.name, route=str(decision.route)
+                )
+                return decision
+        metrics.inc("pre_router_decisions_total", outcome="miss")
+        return None
+
+
+pre_router = PreRouter.from_settings()
@@ -0,0 +1,253 @@
+import asyncio
+import contextlib
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic_ai import RunContext
+from pydantic_ai.exceptions import ModelHTTPError
+from pydantic_ai.messages import ModelMessage, ModelResponse
+from pydantic_ai.models import Model, ModelRequestParameters, StreamedResponse
+from pydantic_ai.models.wrapper import WrapperModel
+from pydantic_ai.settings import ModelSettings
+
+from app.agent.workflows.instrumentation import record_queue_time
+from app.config import settings
+from app.utils.metrics import metrics
+
+# provider responses meaning "slow down": rate limited, overloaded (Anthropic) or temporarily unavailable
+RATE_LIMIT_STATUS_CODES = {429, 503, 529}
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    return isinstance(error, ModelHTTPError) and error.status_code in RATE_LIMIT_STATUS_CODES
+
+
+def _retry_after(error: BaseException) -> float | None:
+    headers = getattr(error, "headers", None) or {}
+    try:
+        return float(headers["retry-after"])
+    except (KeyError, ValueError):
+        return None
+
+
+@dataclass
+class LimiterSlot:
+    """Admission of a single model request; the caller reports the tokens it used."""
+
+    tokens: int = 0
+    succeeded: bool = False
+    rate_limited: bool = False
+    retry_after: float | None = None
+
+
+class ProviderLimiter:
+    """Client-side throttling of requests to one provider model.
+
+    Requests are admitted while fewer than the current concurrency limit are in flight
+    and the tokens used in the last minute are within the budget. The limit follows
+    AIMD: it grows by about one per ``limit`` successful requests and is halved on a
+    rate-limit response, which also pauses admissions for a backoff period (the
+    provider's ``Retry-After`` if sent, doubling on consecutive rate limits).
+
+    Waiters are futures of their own event loops, so a limiter may be shared by the
+    API loop and Celery tasks running ``asyncio.run`` in worker threads.
+    """
+
+    min_backoff = 1.0
+    max_backoff = 30.0
+    decrease_factor = 0.5
+
+    def __init__(self, key: str, max_in_flight: int, tokens_per_minute: int | None = None) -> None:
+        self.key = key
+        self.max_in_flight = max_in_flight
+        self.tokens_per_minute = tokens_per_minute
+        self.limit = float(max_in_flight)
+        self.in_flight = 0
+        self.waiting = 0
+        self._used_tokens: deque[tuple[float, int]] = deque()
+        self._backoff = self.min_backoff
+        self._paused_until = 0.0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        self._lock = threading.Lock()
+
+    def _admission_delay(self, now: float) -> float | None:
+        """Seconds until a request may be admitted: 0 to admit now, None to wait for a release."""
+        if now < self._paused_until:
+            return self._paused_until - now
+        if self.in_flight >= max(1, int(self.limit)):
+            return None
+        if self.tokens_per_minute:
+            while self._used_tokens and self._used_tokens[0][0] <= now - 60:
+                self._used_tokens.popleft()
+            # a request is let through when the budget is not exhausted yet; its tokens are counted afterwards
+            if sum(tokens for _, tokens in self._used_tokens) >= self.tokens_per_minute:
+                return self._used_tokens[0][0] + 60 - now
+        return 0.0
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        while True:
+            with self._lock:
+                delay = self._admission_delay(time.monotonic())
+                if delay == 0:
+                    self.in_flight += 1
+                    self._record_state()
+                    break
+                waiter = loop.create_future()
+                self._waiters.append(waiter)
+                self.waiting += 1
+                self._record_state()
+            try:
+                await asyncio.wait([waiter], timeout=delay)
+            finally:
+                with self._lock:
+                    self.waiting -= 1
+                    if waiter in self._waiters:
+                        self._waiters.remove(waiter)
+                    self._record_state()
+        waited = time.monotonic() - started
+        metrics.observe("llm_limiter_wait_seconds", waited, model=self.key)
+        record_queue_time(waited)
+
+    def release(self, slot: LimiterSlot) -> None:
+        """Give the slot back, adjusting the limit to the outcome of the request."""
+        now = time.monotonic()
+        with self._lock:
+            self.in_flight -= 1
+            if slot.tokens:
+                self._used_tokens.append((now, slot.tokens))
+            if slot.rate_limited:
+                self.limit = max(1.0, self.limit * self.decrease_factor)
+                self._paused_until = now + (slot.retry_after or self._backoff)
+                self._backoff = min(self.max_backoff, self._backoff * 2)
+                metrics.inc("llm_rate_limited_total", model=self.key)
+            elif slot.succeeded:
+                self.limit = min(float(self.max_in_flight), self.limit + 1 / self.limit)
+                self._backoff = self.min_backoff
+            self._record_state()
+            waiters = list(self._waiters)
+        # waiters re-check admission themselves, possibly on another thread's loop
+        for waiter in waiters:
+            # RuntimeError: the waiter's loop has been closed in the meantime
+            with contextlib.suppress(RuntimeError):
+                waiter.get_loop().call_soon_threadsafe(_wake, waiter)
+
+    def _record_state(self) -> None:
+        metrics.set("llm_limiter_waiting", self.waiting, model=self.key)
+        metrics.set("llm_limiter_in_flight", self.in_flight, model=self.key)
+        metrics.set("llm_limiter_limit", self.limit, model=self.key)
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[LimiterSlot]:
+        """Hold an admission for the duration of a (possibly streamed) request."""
+        await self.acquire()
+        slot = LimiterSlot()
+        try:
+            yield slot
+            slot.succeeded = True
+        except BaseException as e:
+            if is_rate_limit_error(e):
+                slot.rate_limited = True
+                slot.retry_after = _retry_after(e)
+            raise
+        finally:
+            self.release(slot)
+
+    async def run[T](
+        self,
+        request: Callable[[], Awaitable[T]],
+        count_tokens: Callable[[T], int] = lambda _: 0,
+        retries: int = settings.llm_rate_limit_retries,
+    ) -> T:
+        """Send a request through the limiter, retrying it after rate-limit responses.
+
+        Args:
+            request: Callable starting the request
+            count_tokens: Tokens used by the request, read from its result
+            retries: Number of retries after rate-limit responses
+
+        Returns:
+            Result of the request
+        """
+        attempt = 0
+        while True:
+            try:
+                async with self.slot() as slot:
+                    result = await request()
+                    slot.tokens = count_tokens(result)
+                    return result
+            except ModelHTTPError as e:
+                if not is_rate_limit_error(e) or attempt >= retries:
+                    raise
+                # the next admission waits for the backoff set when the slot was released
+                attempt += 1
+
+
+def _wake(waiter: asyncio.Future[None]) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+class RateLimitedModel(WrapperModel):
+    """Model sending each of its requests through a provider limiter.
+
+    A slot is held only while the provider generates a response, not while the agent runs
+    tools between requests, and a rate-limited request is retried on its own, so tools
+    already called in the run are not called again. Streamed requests are not retried.
+    """
+
+    def __init__(self, wrapped: Model | str, limiter: ProviderLimiter) -> None:
+        super().__init__(wrapped)
+        self.limiter = limiter
+
+    async def request(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> ModelResponse:
+        return await self.limiter.run(
+            lambda: self.wrapped.request(messages, model_settings, model_request_parameters),
+            count_tokens=lambda response: response.usage.total_tokens,
+        )
+
+    @asynccontextmanager
+    async def request_stream(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+        run_context: RunContext[Any] | None = None,
+    ) -> AsyncIterator[StreamedResponse]:
+        async with self.limiter.slot() as slot:
+            async with self.wrapped.request_stream(
+                messages, model_settings, model_request_parameters, run_context
+            ) as response:
+                yield response
+            slot.tokens = response.usage.total_tokens
+
+
+class ProviderLimiters:
+    """Process-wide limiters, one per ``vendor:model`` string."""
+
+    def __init__(self) -> None:
+        self._limiters: dict[str, ProviderLimiter] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model_string: str) -> ProviderLimiter:
+        with self._lock:
+            if (limiter := self._limiters.get(model_string)) is None:
+                limiter = self._limiters[model_string] = ProviderLimiter(
+                    model_string, settings.llm_max_concurrency, settings.llm_tokens_per_minute
+                )
+            return limiter
+
+
+provider_limiters = ProviderLimiters()
@@ -1,7 +1,9 @@
 from dataclasses import dataclass
+from typing import Any
 
 from app.agent.engines.agent_base import BaseAgent, BaseAgentDeps
 from app.agent.prompts.agent_prompts import get_instructions_for_mode
+from app.agent.tools.tool_registry import tool_manager
 from app.schemas.agent import AgentMode
 
 
@@ -17,11 +19,14 @@ class ReasoningAgent(BaseAgent):
     def __init__(
         self, 
         deps_type: type[BaseAgentDeps] = ReasoningAgentDeps,
+        tool_list: list[Any] | None = None,
         **kwargs
     ):
         instructions = get_instructions_for_mode(AgentMode.GENERAL)
         super().__init__(
             deps_type=deps_type, 
             instructions=instructions,
+            # toolpacks of the mode (see ToolManager.mapping) unless tools are given explicitly
+            tool_list=tool_list if tool_list is not None else tool_manager.get_toolpack(AgentMode.GENERAL),
             **kwargs
         )
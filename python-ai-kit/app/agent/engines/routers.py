@@ -2,8 +2,11 @@ from dataclasses import dataclass
 from typing import Type
 from pydantic import BaseModel
 
+from app.agent.cache import CacheBackend, RoutingCache
 from app.agent.engines.agent_base import BaseAgent, BaseAgentDeps
-from app.agent.prompts.worker_prompts import get_router_instructions
+from app.agent.engines.pre_router import PreRouter
+from app.agent.prompts.registry import prompt_registry
+from app.agent.prompts.worker_prompts import ROUTER_PROMPT
 from app.config import settings
 
 
@@ -21,9 +24,58 @@ class RoutingResponse(BaseModel):
 class GenericRouter(BaseAgent):
     """Generic message routing using Pydantic AI structured output."""
     
-    def __init__(self, routing_prompt: str | None = None, deps_type: Type[BaseAgentDeps] = RouterDeps, **kwargs):
-        instructions = routing_prompt or get_router_instructions
+    def __init__(
+        self,
+        routing_prompt: str | None = None,
+        deps_type: Type[BaseAgentDeps] = RouterDeps,
+        pre_router: PreRouter | None = None,
+        cache_backend: CacheBackend | None = None,
+        **kwargs,
+    ):
+        instructions = routing_prompt or prompt_registry.render(ROUTER_PROMPT.name).text
         super().__init__(deps_type=deps_type, output_type=RoutingResponse, instructions=instructions, **kwargs)
+        self.pre_router = pre_router
+        self.cache = (
+            RoutingCache(
+                cache_backend,
+                instructions=self.instructions_hash,
+                model=self.model_string,
+                similarity_threshold=settings.routing_cache_similarity_threshold,
+            )
+            if cache_backend is not None
+            else None
+        )
+
+    async def route_locally(self, message: str) -> RoutingResponse | None:
+        """Decide the route with the pre-router or the routing cache, without calling the LLM.
+
+        Args:
+            message: Message to classify
+
+        Returns:
+            RoutingResponse if the message could be routed locally, None otherwise
+        """
+        if self.pre_router is not None and (decision := self.pre_router.classify(message)):
+            return RoutingResponse(route=decision.route, reasoning=decision.reasoning)
+        if self.cache is not None and (cached := await self.cache.get(message)):
+            return RoutingResponse.model_validate(cached)
+        return None
+
+    async def route_with_llm(self, message: str) -> RoutingResponse:
+        """Classify the message with the LLM, storing the decision in the routing cache.
+
+        Args:
+            message: Message to classify
+
+        Returns:
+            RoutingResponse with route and reasoning
+        """
+        deps = RouterDeps(language=self.language)
+        result = await self.run_agent(user_prompt=message, deps=deps)
+        routing = result.output
+        if self.cache is not None:
+            await self.cache.set(message, routing.model_dump())
+        return routing
 
     async def route(self, message: str, api_key: str | None = None, logging: bool = False) -> RoutingResponse:
         """Route message and return classification.
@@ -36,9 +88,7 @@ class GenericRouter(BaseAgent):
         Returns:
             RoutingResponse with route and reasoning
         """
-        deps = RouterDeps(language=self.language)
-        result = await self.agent.run(user_prompt=message, deps=deps)
-        routing = result.output
+        routing = await self.route_locally(message) or await self.route_with_llm(message)
 
         if logging or self.verbose:
             print(routing.route, routing.reasoning)
@@ -0,0 +1,48 @@
+from dataclasses import dataclass
+from typing import Type
+
+from pydantic_ai.messages import ModelMessage, ModelRequest
+
+from app.agent.engines.agent_base import BaseAgent, BaseAgentDeps
+from app.agent.prompts.registry import prompt_registry
+from app.agent.prompts.worker_prompts import SUMMARIZER_LIMITS_PROMPT, TEXT_SUMMARIZER_INSTRUCTIONS
+
+
+@dataclass
+class SummarizerDeps(BaseAgentDeps):
+    """Dependencies for the conversation summarizer."""
+
+    word_limit: int = 200
+
+
+class ConversationSummarizer(BaseAgent):
+    """Folds older conversation turns into a compact running summary."""
+
+    def __init__(self, deps_type: Type[BaseAgentDeps] = SummarizerDeps, word_limit: int = 200, **kwargs):
+        super().__init__(deps_type=deps_type, instructions=TEXT_SUMMARIZER_INSTRUCTIONS, **kwargs)
+        self.add_instructions(prompt_registry.instructions(SUMMARIZER_LIMITS_PROMPT.name))
+        self.word_limit = word_limit
+
+    async def summarize(self, summary: str | None, messages: list[ModelMessage]) -> str:
+        """Update the conversation summary with the given messages.
+
+        Args:
+            summary: Current summary (None when nothing has been summarized yet)
+            messages: Messages following the current summary, in chronological order
+
+        Returns:
+            Updated summary
+        """
+        transcript = "\n".join(
+            f"{'User' if isinstance(message, ModelRequest) else 'Assistant'}: {self.message_text(message)}"
+            for message in messages
+        )
+        prompt = f"Current summary:\n{summary or '(empty)'}\n\nNew messages:\n{transcript}"
+
+        deps = SummarizerDeps(language=self.language, word_limit=self.word_limit)
+        result = await self.run_agent(user_prompt=prompt, deps=deps)
+
+        if self.verbose:
+            print(f"Summary: {result.output}")
+
+        return str(result.output)
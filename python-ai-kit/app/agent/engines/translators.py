@@ -1,8 +1,9 @@
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
-from pydantic_ai import RunContext
 
 from app.agent.engines.agent_base import BaseAgent, BaseAgentDeps
-from app.agent.prompts.worker_prompts import TEXT_TRANSLATOR_INSTRUCTIONS
+from app.agent.prompts.registry import prompt_registry
+from app.agent.prompts.worker_prompts import TARGET_LANGUAGE_PROMPT, TEXT_TRANSLATOR_INSTRUCTIONS
 
 
 @dataclass
@@ -28,10 +29,7 @@ class SimpleTranslatorWorker(BaseAgent):
             instructions=instructions,
             **kwargs
         )
-        
-        @self.agent.instructions
-        def add_target_language(ctx: RunContext[TranslatorDeps]) -> str:
-            return f"Please translate the following text into {ctx.deps.target_language} language."
+        self.add_instructions(prompt_registry.instructions(TARGET_LANGUAGE_PROMPT.name))
 
     async def translate(
         self, 
@@ -55,7 +53,7 @@ class SimpleTranslatorWorker(BaseAgent):
         
         deps = TranslatorDeps(language=self.language, target_language=target)
         
-        result = await self.agent.run(
+        result = await self.run_agent(
             user_prompt=query,
             deps=deps,
         )
@@ -63,4 +61,29 @@ class SimpleTranslatorWorker(BaseAgent):
         if self.verbose:
             print(f"Translation result: {result.output}")
         
-        return str(result.output)
\ No newline at end of file
+        return str(result.output)
+
+    async def translate_stream(
+        self,
+        query: str,
+        language: str | None = None
+    ) -> AsyncIterator[str]:
+        """Translate text to any language, yielding translated text deltas.
+
+        Args:
+            query: Text to translate
+            language: Target language; if None, uses target_language from constructor
+
+        Yields:
+            Chunks of the translated text as they are generated
+        """
+        target = language or self.target_language
+
+        if self.verbose:
+            print(f"Translating to {target}: {query}")
+
+        deps = TranslatorDeps(language=self.language, target_language=target)
+
+        async with self.run_agent_stream(user_prompt=query, deps=deps) as result:
+            async for delta in result.stream_text(delta=True):
+                yield delta
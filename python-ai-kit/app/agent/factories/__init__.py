@@ -1,3 +1,4 @@
+from .manager_pool import AgentManagerPool, agent_manager_pool
 from .workflow_factory import WorkflowAgentFactory
 
-__all__ = ['WorkflowAgentFactory']
+__all__ = ['AgentManagerPool', 'WorkflowAgentFactory', 'agent_manager_pool']
@@ -0,0 +1,122 @@
+import asyncio
+from collections import OrderedDict
+from typing import NamedTuple
+
+from app.agent.agent_manager import AgentManager
+from app.agent.factories.workflow_factory import WorkflowAgentFactory
+from app.config import settings
+
+
+class ManagerKey(NamedTuple):
+    """Identity of a pooled AgentManager."""
+
+    language: str
+    mcp_urls: tuple[str, ...]
+    usage_limits: tuple[int | None, int | None, int | None]
+
+
+class AgentManagerPool:
+    """Process-wide LRU pool of initialized AgentManager instances.
+
+    Creating a manager builds every pydantic-ai Agent (and its MCP toolsets), so managers
+    are built once per (language, MCP URLs, usage limits) and shared across requests.
+    """
+
+    def __init__(self, max_size: int = settings.agent_pool_size) -> None:
+        self.max_size = max_size
+        self._managers: OrderedDict[ManagerKey, AgentManager] = OrderedDict()
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def make_key(use_mcp: bool = False, mcp_urls: list[str] | None = None, language: str = "english") -> ManagerKey:
+        """Build the pool key for the given manager configuration.
+
+        Args:
+            use_mcp: Whether to enable MCP servers
+            mcp_urls: List of MCP server URLs (if None and use_mcp=True, uses settings.mcp_urls)
+            language: Language for all agents
+
+        Returns:
+            Key identifying a manager with this configuration
+        """
+        usage_limits = WorkflowAgentFactory.build_usage_limits()
+        return ManagerKey(
+            language=language,
+            mcp_urls=tuple(WorkflowAgentFactory.resolve_mcp_urls(use_mcp, mcp_urls)),
+            usage_limits=(
+                (usage_limits.output_tokens_limit, usage_limits.input_tokens_limit, usage_limits.request_limit)
+                if usage_limits
+                else (None, None, None)
+            ),
+        )
+
+    async def get_manager(
+        self,
+        use_mcp: bool = False,
+        mcp_urls: list[str] | None = None,
+        language: str = "english",
+    ) -> AgentManager:
+        """Return a warm manager for the configuration, creating it on first use.
+
+        Args:
+            use_mcp: Whether to enable MCP servers
+            mcp_urls: List of MCP server URLs (if None and use_mcp=True, uses settings.mcp_urls)
+            language: Language for all agents
+
+        Returns:
+            Initialized AgentManager instance
+        """
+        key = self.make_key(use_mcp, mcp_urls, language)
+
+        if (manager := self._managers.get(key)) is not None:
+            self._managers.move_to_end(key)
+            return manager
+
+        async with self._lock:
+            # another request may have built it while we were waiting for the lock
+            if (manager := self._managers.get(key)) is not None:
+                self._managers.move_to_end(key)
+                return manager
+
+            manager = await WorkflowAgentFactory.create_manager(
+                mcp_urls=list(key.mcp_urls),
+                language=language,
+            )
+            self._managers[key] = manager
+            while len(self._managers) > self.max_size:
+                self._managers.popitem(last=False)
+
+        return manager
+
+    async def warm_up(self) -> None:
+        """Pre-build the manager used by requests with default settings."""
+        await self.get_manager(use_mcp=settings.mcp_enabled, language=settings.default_language)
+
+    def invalidate(self, language: str | None = None, mcp_url: str | None = None) -> int:
+        """Drop pooled managers so they are rebuilt on next use.
+
+        Args:
+            language: Only drop managers for this language
+            mcp_url: Only drop managers connected to this MCP server
+
+        Returns:
+            Number of dropped managers
+        """
+        stale = [
+            key
+            for key in self._managers
+            if (language is None or key.language == language) and (mcp_url is None or mcp_url in key.mcp_urls)
+        ]
+        for key in stale:
+            del self._managers[key]
+        return len(stale)
+
+    def clear(self) -> None:
+        """Drop all pooled managers."""
+        self._managers.clear()
+
+    def __len__(self) -> int:
+        return len(self._managers)
+
+
+agent_manager_pool = AgentManagerPool()
@@ -1,64 +1,126 @@
+from typing import Any
+
+from pydantic_ai import UsageLimits
+
 from app.agent.agent_manager import AgentManager
-from app.agent.engines.routers import GenericRouter
+from app.agent.cache import routing_cache_backend
+from app.agent.engines.agent_base import PromptCaching
 from app.agent.engines.guardrails import OutputReformatterWorker
+from app.agent.engines.pre_router import pre_router
 from app.agent.engines.react_agent import ReasoningAgent
+from app.agent.engines.routers import GenericRouter
+from app.agent.engines.summarizer import ConversationSummarizer
 from app.agent.engines.translators import SimpleTranslatorWorker
 from app.config import settings
-from pydantic_ai import UsageLimits
 
 
 class WorkflowAgentFactory:
     """Factory for creating configured AgentManager instances."""
-    
+
+    @staticmethod
+    def resolve_mcp_urls(use_mcp: bool = False, mcp_urls: list[str] | None = None) -> list[str]:
+        """Resolve the MCP server URLs the agents should connect to.
+
+        Args:
+            use_mcp: Whether to enable MCP servers
+            mcp_urls: Explicit MCP server URLs (if None and use_mcp=True, uses settings.mcp_urls)
+
+        Returns:
+            List of MCP server URLs (empty when MCP is disabled)
+        """
+        return mcp_urls if mcp_urls is not None else (settings.mcp_urls if use_mcp else [])
+
+    @staticmethod
+    def build_usage_limits() -> UsageLimits | None:
+        """Build usage limits from the current settings, or None when no limit is configured."""
+        if not any([settings.max_output_tokens, settings.max_input_tokens, settings.max_requests]):
+            return None
+        return UsageLimits(
+            output_tokens_limit=settings.max_output_tokens,
+            input_tokens_limit=settings.max_input_tokens,
+            request_limit=settings.max_requests,
+        )
+
+    @staticmethod
+    def model_kwargs(ai_provider: str | None = None, model: str | None = None) -> dict[str, Any]:
+        """Build the model arguments of an agent, falling back to the main provider and model.
+
+        Args:
+            ai_provider: Provider of the agent's model (if None, uses settings.ai_provider)
+            model: Model name (if None, uses settings.model)
+
+        Returns:
+            ``llm_vendor``, ``llm_model`` and ``api_key`` keyword arguments for the agent;
+            API_KEY is only passed for the main provider
+        """
+        vendor = ai_provider or settings.ai_provider
+        return {
+            "llm_vendor": vendor,
+            "llm_model": model or settings.model,
+            "api_key": settings.api_key if vendor == settings.ai_provider else None,
+        }
+
     @staticmethod
     async def create_manager(
-        use_mcp: bool = False, 
+        use_mcp: bool = False,
         mcp_urls: list[str] | None = None,
-        language: str = "english"
+        language: str = "english",
+        prompt_caching: PromptCaching | None = None,
     ) -> AgentManager:
         """Create AgentManager with all workflow agents including translator.
-        
+
         Args:
             use_mcp: Whether to enable MCP servers
             mcp_urls: List of MCP server URLs (if None and use_mcp=True, uses settings.mcp_urls)
             language: Language for all agents
-            
+            prompt_caching: Provider prompt caching of the main agent (if None, uses settings.prompt_caching);
+                the other agents run without history and cache their static prefix only
+
         Returns:
             Configured AgentManager instance
         """
         manager = AgentManager()
-        
-        final_mcp_urls = mcp_urls if mcp_urls is not None else (settings.mcp_urls if use_mcp else [])
-        
-        usage_limits = None
-        if any([settings.max_output_tokens, settings.max_input_tokens, settings.max_requests]):
-            usage_limits = UsageLimits(
-                output_tokens_limit=settings.max_output_tokens,
-                input_tokens_limit=settings.max_input_tokens,
-                request_limit=settings.max_requests,
-            )
-        
+
+        final_mcp_urls = WorkflowAgentFactory.resolve_mcp_urls(use_mcp, mcp_urls)
+        usage_limits = WorkflowAgentFactory.build_usage_limits()
+        prompt_caching = prompt_caching or settings.prompt_caching
+        auxiliary_caching: PromptCaching = "off" if prompt_caching == "off" else "prefix"
+
         manager.register('router', GenericRouter,
             verbose=settings.debug_mode,
-            api_key=settings.api_key)
-        
+            **WorkflowAgentFactory.model_kwargs(settings.router_ai_provider, settings.router_model),
+            prompt_caching=auxiliary_caching,
+            pre_router=pre_router if settings.pre_router_enabled else None,
+            cache_backend=routing_cache_backend if settings.routing_cache_enabled else None)
+
         manager.register('agent', ReasoningAgent,
             verbose=settings.debug_mode,
             api_key=settings.api_key,
             language=language,
             mcp_urls=final_mcp_urls,
-            usage_limits=usage_limits)
-        
+            usage_limits=usage_limits,
+            prompt_caching=prompt_caching)
+
         manager.register('guardrails', OutputReformatterWorker,
             verbose=settings.debug_mode,
-            api_key=settings.api_key,
+            **WorkflowAgentFactory.model_kwargs(settings.guardrails_ai_provider, settings.guardrails_model),
             language=language,
-            usage_limits=usage_limits)
-        
+            usage_limits=usage_limits,
+            prompt_caching=auxiliary_caching)
+
         manager.register('translator', SimpleTranslatorWorker,
             verbose=settings.debug_mode,
+            **WorkflowAgentFactory.model_kwargs(settings.translator_ai_provider, settings.translator_model),
             target_language=language,
-            usage_limits=usage_limits)
-        
+            usage_limits=usage_limits,
+            prompt_caching=auxiliary_caching)
+
+        manager.register('summarizer', ConversationSummarizer,
+            verbose=settings.debug_mode,
+            **WorkflowAgentFactory.model_kwargs(settings.summarizer_ai_provider, settings.summarizer_model),
+            language=language,
+            usage_limits=usage_limits,
+            prompt_caching=auxiliary_caching)
+
         await manager.initialize()
         return manager
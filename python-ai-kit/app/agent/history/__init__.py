@@ -0,0 +1,5 @@
+from .compaction import compact_if_needed, schedule_compaction
+from .messages import window_history
+from .store import ConversationStore, conversation_store
+
+__all__ = ["ConversationStore", "compact_if_needed", "conversation_store", "schedule_compaction", "window_history"]
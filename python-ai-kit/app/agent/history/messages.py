@@ -0,0 +1,41 @@
+from pydantic_ai.messages import ModelMessage, ModelRequest
+
+from app.agent.engines.agent_base import BaseAgent
+from app.config import settings
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token), good enough for budgeting history."""
+    return len(text) // 4 + 1
+
+
+def window_history(
+    messages: list[ModelMessage],
+    max_messages: int = settings.history_max_messages,
+    max_tokens: int = settings.history_max_tokens,
+) -> list[ModelMessage]:
+    """Keep the most recent messages fitting both the message and the token budget.
+
+    The window always starts with a user request, so it never opens with an
+    orphaned response.
+
+    Args:
+        messages: Conversation messages in chronological order
+        max_messages: Maximum number of messages
+        max_tokens: Approximate token budget of the kept messages
+
+    Returns:
+        Most recent messages within the budgets, in chronological order
+    """
+    window: list[ModelMessage] = []
+    tokens = 0
+    for message in reversed(messages[-max_messages:]):
+        tokens += estimate_tokens(BaseAgent.message_text(message))
+        if tokens > max_tokens:
+            break
+        window.append(message)
+    window.reverse()
+
+    while window and not isinstance(window[0], ModelRequest):
+        window.pop(0)
+    return window
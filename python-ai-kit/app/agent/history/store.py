@@ -0,0 +1,153 @@
+from dataclasses import replace
+from datetime import datetime, timezone
+from uuid import UUID
+
+from pydantic_ai.messages import (
+    ModelMessage,
+    ModelMessagesTypeAdapter,
+    ModelRequest,
+    ModelResponse,
+    SystemPromptPart,
+    TextPart,
+    UserPromptPart,
+)
+
+from app.agent.engines.agent_base import BaseAgent
+from app.agent.engines.summarizer import ConversationSummarizer
+from app.agent.history.messages import estimate_tokens, window_history
+from app.config import settings
+from app.database import AsyncDbSession
+from app.models import Conversation, Message
+from app.repositories import ConversationRepository, MessageRepository
+from app.schemas import ConversationCreate, ConversationUpdate, MessageCreate
+from app.schemas.agent import MessageRole
+from app.utils.exceptions import ResourceNotFoundError
+from app.utils.metrics import metrics
+
+
+class ConversationStore:
+    """Append-only conversation history persisted in the database.
+
+    Older messages are periodically folded into a running summary stored on the
+    conversation (see ``compact``); history then consists of the summary followed
+    by the messages that came after it.
+    """
+
+    def __init__(self) -> None:
+        self.conversations = ConversationRepository(Conversation)
+        self.messages = MessageRepository(Message)
+
+    async def create(self, db_session: AsyncDbSession) -> Conversation:
+        return await self.conversations.create(db_session, ConversationCreate())
+
+    async def load_history(
+        self,
+        db_session: AsyncDbSession,
+        conversation_id: UUID,
+        max_messages: int = settings.history_max_messages,
+        max_tokens: int = settings.history_max_tokens,
+    ) -> list[ModelMessage]:
+        """Load the conversation summary and the most recent messages within the budgets.
+
+        Only the last ``max_messages`` rows not covered by the summary are read,
+        so the query cost stays bounded however long the conversation gets.
+
+        Raises:
+            ResourceNotFoundError: When the conversation does not exist
+        """
+        if (conversation := await self.conversations.get(db_session, conversation_id)) is None:
+            raise ResourceNotFoundError("conversation", conversation_id)
+
+        rows = await self.messages.get_latest(
+            db_session, conversation_id, limit=max_messages, after_id=conversation.summary_message_id
+        )
+        history = window_history(self._to_messages(rows), max_messages, max_tokens)
+        if conversation.summary:
+            summary = SystemPromptPart(content=f"Summary of the earlier conversation:\n{conversation.summary}")
+            history.insert(0, ModelRequest(parts=[summary]))
+        # agent runs take their conversation_id from the history (used e.g. by conversation-scoped tool caches)
+        return [replace(message, conversation_id=str(conversation_id)) for message in history]
+
+    async def needs_compaction(self, db_session: AsyncDbSession, conversation_id: UUID) -> bool:
+        """Check whether enough messages accumulated after the summary to fold them into it."""
+        conversation = await self.conversations.get(db_session, conversation_id)
+        if conversation is None:
+            return False
+        pending = await self.messages.count_after(db_session, conversation_id, conversation.summary_message_id)
+        return pending > settings.history_summary_trigger
+
+    async def compact(
+        self,
+        db_session: AsyncDbSession,
+        conversation_id: UUID,
+        summarizer: ConversationSummarizer,
+        keep_messages: int = settings.history_keep_messages,
+    ) -> bool:
+        """Fold all but the last ``keep_messages`` unsummarized messages into the conversation summary.
+
+        The summary is updated incrementally: only messages added since the previous
+        compaction are sent to the summarizer, together with the current summary.
+
+        Args:
+            db_session: Database session
+            conversation_id: Conversation to compact
+            summarizer: Agent producing the updated summary
+            keep_messages: Number of recent messages kept verbatim
+
+        Returns:
+            Whether the summary was updated
+        """
+        conversation = await self.conversations.get(db_session, conversation_id)
+        if conversation is None:
+            return False
+
+        rows = await self.messages.get_after(db_session, conversation_id, conversation.summary_message_id)
+        cut = len(rows) - keep_messages
+        # the verbatim part must start with a user message
+        while 0 < cut < len(rows) and rows[cut].role != MessageRole.USER:
+            cut += 1
+        if cut <= 0:
+            return False
+
+        summary = await summarizer.summarize(conversation.summary, self._to_messages(rows[:cut]))
+        await self.conversations.update(
+            db_session, conversation, ConversationUpdate(summary=summary, summary_message_id=rows[cut - 1].id)
+        )
+        metrics.inc("history_compactions_total")
+        return True
+
+    @staticmethod
+    def _to_messages(rows: list[Message]) -> list[ModelMessage]:
+        return [message for row in rows for message in ModelMessagesTypeAdapter.validate_json(row.payload)]
+
+    async def append(self, db_session: AsyncDbSession, conversation_id: UUID, messages: list[ModelMessage]) -> None:
+        """Append messages to a conversation."""
+        creators = []
+        for message in messages:
+            text = BaseAgent.message_text(message)
+            creators.append(
+                MessageCreate(
+                    conversation_id=conversation_id,
+                    role=MessageRole.USER if isinstance(message, ModelRequest) else MessageRole.ASSISTANT,
+                    content=text,
+                    payload=ModelMessagesTypeAdapter.dump_json([message]).decode(),
+                    token_count=estimate_tokens(text),
+                )
+            )
+        await self.messages.create_many(db_session, creators, commit=False)
+
+        conversation = await self.conversations.get(db_session, conversation_id)
+        await self.conversations.update(
+            db_session, conversation, ConversationUpdate(updated_at=datetime.now(timezone.utc))
+        )
+
+    async def append_turn(self, db_session: AsyncDbSession, conversation_id: UUID, prompt: str, response: str) -> None:
+        """Append a user prompt and the final workflow response."""
+        await self.append(
+            db_session,
+            conversation_id,
+            [ModelRequest(parts=[UserPromptPart(content=prompt)]), ModelResponse(parts=[TextPart(content=response)])],
+        )
+
+
+conversation_store = ConversationStore()
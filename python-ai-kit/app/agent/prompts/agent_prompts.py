@@ -2,6 +2,7 @@ from typing import Any
 
 from pydantic_ai import RunContext
 
+from app.agent.prompts.registry import prompt_registry
 from app.schemas.agent import AgentMode
 
 TEXT_AGENT_PRIMING = """
@@ -31,9 +32,25 @@ Remember to always use tools for factual questions and incorporate all relevant
 """
 
 
+GENERAL_PROMPT = prompt_registry.register(
+    f"mode.{AgentMode.GENERAL}", TEXT_AGENT_PRIMING + TEXT_REACTAGENT_GUIDANCE + TEXT_AGENT_RULES
+)
+
+# appended to the instructions of every agent (see BaseAgent)
+RESPONSE_LANGUAGE_PROMPT = prompt_registry.register(
+    "response_language", "Please respond in {language} language.", language="english"
+)
+
+CONVERSATION_LANGUAGE_PROMPT = prompt_registry.register(
+    "conversation_language",
+    "The current conversation language is: {language}. Please respond in {language} language.",
+    language="english",
+)
+
+
 def get_general_instructions() -> str:
     """Get general agent instructions."""
-    return TEXT_AGENT_PRIMING + TEXT_REACTAGENT_GUIDANCE + TEXT_AGENT_RULES
+    return prompt_registry.render(GENERAL_PROMPT.name).text
 
 
 def get_language_instruction(ctx: RunContext[Any]) -> str:
@@ -42,14 +59,7 @@ def get_language_instruction(ctx: RunContext[Any]) -> str:
     Args:
         ctx: RunContext with access to dependencies and other context
     """
-    language = "english"
-
-    if hasattr(ctx.deps, "language"):
-        language = ctx.deps.language
-    elif isinstance(ctx.deps, dict) and "language" in ctx.deps:
-        language = ctx.deps["language"]
-
-    return f"The current conversation language is: {language}. Please respond in {language} language."
+    return prompt_registry.render_deps(CONVERSATION_LANGUAGE_PROMPT.name, ctx.deps).text
 
 
 def get_instructions_for_mode(mode: AgentMode) -> str:
@@ -59,10 +69,9 @@ def get_instructions_for_mode(mode: AgentMode) -> str:
         mode: The agent mode to get instructions for
 
     Returns:
-        Static instructions string for the mode
+        Static instructions string for the mode (rendered once, see ``prompt_registry``)
     """
-    mode_instructions = {
-        AgentMode.GENERAL: get_general_instructions(),
-    }
-
-    return mode_instructions.get(mode, get_general_instructions())
+    try:
+        return prompt_registry.render(f"mode.{mode}").text
+    except KeyError:
+        return get_general_instructions()
@@ -0,0 +1,98 @@
+import string
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+from pydantic_ai import RunContext
+
+from app.agent.cache.keys import content_hash
+from app.utils.metrics import metrics
+
+
+@dataclass(frozen=True)
+class RenderedPrompt:
+    """Instructions rendered from a template, with the hash of their text."""
+
+    name: str
+    text: str
+    hash: str
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """Instruction template with ``str.format`` placeholders, filled from agent deps fields of the same name."""
+
+    name: str
+    template: str
+    defaults: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        return tuple(dict.fromkeys(name for _, name, _, _ in string.Formatter().parse(self.template) if name))
+
+    @property
+    def hash(self) -> str:
+        return content_hash(self.name, self.template, repr(sorted(self.defaults.items())))
+
+
+class PromptRegistry:
+    """Named instruction templates, each rendered once per set of parameters.
+
+    Renders are memoized (LRU), so dynamic instructions cost a cache lookup per agent
+    run instead of string formatting, and equal parameters always give byte-identical
+    text. Templates keep their static part first and the parameters last, so the
+    static prefix of the system prompt is stable across requests, which provider-side
+    prompt caching relies on. Template hashes identify the instructions of an agent
+    in cache keys and traces.
+    """
+
+    def __init__(self, max_renders: int = 1024) -> None:
+        self._templates: dict[str, PromptTemplate] = {}
+        self._render = lru_cache(maxsize=max_renders)(self._render_uncached)
+
+    def register(self, name: str, template: str, **defaults: Any) -> PromptTemplate:
+        """Register a template; ``defaults`` fill parameters missing from the deps."""
+        prompt = PromptTemplate(name, template, defaults)
+        if (existing := self._templates.get(name)) is not None and existing != prompt:
+            raise ValueError(f"Prompt '{name}' is already registered with a different template")
+        self._templates[name] = prompt
+        return prompt
+
+    def get(self, name: str) -> PromptTemplate:
+        return self._templates[name]
+
+    def render(self, name: str, **params: Any) -> RenderedPrompt:
+        """Render a template; parameters that are None fall back to the template defaults."""
+        prompt = self._templates[name]
+        values = {**prompt.defaults, **{key: value for key, value in params.items() if value is not None}}
+        return self._render(name, tuple(sorted(values.items())))
+
+    def render_deps(self, name: str, deps: Any) -> RenderedPrompt:
+        """Render a template with parameters read from agent deps (a dataclass or a dict)."""
+        fields = self._templates[name].fields
+        if isinstance(deps, dict):
+            return self.render(name, **{field: deps.get(field) for field in fields})
+        return self.render(name, **{field: getattr(deps, field, None) for field in fields})
+
+    def _render_uncached(self, name: str, params: tuple[tuple[str, Any], ...]) -> RenderedPrompt:
+        text = self._templates[name].template.format(**dict(params))
+        metrics.inc("prompt_renders_total", prompt=name)
+        return RenderedPrompt(name=name, text=text, hash=content_hash(text))
+
+    def instructions(self, name: str) -> Callable[[RunContext[Any]], str]:
+        """Instructions function for ``Agent.instructions`` rendering the template from ``ctx.deps``.
+
+        The function carries the template hash as ``prompt_hash`` (used by ``BaseAgent.instructions_hash``).
+        """
+        prompt = self._templates[name]
+
+        def render(ctx: RunContext[Any]) -> str:
+            return self.render_deps(name, ctx.deps).text
+
+        render.__name__ = render.__qualname__ = f"{name.replace('.', '_')}_instructions"
+        render.prompt_hash = prompt.hash  # type: ignore[attr-defined]
+        return render
+
+
+prompt_registry = PromptRegistry()
@@ -0,0 +1,24 @@
+import re
+
+# runs of emoji and pictographs (incl. variation selectors and joiners) with the spaces around them
+_EMOJI = "\U0001f000-\U0001faff\u2600-\u27bf\u2b00-\u2bff"
+EMOJI_PATTERN = re.compile(f"(?P<before>[ \t]*)[{_EMOJI}][{_EMOJI}\ufe0f\u200d]*(?P<after>[ \t]*)")
+
+ANSWER_PREFIX_PATTERN = re.compile(
+    r"^\s*\**(answer|odpowiedź|respuesta|antwort)\**\s*:(\*\*(?=\s))?\s*",
+    re.IGNORECASE,
+)
+
+# phrases revealing the agent's inner reasoning or the actions it took; these need the LLM reformatter
+REASONING_LEAK_PATTERNS = [
+    re.compile(
+        r"\bI (have )?(used|called|invoked|ran|queried) (the |a |an |my )?[\w\- ]{0,30}tools?\b",
+        re.IGNORECASE,
+    ),
+    re.compile(
+        r"^\s*(thought|reasoning|action|action input|observation)\s*:",
+        re.IGNORECASE | re.MULTILINE,
+    ),
+    re.compile(r"\bmy (inner|internal) (reasoning|thoughts?)\b", re.IGNORECASE),
+    re.compile(r"</?(think|thinking|reasoning)>", re.IGNORECASE),
+]
@@ -0,0 +1,34 @@
+from app.schemas.agent import TaskType
+
+# (route, regex pattern, confidence) - patterns are matched case-insensitively against the whole message.
+# Keep them narrow: anything not matched here falls through to the LLM router.
+ROUTING_RULES: list[tuple[TaskType, str, float]] = [
+    # translation requests
+    (TaskType.translate, r"^\s*(please\s+)?translate\b.{0,80}\b(to|into)\s+\w+", 0.95),
+    (TaskType.translate, r"^\s*(proszę\s+)?przetłumacz\b.{0,80}\bna\s+\w+", 0.95),
+    (TaskType.translate, r"^\s*(bitte\s+)?übersetze?\b.{0,80}\b(ins|in|auf)\s+\w+", 0.95),
+    (TaskType.translate, r"^\s*traduce\b.{0,80}\b(al|a)\s+\w+", 0.95),
+    (TaskType.translate, r"\bhow do (you|i) say\b.{1,80}\bin (english|polish|spanish|german|french)\b", 0.9),
+    # attempts at bypassing the system
+    (
+        TaskType.refuse,
+        r"\b(ignore|disregard|forget)\s+(all\s+)?(your\s+|the\s+)?"
+        r"(previous|prior|above)\s+instructions\b",
+        0.95,
+    ),
+    (TaskType.refuse, r"\b(reveal|show|print|repeat)\s+(me\s+)?(your|the)\s+(system\s+prompt|instructions)\b", 0.95),
+    (TaskType.refuse, r"\b(jailbreak|do anything now)\b", 0.9),
+    # small talk
+    (
+        TaskType.conversation,
+        r"^\s*(hi|hello|hey|thanks|thank you|good (morning|afternoon|evening)"
+        r"|cześć|dzień dobry|dziękuję|hola|gracias|hallo|danke)[\s!.,]*$",
+        0.95,
+    ),
+]
+
+ROUTING_RULE_REASONS: dict[TaskType, str] = {
+    TaskType.conversation: "The message is a general conversational message.",
+    TaskType.refuse: "The message attempts to bypass the assistant's instructions.",
+    TaskType.translate: "The message explicitly asks for a translation.",
+}
@@ -1,5 +1,6 @@
 from typing import Any, Callable
 
+from app.agent.tools.memoize import memoize
 from app.utils.date_handlers import (
     get_current_week,
     get_today_date,
@@ -7,7 +8,8 @@ from app.utils.date_handlers import (
 )
 
 DATEUTILS_TOOLS: list[Callable[..., Any]] = [
-    get_today_date,
-    get_current_week,
-    get_weekday_from_date,
+    # refreshed every minute, so a new day is picked up at most a minute late
+    memoize(ttl=60, scope="global")(get_today_date),
+    memoize(ttl=60, scope="global")(get_current_week),
+    memoize(scope="global")(get_weekday_from_date),
 ]
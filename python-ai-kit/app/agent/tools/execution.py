@@ -0,0 +1,106 @@
+import asyncio
+import inspect
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextvars import copy_context
+from dataclasses import dataclass
+from functools import partial, wraps
+from typing import Any, Callable, Literal
+
+from app.config import settings
+from app.utils.loop_monitor import loop_monitor
+from app.utils.metrics import metrics
+
+type ToolKind = Literal["async", "blocking", "cpu"]
+
+
+def cpu_bound(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Mark a sync tool that spends its time computing (parsing, numeric work, ...).
+
+    Such tools run on a process pool, so they must be module-level functions with
+    picklable arguments and results, and cannot take a ``RunContext``.
+    """
+    func.tool_kind = "cpu"  # ty: ignore[unresolved-attribute]
+    return func
+
+
+def blocking_io(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Mark a sync tool that waits for files, sockets or other blocking I/O (the default for sync tools)."""
+    func.tool_kind = "blocking"  # ty: ignore[unresolved-attribute]
+    return func
+
+
+def tool_kind(func: Callable[..., Any]) -> ToolKind:
+    if (kind := getattr(func, "tool_kind", None)) is not None:
+        return kind
+    return "async" if inspect.iscoroutinefunction(func) else "blocking"
+
+
+@dataclass(frozen=True)
+class PoolSizes:
+    """Worker pool sizes of a toolpack."""
+
+    threads: int = settings.tool_thread_pool_size
+    processes: int = settings.tool_process_pool_size
+
+
+class ToolExecutor:
+    """Runs the tools of one toolpack off the event loop.
+
+    Blocking tools run on a bounded thread pool, CPU-bound tools on a process pool
+    (both created on first use), async tools on the loop itself, where the loop lag
+    monitor attributes lag to them. Durations are recorded in ``tool_duration_seconds``.
+    """
+
+    def __init__(self, name: str, sizes: PoolSizes) -> None:
+        self.name = name
+        self.sizes = sizes
+        self._threads: ThreadPoolExecutor | None = None
+        self._processes: ProcessPoolExecutor | None = None
+
+    @property
+    def threads(self) -> ThreadPoolExecutor:
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(self.sizes.threads, thread_name_prefix=f"tools-{self.name}")
+        return self._threads
+
+    @property
+    def processes(self) -> ProcessPoolExecutor:
+        if self._processes is None:
+            self._processes = ProcessPoolExecutor(self.sizes.processes)
+        return self._processes
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Call a tool on the executor matching its kind."""
+        kind = tool_kind(func)
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        try:
+            match kind:
+                case "async":
+                    with loop_monitor.activity(f"tool:{func.__name__}"):
+                        return await func(*args, **kwargs)
+                case "blocking":
+                    # keeps the run context of the calling agent run visible to the tool
+                    return await loop.run_in_executor(self.threads, partial(copy_context().run, func, *args, **kwargs))
+                case "cpu":
+                    return await loop.run_in_executor(self.processes, partial(func, *args, **kwargs))
+        finally:
+            metrics.observe("tool_duration_seconds", time.monotonic() - started, tool=func.__name__, kind=kind)
+
+    def wrap(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Turn a tool into an async tool running on this executor, keeping its name and signature."""
+        if tool_kind(func) == "cpu" and "<locals>" in func.__qualname__:
+            raise ValueError(f"CPU-bound tool {func.__name__} must be a module-level function")
+
+        @wraps(func)
+        async def offloaded(*args: Any, **kwargs: Any) -> Any:
+            return await self.run(func, *args, **kwargs)
+
+        return offloaded
+
+    def shutdown(self) -> None:
+        for pool in (self._threads, self._processes):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._threads = self._processes = None
@@ -0,0 +1,197 @@
+import inspect
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Literal, get_origin
+
+from pydantic_ai import RunContext
+
+from app.agent.cache.keys import content_hash
+from app.agent.tools.side_effects import has_side_effects
+from app.agent.workflows.instrumentation import record_cache_hit
+from app.config import settings
+from app.utils.metrics import metrics
+
+try:
+    # not public API (see pydantic-ai pin in pyproject.toml)
+    from pydantic_ai._run_context import get_current_run_context
+except ImportError:
+    get_current_run_context = None
+
+type ToolCacheScope = Literal["run", "conversation", "global"]
+
+
+class ToolResultCache:
+    """Per-process store of memoized tool results with per-entry TTL and LRU eviction.
+
+    Thread-safe, since sync tools are executed in worker threads. Lookups are counted in
+    ``tool_cache_lookups_total{tool,outcome}``, so the hit rate of every tool can be read
+    from the metrics.
+    """
+
+    def __init__(self, max_size: int = settings.tool_cache_max_size) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[float | None, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, tool: str) -> tuple[bool, Any]:
+        """Return whether a live result is cached, and the result."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        metrics.inc("tool_cache_lookups_total", tool=tool, outcome="miss" if entry is None else "hit")
+        if entry is not None:
+            record_cache_hit("tool")
+        return (False, None) if entry is None else (True, entry[1])
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl if ttl else None, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                metrics.inc("tool_cache_evictions_total")
+            metrics.set("tool_cache_entries", len(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            metrics.set("tool_cache_entries", 0)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(tool: str, arguments: str, scope: ToolCacheScope, ctx: RunContext[Any] | None) -> str | None:
+        """Key of a tool call in the given scope, or None when the scope is unknown (outside an agent run).
+
+        Conversation scope relies on the run's ``conversation_id``, taken by pydantic-ai from
+        the chat history; runs without history get a fresh one, so they only share results
+        within the run.
+        """
+        match scope:
+            case "global":
+                scope_id = ""
+            case "run":
+                scope_id = ctx.run_id if ctx is not None else None
+            case "conversation":
+                scope_id = ctx.conversation_id if ctx is not None else None
+        if scope_id is None:
+            return None
+        return f"tool:{scope}:{scope_id}:{content_hash(tool, arguments)}"
+
+    @staticmethod
+    def entry_ttl(ttl: float | None, scope: ToolCacheScope) -> float | None:
+        # results of a run are useless once it is over; no run lasts longer than the agent timeout
+        if scope == "run":
+            return min(ttl, settings.timeout) if ttl else settings.timeout
+        return ttl
+
+
+def _run_context(arguments: list[Any]) -> RunContext[Any] | None:
+    """Run context of the agent run calling a tool.
+
+    Tools taking a ``RunContext`` pass their own. For plain tools it is looked up in
+    pydantic-ai's current-run context variable (also set in the worker threads of sync
+    tools); ``memoize`` refuses run and conversation scopes for plain tools when that
+    lookup is unavailable.
+    """
+    for value in arguments:
+        if isinstance(value, RunContext):
+            return value
+    return get_current_run_context() if get_current_run_context is not None else None
+
+
+def _takes_run_context(signature: inspect.Signature) -> bool:
+    return any(
+        parameter.annotation is RunContext or get_origin(parameter.annotation) is RunContext
+        for parameter in signature.parameters.values()
+    )
+
+
+def memoize(
+    ttl: float | None = None,
+    scope: ToolCacheScope = "run",
+    key: Callable[..., str] | None = None,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Cache results of a pure or slow-changing tool.
+
+    Calls with the same arguments in the same scope return the cached result instead of
+    running the tool again; exceptions are not cached. Calls outside an agent run are
+    cached only in the global scope.
+
+    Args:
+        ttl: Lifetime of a result in seconds (None - until evicted or the run ends)
+        scope: ``run`` (one agent run), ``conversation`` (runs sharing a conversation_id)
+            or ``global`` (all runs of the process)
+        key: Builds the cache key from the tool arguments; defaults to their JSON encoding
+
+    Returns:
+        Decorator wrapping the tool, keeping its name and signature for the agent
+    """
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        if has_side_effects(func):
+            raise ValueError(f"Tool {func.__name__} has side effects and must not be memoized")
+        signature = inspect.signature(func)
+        tool = func.__name__
+        if scope != "global" and get_current_run_context is None and not _takes_run_context(signature):
+            raise ValueError(
+                f"Tool {tool} must take a RunContext to be memoized in the {scope} scope with this pydantic-ai version"
+            )
+
+        def make_key(args: tuple[Any, ...], kwargs: dict[str, Any]) -> str | None:
+            if not settings.tool_cache_enabled:
+                return None
+            if key is not None:
+                arguments = key(*args, **kwargs)
+            else:
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                values = {name: value for name, value in bound.arguments.items() if not isinstance(value, RunContext)}
+                arguments = json.dumps(values, sort_keys=True, default=str)
+            name = f"{func.__module__}.{func.__qualname__}"
+            return ToolResultCache.key(name, arguments, scope, _run_context([*args, *kwargs.values()]))
+
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if (cache_key := make_key(args, kwargs)) is None:
+                    return await func(*args, **kwargs)
+                hit, result = tool_result_cache.get(cache_key, tool)
+                if hit:
+                    return result
+                result = await func(*args, **kwargs)
+                tool_result_cache.set(cache_key, result, ToolResultCache.entry_ttl(ttl, scope))
+                return result
+
+            wrapper = async_wrapper
+        else:
+
+            @wraps(func)
+            def sync_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if (cache_key := make_key(args, kwargs)) is None:
+                    return func(*args, **kwargs)
+                hit, result = tool_result_cache.get(cache_key, tool)
+                if hit:
+                    return result
+                result = func(*args, **kwargs)
+                tool_result_cache.set(cache_key, result, ToolResultCache.entry_ttl(ttl, scope))
+                return result
+
+            wrapper = sync_wrapper
+
+        wrapper.cache_scope = scope  # ty: ignore[unresolved-attribute]
+        return wrapper
+
+    return decorator
+
+
+tool_result_cache = ToolResultCache()
@@ -0,0 +1,4 @@
+from .index import DocumentIndex, IngestStats
+from .tools import QUERY_ENGINE_TOOLS, document_index, search_documents
+
+__all__ = ["DocumentIndex", "IngestStats", "QUERY_ENGINE_TOOLS", "document_index", "search_documents"]
@@ -0,0 +1,55 @@
+import hashlib
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from app.config import settings
+
+# plain-text formats read by the ingestion; other files are skipped
+SUFFIXES = {".txt", ".md", ".rst"}
+
+
+def iter_files(paths: Iterable[Path | str]) -> Iterator[Path]:
+    """Files to ingest: the given files and supported files found under the given directories."""
+    for path in map(Path, paths):
+        if path.is_dir():
+            yield from sorted(file for file in path.rglob("*") if file.is_file() and file.suffix in SUFFIXES)
+        elif path.is_file():
+            yield path
+
+
+def file_sha256(path: Path | str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        while block := file.read(1 << 20):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def chunk_text(
+    text: str,
+    words: int = settings.query_chunk_words,
+    overlap: int = settings.query_chunk_overlap,
+) -> list[str]:
+    """Split text into overlapping chunks of about ``words`` words.
+
+    Paragraphs are kept together where possible: a chunk ends at the last paragraph
+    break within its window unless that would make it shorter than half the window.
+    """
+    paragraphs = [paragraph.split() for paragraph in text.split("\n\n")]
+    tokens: list[str] = []
+    breaks: set[int] = set()
+    for paragraph in paragraphs:
+        tokens.extend(paragraph)
+        breaks.add(len(tokens))
+
+    chunks = []
+    start = 0
+    while start < len(tokens):
+        end = min(start + words, len(tokens))
+        if end < len(tokens):
+            end = max((b for b in breaks if start + words // 2 <= b <= end), default=end)
+        chunks.append(" ".join(tokens[start:end]))
+        if end == len(tokens):
+            break
+        start = max(end - overlap, start + 1)
+    return chunks
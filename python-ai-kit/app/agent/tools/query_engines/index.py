@@ -0,0 +1,253 @@
+import os
+import re
+import sqlite3
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal
+
+from app.agent.tools.query_engines.chunking import chunk_text, file_sha256, iter_files
+from app.config import settings
+
+if TYPE_CHECKING:
+    from app.agent.tools.query_engines.vectors import HashingEmbedder, VectorIndex
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    id INTEGER PRIMARY KEY,
+    document_id INTEGER NOT NULL REFERENCES documents (id),
+    position INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    embedding BLOB
+);
+CREATE INDEX IF NOT EXISTS chunks_document ON chunks (document_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5 (
+    text, content='chunks', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS chunks_vocab USING fts5vocab (chunks_fts, 'row');
+CREATE TRIGGER IF NOT EXISTS chunks_insert AFTER INSERT ON chunks BEGIN
+    INSERT INTO chunks_fts (rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS chunks_delete AFTER DELETE ON chunks BEGIN
+    INSERT INTO chunks_fts (chunks_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+# rank constant of reciprocal rank fusion of the BM25 and vector rankings
+RRF_K = 60
+# query words found in a larger share of chunks add little to BM25 but make FTS5 score most of the index
+COMMON_TERM_RATIO = 0.05
+
+_WORD = re.compile(r"\w+")
+
+
+def match_query(words: Iterable[str]) -> str:
+    """FTS5 query matching any of the words (ranked by BM25)."""
+    return " OR ".join(f'"{word}"' for word in words)
+
+
+@dataclass
+class IngestStats:
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    chunks: int = 0
+
+
+class DocumentIndex:
+    """Local retrieval index of text documents, stored under ``directory``.
+
+    Chunks live in SQLite with an FTS5 inverted index ranked by BM25. With NumPy
+    installed and ``vector_index`` set to ``flat`` or ``ivf``, chunks are also embedded
+    locally (``HashingEmbedder``) into a memory-mapped vector index, and results of
+    both rankings are merged with reciprocal rank fusion.
+
+    Ingestion is incremental: documents are skipped when their mtime and size (or,
+    failing that, content hash) are unchanged, re-chunked when changed and removed
+    when they disappear from the ingested directories.
+    """
+
+    def __init__(
+        self,
+        directory: Path | str = settings.query_index_path,
+        vector_index: Literal["none", "flat", "ivf"] = settings.query_vector_index,
+        embedding_dim: int = settings.query_embedding_dim,
+        ivf_probes: int = settings.query_ivf_probes,
+    ) -> None:
+        self.directory = Path(directory)
+        self.db_path = self.directory / "index.sqlite3"
+        self.embedder: "HashingEmbedder | None" = None
+        self.vectors: "VectorIndex | None" = None
+        if vector_index != "none":
+            try:
+                from app.agent.tools.query_engines.vectors import HashingEmbedder, VectorIndex
+            except ImportError as e:
+                raise ImportError("Vector indexes need NumPy, install it with `uv sync --extra vectors`") from e
+            self.embedder = HashingEmbedder(embedding_dim)
+            self.vectors = VectorIndex(self.directory / "vectors", vector_index, ivf_probes)
+        self._schema_ready = False
+
+    @contextmanager
+    def connect(self) -> Iterator[sqlite3.Connection]:
+        if not self._schema_ready:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(self.db_path)
+        try:
+            db.execute("PRAGMA journal_mode = WAL")
+            db.execute("PRAGMA mmap_size = 1073741824")
+            if not self._schema_ready:
+                db.executescript(SCHEMA)
+                self._schema_ready = True
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def add_document(
+        self, db: sqlite3.Connection, path: str, mtime: float, size: int, sha256: str, chunks: list[str]
+    ) -> None:
+        """Insert or replace a document and its chunks."""
+        self.remove_document(db, path)
+        document_id = db.execute(
+            "INSERT INTO documents (path, mtime, size, sha256) VALUES (?, ?, ?, ?)", (path, mtime, size, sha256)
+        ).lastrowid
+        embeddings = self.embedder.embed_many(chunks) if self.embedder is not None else [None] * len(chunks)
+        db.executemany(
+            "INSERT INTO chunks (document_id, position, text, embedding) VALUES (?, ?, ?, ?)",
+            [
+                (document_id, position, chunk, embedding.tobytes() if embedding is not None else None)
+                for position, (chunk, embedding) in enumerate(zip(chunks, embeddings))
+            ],
+        )
+
+    def remove_document(self, db: sqlite3.Connection, path: str) -> bool:
+        if (row := db.execute("SELECT id FROM documents WHERE path = ?", (path,)).fetchone()) is None:
+            return False
+        db.execute("DELETE FROM chunks WHERE document_id = ?", row)
+        db.execute("DELETE FROM documents WHERE id = ?", row)
+        return True
+
+    def ingest(self, paths: Iterable[Path | str], remove_missing: bool = True) -> IngestStats:
+        """Bring the index up to date with the given files and directories.
+
+        Args:
+            paths: Files and directories (searched recursively for ``SUFFIXES`` files)
+            remove_missing: Remove indexed documents under the given directories that no longer exist
+
+        Returns:
+            Counts of added, updated, unchanged and removed documents and of the chunks written
+        """
+        stats = IngestStats()
+        paths = [Path(path).resolve() for path in paths]
+        seen: set[str] = set()
+        with self.connect() as db:
+            known = {row[0]: row[1:] for row in db.execute("SELECT path, mtime, size, sha256 FROM documents")}
+            for file in iter_files(paths):
+                path = str(file)
+                seen.add(path)
+                stat = file.stat()
+                if (indexed := known.get(path)) is not None and indexed[:2] == (stat.st_mtime, stat.st_size):
+                    stats.unchanged += 1
+                    continue
+                sha256 = file_sha256(file)
+                if indexed is not None and indexed[2] == sha256:
+                    db.execute(
+                        "UPDATE documents SET mtime = ?, size = ? WHERE path = ?", (stat.st_mtime, stat.st_size, path)
+                    )
+                    stats.unchanged += 1
+                    continue
+                chunks = chunk_text(file.read_text(encoding="utf-8", errors="replace"))
+                self.add_document(db, path, stat.st_mtime, stat.st_size, sha256, chunks)
+                stats.chunks += len(chunks)
+                if indexed is None:
+                    stats.added += 1
+                else:
+                    stats.updated += 1
+                # one transaction per document keeps an interrupted ingestion consistent
+                db.commit()
+            if remove_missing:
+                roots = [f"{path}{os.sep}" for path in paths if path.is_dir()]
+                for path in known.keys() - seen:
+                    if any(path.startswith(root) for root in roots) and self.remove_document(db, path):
+                        stats.removed += 1
+        if stats.added or stats.updated or stats.removed:
+            self.build_vectors()
+        return stats
+
+    def build_vectors(self) -> None:
+        """Rebuild the vector index from the chunk embeddings stored in the database."""
+        if self.vectors is None:
+            return
+        import numpy as np
+
+        with self.connect() as db:
+            rows = db.execute("SELECT id, embedding FROM chunks WHERE embedding IS NOT NULL ORDER BY id").fetchall()
+        ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        dim = self.embedder.dim if self.embedder is not None else 0
+        vectors = np.frombuffer(b"".join(row[1] for row in rows), dtype=np.float32).reshape(len(rows), dim)
+        self.vectors.build(ids, vectors)
+
+    def _bm25(self, db: sqlite3.Connection, query: str, k: int) -> list[int]:
+        words = dict.fromkeys(_WORD.findall(query.lower()))
+        if not words:
+            return []
+        # max(rowid) is a cheap upper bound of the chunk count; words the vocabulary stores
+        # in a diacritic-folded form are not found there and count as rare
+        total = db.execute("SELECT max(rowid) FROM chunks").fetchone()[0] or 0
+        frequencies = {
+            term: doc
+            for term, doc in db.execute(
+                f"SELECT term, doc FROM chunks_vocab WHERE term IN ({','.join('?' * len(words))})", list(words)
+            )
+        }
+        rare = [word for word in words if frequencies.get(word, 0) <= total * COMMON_TERM_RATIO]
+        if not any(word in frequencies for word in rare):
+            # only common words (or small collections) match, keep them all
+            rare = list(words)
+        rows = db.execute(
+            "SELECT rowid FROM chunks_fts WHERE chunks_fts MATCH ? ORDER BY bm25(chunks_fts) LIMIT ?",
+            (match_query(rare), k),
+        )
+        return [row[0] for row in rows]
+
+    def search(self, query: str, k: int = 5) -> list[dict[str, Any]]:
+        """Top-k chunks for the query with their source documents.
+
+        Returns:
+            Chunks as ``{"source", "position", "text"}``, best first
+        """
+        candidates = k * 4 if self.vectors is not None else k
+        with self.connect() as db:
+            rankings = [self._bm25(db, query, candidates)]
+            if self.vectors is not None and self.embedder is not None:
+                nearest = self.vectors.search(self.embedder.embed(query), candidates)
+                rankings.append([chunk_id for chunk_id, _ in nearest])
+            scores: dict[int, float] = {}
+            for ranking in rankings:
+                for rank, chunk_id in enumerate(ranking):
+                    scores[chunk_id] = scores.get(chunk_id, 0.0) + 1 / (RRF_K + rank + 1)
+            best = sorted(scores, key=scores.__getitem__, reverse=True)[:k]
+            placeholders = ",".join("?" * len(best))
+            rows = {
+                row[0]: row[1:]
+                for row in db.execute(
+                    "SELECT chunks.id, documents.path, chunks.position, chunks.text FROM chunks "
+                    f"JOIN documents ON documents.id = chunks.document_id WHERE chunks.id IN ({placeholders})",
+                    best,
+                )
+            }
+        # chunks removed since the vector index was built are skipped
+        return [
+            {"source": rows[chunk_id][0], "position": rows[chunk_id][1], "text": rows[chunk_id][2]}
+            for chunk_id in best
+            if chunk_id in rows
+        ]
@@ -0,0 +1,21 @@
+from typing import Annotated, Any, Callable
+
+from app.agent.tools.memoize import memoize
+from app.agent.tools.query_engines.index import DocumentIndex
+from app.config import settings
+
+document_index = DocumentIndex()
+
+
+@memoize(scope="run")
+def search_documents(
+    query: Annotated[str, "What to look for in the documents"],
+    k: Annotated[int, "Number of passages to return"] = settings.query_top_k,
+) -> list[dict[str, Any]]:
+    """Search the local document collection and return the most relevant passages with their source files."""
+    return document_index.search(query, k=min(k, 20))
+
+
+QUERY_ENGINE_TOOLS: list[Callable[..., Any]] = [
+    search_documents,
+]
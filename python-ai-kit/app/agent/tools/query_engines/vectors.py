@@ -0,0 +1,145 @@
+"""Dense-vector retrieval backed by NumPy (optional dependency: ``uv sync --extra vectors``)."""
+
+import os
+import re
+import zlib
+from pathlib import Path
+from typing import Literal
+
+import numpy as np
+
+type VectorIndexKind = Literal["flat", "ivf"]
+
+_WORD = re.compile(r"\w+")
+
+
+class HashingEmbedder:
+    """Local text embeddings without a model: signed feature hashing of words and word bigrams.
+
+    Vectors are L2-normalized, so the dot product is the cosine similarity. They capture
+    lexical overlap (including partial overlap of phrasing) rather than meaning; plug in
+    a sentence-embedding model with the same ``embed_many`` interface for semantic search.
+    """
+
+    def __init__(self, dim: int) -> None:
+        self.dim = dim
+
+    def _features(self, text: str) -> list[str]:
+        words = _WORD.findall(text.lower())
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    def embed_many(self, texts: list[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                digest = zlib.crc32(feature.encode())
+                vectors[row, digest % self.dim] += 1.0 if digest & 0x80000000 else -1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1.0, norms)
+
+    def embed(self, text: str) -> np.ndarray:
+        return self.embed_many([text])[0]
+
+
+def nearest(vectors: np.ndarray, centroids: np.ndarray, batch: int = 65_536) -> np.ndarray:
+    """Index of the closest centroid of every vector, computed in batches to bound memory."""
+    return np.concatenate(
+        [np.argmax(vectors[i : i + batch] @ centroids.T, axis=1) for i in range(0, len(vectors), batch)]
+    )
+
+
+def kmeans(vectors: np.ndarray, clusters: int, iterations: int = 10, sample: int = 50_000) -> np.ndarray:
+    """Spherical k-means centroids, trained on a sample of the vectors."""
+    rng = np.random.default_rng(0)
+    if len(vectors) > sample:
+        vectors = vectors[np.sort(rng.choice(len(vectors), sample, replace=False))]
+    centroids = vectors[rng.choice(len(vectors), clusters, replace=False)].copy()
+    for _ in range(iterations):
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, nearest(vectors, centroids), vectors)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        # empty clusters keep their previous centroid
+        centroids = np.where(norms > 0, sums / np.where(norms > 0, norms, 1.0), centroids)
+    return centroids
+
+
+class VectorIndex:
+    """Top-k search over chunk vectors stored as ``.npy`` files and memory-mapped on load.
+
+    ``flat`` scores every vector (exact). ``ivf`` groups vectors around k-means centroids
+    (about sqrt(n) lists) and only scores the ``probes`` lists nearest to the query,
+    trading some recall for latency on large collections.
+    """
+
+    def __init__(self, directory: Path | str, kind: VectorIndexKind = "flat", probes: int = 8) -> None:
+        self.directory = Path(directory)
+        self.kind = kind
+        self.probes = probes
+        self._ids: np.ndarray | None = None
+        self._vectors: np.ndarray | None = None
+        self._centroids: np.ndarray | None = None
+        self._offsets: np.ndarray | None = None
+        self._loaded_mtime: float | None = None
+
+    def _file(self, name: str) -> Path:
+        return self.directory / f"{name}.npy"
+
+    def _save(self, name: str, array: np.ndarray) -> None:
+        # written next to the old file and swapped in, so readers never see a partial index
+        tmp = self.directory / f"{name}.tmp.npy"
+        np.save(tmp, array)
+        os.replace(tmp, self._file(name))
+
+    def build(self, ids: np.ndarray, vectors: np.ndarray) -> None:
+        """Write the index of the given chunk ids and their vectors."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if self.kind == "ivf" and len(vectors):
+            centroids = kmeans(vectors, clusters=max(1, min(len(vectors), int(np.sqrt(len(vectors))))))
+            assignment = nearest(vectors, centroids)
+            order = np.argsort(assignment, kind="stable")
+            ids, vectors = ids[order], vectors[order]
+            offsets = np.searchsorted(assignment[order], np.arange(len(centroids) + 1))
+            self._save("centroids", centroids)
+            self._save("offsets", offsets)
+        self._save("vectors", vectors.astype(np.float32))
+        self._save("ids", ids.astype(np.int64))
+
+    def load(self) -> bool:
+        """Memory-map the index files, unless already mapped; False when the index has not been built."""
+        try:
+            mtime = self._file("ids").stat().st_mtime
+        except FileNotFoundError:
+            return False
+        if mtime == self._loaded_mtime:
+            return True
+        self._ids = np.load(self._file("ids"), mmap_mode="r")
+        self._vectors = np.load(self._file("vectors"), mmap_mode="r")
+        if self.kind == "ivf":
+            self._centroids = np.load(self._file("centroids"))
+            self._offsets = np.load(self._file("offsets"))
+        self._loaded_mtime = mtime
+        return True
+
+    def search(self, query: np.ndarray, k: int) -> list[tuple[int, float]]:
+        """Chunk ids and cosine similarities of the ``k`` vectors closest to the query."""
+        # picks up indexes rebuilt by another process (e.g. the ingestion script)
+        if not self.load():
+            return []
+        if self._ids is None or self._vectors is None:
+            raise ValueError(f"Vector index in {self.directory} has no vectors loaded")
+        if self.kind == "ivf":
+            if self._centroids is None or self._offsets is None:
+                raise ValueError(f"IVF index in {self.directory} has no centroids loaded")
+            lists = np.argsort(self._centroids @ query)[::-1][: self.probes]
+            # vectors of a list are stored next to each other
+            ranges = [(int(self._offsets[i]), int(self._offsets[i + 1])) for i in lists]
+            rows = np.concatenate([np.arange(start, end) for start, end in ranges])
+            scores = np.concatenate([self._vectors[start:end] @ query for start, end in ranges])
+        else:
+            rows = np.arange(len(self._ids))
+            scores = self._vectors @ query
+        if not len(rows):
+            return []
+        top = np.argpartition(-scores, min(k, len(scores)) - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(int(self._ids[rows[i]]), float(scores[i])) for i in top]
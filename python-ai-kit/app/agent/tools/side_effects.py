@@ -0,0 +1,14 @@
+from typing import Any, Callable
+
+
+def side_effects(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Mark a tool that changes external state (sends messages, writes data, ...).
+
+    Responses produced with such a tool are never served from the response cache.
+    """
+    func.has_side_effects = True  # ty: ignore[unresolved-attribute]
+    return func
+
+
+def has_side_effects(func: Callable[..., Any]) -> bool:
+    return getattr(func, "has_side_effects", False)
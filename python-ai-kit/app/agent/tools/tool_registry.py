@@ -3,38 +3,70 @@ from enum import Enum
 from typing import Any, Callable
 
 from app.agent.tools.dateutils import DATEUTILS_TOOLS
-
-# from app.agent.tools.query_engines import QUERY_ENGINE_TOOLS
+from app.agent.tools.execution import PoolSizes, ToolExecutor
+from app.agent.tools.query_engines import QUERY_ENGINE_TOOLS
+from app.config import settings
 from app.schemas.agent import AgentMode
 
 
 class Toolpacks(Enum):
     GENERAL = "general"
     UTILS = "dateutils"
-    # QUERY_ENGINES = "query_engines"
+    QUERY_ENGINES = "query_engines"
 
 
 class ToolManager:
     toolpacks: dict[Toolpacks, list[Callable[..., Any]]] = {
         Toolpacks.GENERAL: [],
         Toolpacks.UTILS: DATEUTILS_TOOLS,
-        # Toolpacks.QUERY_ENGINES: QUERY_ENGINE_TOOLS,
+        Toolpacks.QUERY_ENGINES: QUERY_ENGINE_TOOLS,
     }
 
     mapping: dict[AgentMode, list[Toolpacks]] = {
-        AgentMode.GENERAL: [Toolpacks.GENERAL, Toolpacks.UTILS],
+        AgentMode.GENERAL: [
+            Toolpacks.GENERAL,
+            Toolpacks.UTILS,
+            *([Toolpacks.QUERY_ENGINES] if settings.query_engines_enabled else []),
+        ],
+    }
+
+    # worker pools running the sync tools of a toolpack, see app/agent/tools/execution.py;
+    # toolpacks not listed here use TOOL_THREAD_POOL_SIZE / TOOL_PROCESS_POOL_SIZE
+    pool_sizes: dict[Toolpacks, PoolSizes] = {
+        Toolpacks.UTILS: PoolSizes(threads=4),
     }
 
+    def __init__(self) -> None:
+        self._executors: dict[Toolpacks, ToolExecutor] = {}
+        self._tools: dict[Toolpacks, list[Callable[..., Any]]] = {}
+
+    def executor(self, toolpack: Toolpacks) -> ToolExecutor:
+        if toolpack not in self._executors:
+            self._executors[toolpack] = ToolExecutor(toolpack.value, self.pool_sizes.get(toolpack, PoolSizes()))
+        return self._executors[toolpack]
+
+    def get_tools(self, toolpack: Toolpacks) -> list[Callable[..., Any]]:
+        """Tools of a toolpack as async callables; blocking and CPU-bound ones run on its worker pools."""
+        if toolpack not in self._tools:
+            executor = self.executor(toolpack)
+            self._tools[toolpack] = [executor.wrap(tool) for tool in self.toolpacks.get(toolpack, [])]
+        return self._tools[toolpack]
+
     def get_toolpack(self, agent_mode: AgentMode) -> list[Callable[..., Any]]:
         tool_list = []
 
         required_toolpacks = self.mapping.get(agent_mode, [])
 
         for toolpack in required_toolpacks:
-            tools = self.toolpacks.get(toolpack, [])
+            tools = self.get_tools(toolpack)
             tool_list.extend(tools)
 
         return tool_list
 
+    def shutdown(self) -> None:
+        """Stop the worker pools of all toolpacks."""
+        for executor in self._executors.values():
+            executor.shutdown()
+
 
 tool_manager = ToolManager()
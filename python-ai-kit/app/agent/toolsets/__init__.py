@@ -0,0 +1,12 @@
+from .guarded import CircuitBreaker, GuardedToolset
+from .mcp import MCPConnectionManager, SharedMCPToolset, mcp_connections
+from .memoized import MemoizedToolset
+
+__all__ = [
+    "CircuitBreaker",
+    "GuardedToolset",
+    "MCPConnectionManager",
+    "MemoizedToolset",
+    "SharedMCPToolset",
+    "mcp_connections",
+]
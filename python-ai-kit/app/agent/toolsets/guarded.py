@@ -0,0 +1,139 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field, replace
+from typing import Any, Literal
+
+from pydantic_ai import RunContext
+from pydantic_ai.exceptions import ApprovalRequired, CallDeferred, ModelRetry, ToolFailed
+from pydantic_ai.toolsets import AbstractToolset, ToolsetTool, WrapperToolset
+
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+type CircuitState = Literal["closed", "open", "half_open"]
+
+# outcomes of a tool call that the server produced itself, i.e. the server is healthy
+_TOOL_OUTCOMES = (ModelRetry, ToolFailed, CallDeferred, ApprovalRequired)
+
+_STATE_VALUES: dict[CircuitState, int] = {"closed": 0, "half_open": 1, "open": 2}
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker of a tool server.
+
+    After ``failure_threshold`` failures in a row the circuit opens and the server is left
+    out of agent runs. Once ``reset_timeout`` seconds have passed it is half-open: the next
+    run tries the server again, closing the circuit on success or reopening it on failure.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at: float | None = None
+
+    @property
+    def state(self) -> CircuitState:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Whether the server may be used."""
+        return self.state != "open"
+
+    def record_success(self) -> None:
+        if self._opened_at is not None:
+            logger.info(f"Circuit of {self.name} closed")
+        self.failures = 0
+        self._opened_at = None
+        self._record_state()
+
+    def record_failure(self, error: BaseException) -> None:
+        self.failures += 1
+        if self.state == "half_open" or (self._opened_at is None and self.failures >= self.failure_threshold):
+            self._opened_at = time.monotonic()
+            metrics.inc("mcp_circuit_opened_total", server=self.name)
+            logger.warning(f"Circuit of {self.name} opened after {self.failures} failures, last: {error!r}")
+        self._record_state()
+
+    def _record_state(self) -> None:
+        metrics.set("mcp_circuit_state", _STATE_VALUES[self.state], server=self.name)
+
+
+@dataclass
+class GuardedToolset(WrapperToolset[Any]):
+    """Timeout and circuit breaker around the toolset of one tool server.
+
+    A server that fails to connect, list its tools or answer a call within ``timeout``
+    seconds counts as failing; its tools are then missing from the run (or its calls fail
+    with a message the model sees) instead of failing the whole agent run. Tool call
+    durations are recorded in the ``mcp_tool_duration_seconds`` histogram.
+    """
+
+    name: str
+    breaker: CircuitBreaker
+    timeout: float
+    _entered: bool = field(default=False, init=False, repr=False)
+
+    async def for_run(self, ctx: RunContext[Any]) -> AbstractToolset[Any]:
+        # a copy per run remembers whether this run entered the server
+        return replace(self, wrapped=await self.wrapped.for_run(ctx))
+
+    async def __aenter__(self) -> "GuardedToolset":
+        if not self.breaker.allow():
+            return self
+        try:
+            async with asyncio.timeout(self.timeout):
+                await self.wrapped.__aenter__()
+        except Exception as e:
+            logger.warning(f"Tool server {self.name} unavailable: {e!r}")
+            self.breaker.record_failure(e)
+            return self
+        self._entered = True
+        return self
+
+    async def __aexit__(self, *args: Any) -> bool | None:
+        if not self._entered:
+            return None
+        self._entered = False
+        return await self.wrapped.__aexit__(*args)
+
+    async def get_tools(self, ctx: RunContext[Any]) -> dict[str, ToolsetTool[Any]]:
+        if not self._entered or not self.breaker.allow():
+            return {}
+        try:
+            async with asyncio.timeout(self.timeout):
+                return await self.wrapped.get_tools(ctx)
+        except Exception as e:
+            logger.warning(f"Listing tools of {self.name} failed: {e!r}")
+            self.breaker.record_failure(e)
+            return {}
+
+    async def call_tool(
+        self, name: str, tool_args: dict[str, Any], ctx: RunContext[Any], tool: ToolsetTool[Any]
+    ) -> Any:
+        if not self.breaker.allow():
+            raise ToolFailed(f"Tool server of `{name}` is temporarily unavailable.")
+        started = time.monotonic()
+        try:
+            async with asyncio.timeout(self.timeout):
+                result = await self.wrapped.call_tool(name, tool_args, ctx, tool)
+        except _TOOL_OUTCOMES:
+            self.breaker.record_success()
+            raise
+        except TimeoutError as e:
+            self.breaker.record_failure(e)
+            raise ToolFailed(f"Tool `{name}` did not respond within {self.timeout:g} seconds.")
+        except Exception as e:
+            self.breaker.record_failure(e)
+            raise ToolFailed(f"Tool `{name}` failed: {e}")
+        finally:
+            metrics.observe("mcp_tool_duration_seconds", time.monotonic() - started, server=self.name, tool=name)
+        self.breaker.record_success()
+        return result
@@ -0,0 +1,203 @@
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from pydantic_ai.mcp import MCPToolset
+from pydantic_ai.toolsets import AbstractToolset, WrapperToolset
+
+from app.agent.toolsets.guarded import CircuitBreaker, CircuitState, GuardedToolset
+from app.agent.toolsets.memoized import MemoizedToolset
+from app.config import settings
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SharedMCPToolset(WrapperToolset[Any]):
+    """Agent-facing toolset of an MCP server whose session is owned by ``MCPConnectionManager``.
+
+    On the event loop the manager was started on, entering the toolset only makes sure the
+    shared session is connected. On other loops (e.g. Celery tasks running ``asyncio.run``)
+    the session is opened and closed around every agent run, like a plain ``MCPToolset``.
+    """
+
+    url: str
+    connections: "MCPConnectionManager" = field(repr=False)
+
+    async def __aenter__(self) -> "SharedMCPToolset":
+        if self.connections.keeps_alive():
+            await self.connections.connect(self.url)
+        else:
+            await self.wrapped.__aenter__()
+        return self
+
+    async def __aexit__(self, *args: Any) -> bool | None:
+        if self.connections.keeps_alive():
+            return None
+        return await self.wrapped.__aexit__(*args)
+
+
+class MCPConnectionManager:
+    """Process-wide MCP client sessions, one per server URL, shared by all agents and AgentManagers.
+
+    Once started (from the API lifespan), sessions stay open between agent runs, so requests
+    skip the MCP handshake and reuse the server's tool list. The list is refreshed when the
+    server sends ``tools/list_changed``, or every ``tools_ttl`` seconds for servers that do
+    not send it. A background task probes every session and reconnects unresponsive ones.
+    """
+
+    def __init__(
+        self,
+        health_check_interval: float = settings.mcp_health_check_interval,
+        tools_ttl: float = settings.mcp_tools_ttl,
+        timeout: float = 10.0,
+    ) -> None:
+        # builds the client toolset of a server URL; load tests swap in local stand-ins (see fake_mcp_toolset)
+        self.toolset_factory: Callable[[str], AbstractToolset[Any]] = MCPToolset
+        self.health_check_interval = health_check_interval
+        self.tools_ttl = tools_ttl
+        self.timeout = timeout
+        # MCPToolset unless toolset_factory is replaced
+        self._toolsets: dict[str, Any] = {}
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._connected: set[str] = set()
+        self._tools_refreshed_at: dict[str, float] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._health_task: asyncio.Task[None] | None = None
+
+    def toolset(self, url: str) -> AbstractToolset[Any]:
+        """Return a toolset for the server, sharing its session and circuit breaker with every other agent."""
+        if url not in self._toolsets:
+            self._toolsets[url] = self.toolset_factory(url)
+            self._breakers[url] = CircuitBreaker(
+                url, settings.mcp_breaker_failure_threshold, settings.mcp_breaker_reset_timeout
+            )
+        toolset = GuardedToolset(
+            SharedMCPToolset(self._toolsets[url], url=url, connections=self),
+            name=url,
+            breaker=self._breakers[url],
+            timeout=settings.mcp_server_timeouts.get(url, settings.mcp_timeout),
+        )
+        if not settings.mcp_tool_cache_enabled:
+            return toolset
+        # outermost, so cache hits skip the server's timeout and circuit breaker
+        return MemoizedToolset(toolset, name=url, scope=settings.mcp_tool_cache_scope, ttl=settings.mcp_tool_cache_ttl)
+
+    def circuit_states(self) -> dict[str, CircuitState]:
+        """Circuit breaker state of every known server."""
+        return {url: breaker.state for url, breaker in self._breakers.items()}
+
+    def keeps_alive(self) -> bool:
+        """Whether sessions are kept open for agent runs on the current event loop."""
+        try:
+            return self._loop is asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+
+    def is_connected(self, url: str) -> bool:
+        return url in self._connected
+
+    async def connect(self, url: str) -> None:
+        """Open the server's session unless it is already open."""
+        if url in self._connected:
+            return
+        async with self._locks.setdefault(url, asyncio.Lock()):
+            if url in self._connected:
+                return
+            async with asyncio.timeout(self.timeout):
+                await self._toolsets[url].__aenter__()
+            self._connected.add(url)
+            self._tools_refreshed_at[url] = time.monotonic()
+            logger.info(f"Connected to MCP server {url}")
+
+    async def disconnect(self, url: str) -> None:
+        """Close the server's session if it is open."""
+        if url not in self._connected:
+            return
+        self._connected.discard(url)
+        try:
+            async with asyncio.timeout(self.timeout):
+                await self._toolsets[url].__aexit__(None, None, None)
+        except Exception as e:
+            logger.warning(f"Closing MCP session {url} failed: {e}")
+
+    async def check(self, url: str) -> bool:
+        """Probe the server, reconnecting when it does not respond, and expire its cached tool list.
+
+        Returns:
+            Whether the server's session is open after the check
+        """
+        toolset = self._toolsets[url]
+        try:
+            if url not in self._connected:
+                await self.connect(url)
+            elif isinstance(toolset, MCPToolset):
+                # unlike ping, listing tools is supported by stateless (modern) MCP sessions as well
+                async with asyncio.timeout(self.timeout):
+                    await toolset.client.list_tools()
+        except Exception as e:
+            logger.warning(f"MCP server {url} is not responding ({e}), reconnecting")
+            metrics.inc("mcp_reconnects_total", server=url)
+            await self.disconnect(url)
+            try:
+                await self.connect(url)
+            except Exception as e:
+                logger.error(f"Reconnecting to MCP server {url} failed: {e}")
+                return False
+
+        self._expire_tools(url)
+        return True
+
+    def _expire_tools(self, url: str) -> None:
+        """Drop the server's cached tool list once it is older than ``tools_ttl``.
+
+        MCPToolset caches tools for the lifetime of the session; servers sending change
+        notifications keep the cache fresh themselves.
+        """
+        now = time.monotonic()
+        if now - self._tools_refreshed_at.get(url, now) < self.tools_ttl:
+            return
+        self._tools_refreshed_at[url] = now
+        toolset = self._toolsets[url]
+        if not isinstance(toolset, MCPToolset) or toolset.capabilities.tools_list_changed:
+            return
+        # there is no public way to expire the cache (see pydantic-ai pin in pyproject.toml)
+        toolset._invalidate_tools_cache()
+
+    async def start(self) -> None:
+        """Keep sessions open on the running event loop and start health checks."""
+        self._loop = asyncio.get_running_loop()
+        for url in list(self._toolsets):
+            try:
+                await self.connect(url)
+            except Exception as e:
+                # agent runs will retry the connection
+                logger.error(f"Connecting to MCP server {url} failed: {e}")
+        self._health_task = asyncio.create_task(self._health_loop())
+
+    async def stop(self) -> None:
+        """Stop health checks and close all sessions."""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            self._health_task = None
+        for url in list(self._connected):
+            await self.disconnect(url)
+        self._loop = None
+
+    async def _health_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            for url in list(self._toolsets):
+                try:
+                    await self.check(url)
+                except Exception as e:
+                    # keep checking the other servers and the next rounds
+                    logger.error(f"Health check of MCP server {url} failed: {e}")
+
+
+mcp_connections = MCPConnectionManager()
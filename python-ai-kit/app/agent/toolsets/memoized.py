@@ -0,0 +1,44 @@
+import json
+from dataclasses import dataclass
+from typing import Any
+
+from pydantic_ai import RunContext
+from pydantic_ai.toolsets import ToolsetTool, WrapperToolset
+
+from app.agent.tools.memoize import ToolCacheScope, ToolResultCache, tool_result_cache
+from app.config import settings
+
+
+def is_idempotent(tool: ToolsetTool[Any]) -> bool:
+    """Whether the MCP server marked the tool as read-only or idempotent."""
+    annotations = (tool.tool_def.metadata or {}).get("annotations") or {}
+    return bool(annotations.get("readOnlyHint") or annotations.get("idempotentHint"))
+
+
+@dataclass
+class MemoizedToolset(WrapperToolset[Any]):
+    """Cache of the results of MCP tools annotated with ``readOnlyHint`` or ``idempotentHint``.
+
+    Repeated calls with the same arguments within ``scope`` are answered from the shared
+    tool result cache without reaching the server; other tools are always called.
+    """
+
+    name: str
+    scope: ToolCacheScope = "run"
+    ttl: float | None = None
+
+    async def call_tool(
+        self, name: str, tool_args: dict[str, Any], ctx: RunContext[Any], tool: ToolsetTool[Any]
+    ) -> Any:
+        if not settings.tool_cache_enabled or not is_idempotent(tool):
+            return await self.wrapped.call_tool(name, tool_args, ctx, tool)
+        arguments = json.dumps(tool_args, sort_keys=True, default=str)
+        key = ToolResultCache.key(f"{self.name}/{name}", arguments, self.scope, ctx)
+        if key is None:
+            return await self.wrapped.call_tool(name, tool_args, ctx, tool)
+        hit, result = tool_result_cache.get(key, name)
+        if hit:
+            return result
+        result = await self.wrapped.call_tool(name, tool_args, ctx, tool)
+        tool_result_cache.set(key, result, ToolResultCache.entry_ttl(self.ttl, self.scope))
+        return result
@@ -0,0 +1,78 @@
+import asyncio
+import json
+import time
+from collections.abc import AsyncIterator
+from dataclasses import asdict, dataclass
+
+from app.agent.agent_manager import AgentManager
+from app.agent.workflows.agent_workflow import user_assistant_graph
+from app.agent.workflows.generation_events import WorkflowState
+from app.agent.workflows.nodes import StartNode
+from app.config import settings
+
+
+@dataclass
+class BatchItemResult:
+    """Outcome of a single message of a batch; ``index`` is its position in the request."""
+
+    index: int
+    message: str
+    response: str | None = None
+    error: str | None = None
+    duration_ms: float = 0.0
+
+
+async def run_batch(
+    messages: list[str],
+    manager: AgentManager,
+    language: str = "english",
+    concurrency: int = settings.batch_concurrency,
+    item_timeout: float = settings.timeout,
+) -> AsyncIterator[BatchItemResult]:
+    """Run the workflow for every message concurrently, yielding results in completion order.
+
+    All messages share the given manager; at most ``concurrency`` workflows run at a time.
+    A failing or timed out message is reported in its result and does not stop the batch.
+
+    Args:
+        messages: Messages to process, each as a separate conversation without history
+        manager: Initialized AgentManager shared by the whole batch
+        language: Language passed to the agents
+        concurrency: Maximum number of workflows running at the same time
+        item_timeout: Timeout of a single workflow run in seconds
+
+    Yields:
+        Result of each message as soon as it is ready
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_one(index: int, message: str) -> BatchItemResult:
+        async with semaphore:
+            started = time.perf_counter()
+            result = BatchItemResult(index=index, message=message)
+            try:
+                deps = manager.to_deps(message=message, language=language)
+                result.response = await asyncio.wait_for(
+                    user_assistant_graph.run(inputs=StartNode(), state=WorkflowState(), deps=deps),
+                    timeout=item_timeout,
+                )
+            except asyncio.TimeoutError:
+                result.error = "Request timeout."
+            except Exception as e:
+                result.error = f"An error occurred: {str(e)}"
+            result.duration_ms = round((time.perf_counter() - started) * 1000, 1)
+            return result
+
+    tasks = [asyncio.create_task(run_one(index, message)) for index, message in enumerate(messages)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # the consumer went away (e.g. the client disconnected): stop the remaining runs
+        for task in tasks:
+            task.cancel()
+
+
+def to_ndjson(result: BatchItemResult) -> str:
+    """Serialize a batch result as a newline-delimited JSON line."""
+    return json.dumps(asdict(result)) + "\n"
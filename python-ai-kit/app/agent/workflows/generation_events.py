@@ -1,5 +1,9 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import ClassVar
 
+from app.agent.workflows.run_log import RunLog, new_run_log
+from app.agent.workflows.speculation import SpeculativeGeneration
+from app.agent.workflows.token_stream import TokenStream
 from app.schemas.agent import TaskType
 
 
@@ -44,6 +48,47 @@ class WorkflowState:
     task_type: TaskType | None = None
     generated_response: str = ""
     refusal_info: RefusalInfo | None = None
+    response_stream: TokenStream | None = None
+    speculation: SpeculativeGeneration | None = None
+    tool_calls: list[str] = field(default_factory=list)
+    # cleared when the response depends on side effects and must not be served from the response cache
+    cacheable: bool = True
+    # node timings, tokens and the route of this run, for the graph-run event log (RUN_LOG_ENABLED)
+    run_log: RunLog | None = field(default_factory=new_run_log, repr=False, compare=False)
+
+    @property
+    def route(self) -> str | None:
+        """Route the run took: the classified task type, "refuse" for messages refused by the router."""
+        if self.task_type is not None:
+            return self.task_type.name
+        return TaskType.refuse.name if self.refusal_info is not None else None
 
     def set_refusal(self, message: str, reason: str) -> None:
         self.refusal_info = RefusalInfo(refusal_reason=reason)
+
+
+@dataclass
+class NodeStartedEvent:
+    event: ClassVar[str] = "node"
+    node: str
+
+
+@dataclass
+class TokenDeltaEvent:
+    event: ClassVar[str] = "token"
+    delta: str
+
+
+@dataclass
+class WorkflowEndEvent:
+    event: ClassVar[str] = "end"
+    response: str
+
+
+@dataclass
+class WorkflowErrorEvent:
+    event: ClassVar[str] = "error"
+    error: str
+
+
+WorkflowStreamEvent = NodeStartedEvent | TokenDeltaEvent | WorkflowEndEvent | WorkflowErrorEvent
@@ -0,0 +1,134 @@
+import asyncio
+import time
+from collections.abc import Callable
+from contextlib import nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import wraps
+from typing import Any
+
+from opentelemetry import trace
+from pydantic_ai.usage import RunUsage
+from pydantic_graph import BaseNode, End, GraphRunContext
+
+from app.config import settings
+from app.utils.metrics import metrics
+
+
+@dataclass
+class NodeStats:
+    """What a workflow node run has used so far; shared with the tasks it starts (e.g. response streams)."""
+
+    node: str
+    queue_seconds: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_hits: int = 0
+
+
+_current_node: ContextVar[NodeStats | None] = ContextVar("workflow_node", default=None)
+
+# node spans are only created with OTEL_ENABLED, so without an exporter nodes skip the OpenTelemetry API entirely
+_tracer = trace.get_tracer(__name__) if settings.otel_enabled else None
+
+
+def current_node() -> NodeStats | None:
+    """Stats of the workflow node the caller runs in, None outside of instrumented nodes."""
+    return _current_node.get()
+
+
+def record_queue_time(seconds: float) -> None:
+    """Attribute time an LLM call waited for the provider limiter to the running node."""
+    if (stats := _current_node.get()) is not None:
+        stats.queue_seconds += seconds
+        metrics.observe("workflow_node_queue_seconds", seconds, node=stats.node)
+
+
+def record_usage(usage: RunUsage) -> None:
+    """Attribute the tokens of an agent run to the running node."""
+    if (stats := _current_node.get()) is None:
+        return
+    stats.input_tokens += usage.input_tokens
+    stats.output_tokens += usage.output_tokens
+    stats.cache_read_tokens += usage.cache_read_tokens
+    metrics.inc("workflow_node_input_tokens_total", usage.input_tokens, node=stats.node)
+    metrics.inc("workflow_node_output_tokens_total", usage.output_tokens, node=stats.node)
+    metrics.inc("workflow_node_cache_read_tokens_total", usage.cache_read_tokens, node=stats.node)
+
+
+def record_cache_hit(cache: str) -> None:
+    """Count a hit of an application cache (routing decisions, tool results) for the running node."""
+    if (stats := _current_node.get()) is not None:
+        stats.cache_hits += 1
+        metrics.inc("workflow_node_cache_hits_total", node=stats.node, cache=cache)
+
+
+def instrumented[NodeT: type[BaseNode[Any, Any, Any]]](node_type: NodeT) -> NodeT:
+    """Class decorator measuring every run of a workflow node.
+
+    Records the wall time (``workflow_node_duration_seconds``), runs by outcome
+    (``workflow_node_runs_total``) and errors by type (``workflow_node_errors_total``).
+    LLM calls made by the node add their limiter wait, tokens and cache hits through
+    ``record_*``. With ``OTEL_ENABLED``, every run is also an OpenTelemetry span, parent
+    of the spans of the agent runs inside it. When the graph state has a ``run_log``
+    (see ``app.agent.workflows.run_log``), the node run is added to it, and the run log
+    is written out once a node ends the run or fails.
+    """
+    run: Callable[..., Any] = node_type.run
+    if getattr(run, "instrumented", False):
+        return node_type
+    name = node_type.get_node_id()
+
+    @wraps(run)
+    async def instrumented_run(self: BaseNode[Any, Any, Any], ctx: GraphRunContext[Any, Any]) -> Any:
+        stats = NodeStats(name)
+        token = _current_node.set(stats)
+        span_context = (
+            _tracer.start_as_current_span(f"workflow node {name}", attributes={"workflow.node": name})
+            if _tracer is not None
+            else nullcontext()
+        )
+        outcome = "ok"
+        error: str | None = None
+        result: Any = None
+        started_at = time.time()
+        started = time.perf_counter()
+        try:
+            with span_context as span:
+                try:
+                    result = await run(self, ctx)
+                finally:
+                    if span is not None:
+                        span.set_attributes(
+                            {
+                                "workflow.node.queue_seconds": stats.queue_seconds,
+                                "workflow.node.input_tokens": stats.input_tokens,
+                                "workflow.node.output_tokens": stats.output_tokens,
+                                "workflow.node.cache_read_tokens": stats.cache_read_tokens,
+                                "workflow.node.cache_hits": stats.cache_hits,
+                            }
+                        )
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        except Exception as e:
+            outcome = "error"
+            error = type(e).__name__
+            metrics.inc("workflow_node_errors_total", node=name, error=error)
+            raise
+        finally:
+            _current_node.reset(token)
+            duration = time.perf_counter() - started
+            metrics.observe("workflow_node_duration_seconds", duration, node=name)
+            metrics.inc("workflow_node_runs_total", node=name, outcome=outcome)
+            if (run_log := getattr(ctx.state, "run_log", None)) is not None:
+                next_node = result.get_node_id() if isinstance(result, BaseNode) else None
+                run_log.record_node(stats, started_at, duration, outcome, next_node, error)
+                if outcome != "ok" or isinstance(result, End):
+                    run_log.finish(outcome, getattr(ctx.state, "route", None))
+        return result
+
+    instrumented_run.instrumented = True  # type: ignore[attr-defined]
+    node_type.run = instrumented_run  # type: ignore[method-assign]
+    return node_type
@@ -2,9 +2,11 @@ from dataclasses import dataclass
 from pydantic_graph import BaseNode, GraphRunContext
 
 from app.agent.workflows.generation_events import WorkflowState
+from app.agent.workflows.instrumentation import instrumented
 from .routing import ClassifyNode
 
 
+@instrumented
 @dataclass
 class StartNode(BaseNode[WorkflowState, dict, str]):
     """Init state with user message."""
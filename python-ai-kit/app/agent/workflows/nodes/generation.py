@@ -2,9 +2,12 @@ from dataclasses import dataclass
 from pydantic_graph import BaseNode, GraphRunContext
 
 from app.agent.workflows.generation_events import WorkflowState
+from app.agent.workflows.instrumentation import instrumented
+from app.agent.workflows.token_stream import TokenStream
 from .guardrails import GuardrailsNode
 
 
+@instrumented
 @dataclass
 class GenerateNode(BaseNode[WorkflowState, dict, str]):
     """Generate response using main agent."""
@@ -12,9 +15,27 @@ class GenerateNode(BaseNode[WorkflowState, dict, str]):
     async def run(self, ctx: GraphRunContext[WorkflowState, dict]) -> 'GuardrailsNode':
         agent = ctx.deps['agent']
         chat_history = ctx.deps.get('chat_history', [])
-        response = await agent.generate_response(
-            ctx.state.current_message, 
-            chat_history
-        )
+        speculation = ctx.state.speculation
+
+        if ctx.deps.get('stream') is not None:
+            if speculation is not None:
+                ctx.state.response_stream = speculation.stream
+                return GuardrailsNode()
+            # keep generating in the background while guardrails consume the stream
+            ctx.state.response_stream = TokenStream(
+                agent.stream_response(ctx.state.current_message, chat_history)
+            )
+            return GuardrailsNode()
+
+        if speculation is not None:
+            response = await speculation.result()
+        else:
+            response = await agent.generate_response(
+                ctx.state.current_message,
+                chat_history
+            )
         ctx.state.generated_response = str(response.output)
+        ctx.state.tool_calls = agent.called_tools(response.new_messages())
+        if agent.has_side_effects(ctx.state.tool_calls):
+            ctx.state.cacheable = False
         return GuardrailsNode()
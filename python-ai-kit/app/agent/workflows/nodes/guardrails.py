@@ -2,13 +2,69 @@ from dataclasses import dataclass
 from pydantic_graph import BaseNode, End, GraphRunContext
 
 from app.agent.workflows.generation_events import WorkflowState
+from app.agent.workflows.instrumentation import instrumented
+from app.agent.workflows.streaming import StreamEmitter, iter_windows
+from app.config import settings
 
 
+@instrumented
 @dataclass
 class GuardrailsNode(BaseNode[WorkflowState, dict, str]):
     """Format and validate generated response."""
     
     async def run(self, ctx: GraphRunContext[WorkflowState, dict]) -> End[str]:
         guardrails = ctx.deps['guardrails']
-        result = await guardrails.refformat(ctx.state.generated_response)
+        emitter: StreamEmitter | None = ctx.deps.get('stream')
+
+        if emitter is None:
+            result = await guardrails.refformat(
+                ctx.state.generated_response, soft_word_limit=settings.guardrails_soft_word_limit
+            )
+            return End(result)
+
+        if ctx.state.response_stream is not None and settings.guardrails_stream_mode == "windowed":
+            return End(await self._stream_windowed(ctx, emitter))
+
+        if ctx.state.response_stream is not None:
+            ctx.state.generated_response = await ctx.state.response_stream.collect()
+
+        result = ""
+        async for delta in guardrails.refformat_stream(
+            ctx.state.generated_response, soft_word_limit=settings.guardrails_soft_word_limit
+        ):
+            result += delta
+            emitter.token(delta)
         return End(result)
+
+    async def _stream_windowed(self, ctx: GraphRunContext[WorkflowState, dict], emitter: StreamEmitter) -> str:
+        """Reformat the generated text window by window while it is still being generated.
+
+        Windows are joined with the whitespace they were cut at. Once a window would not fit
+        into what is left of the soft word limit, the rest of the response is condensed into
+        the remaining words in one reformatting call; when no words are left, generation stops.
+        """
+        guardrails = ctx.deps['guardrails']
+        stream = ctx.state.response_stream
+        remaining_words = settings.guardrails_soft_word_limit
+        result = ""
+
+        windows = iter_windows(stream, settings.guardrails_window_words)
+        async for separator, window in windows:
+            if remaining_words <= 0:
+                stream.cancel()
+                break
+            if len(window.split()) > remaining_words:
+                rest = [separator + window] + [sep + text async for sep, text in windows]
+                window = "".join(rest).strip()
+            if result:
+                emitter.token(separator)
+                result += separator
+            part = ""
+            async for delta in guardrails.refformat_stream(window, soft_word_limit=remaining_words):
+                part += delta
+                emitter.token(delta)
+            result += part
+            remaining_words -= len(part.split())
+
+        ctx.state.generated_response = stream.text
+        return result
@@ -4,8 +4,10 @@ from pydantic_graph import BaseNode, End, GraphRunContext
 
 from app.agent.static.default_msgs import REFUSAL_GENERIC
 from app.agent.workflows.generation_events import WorkflowState
+from app.agent.workflows.instrumentation import instrumented
 
 
+@instrumented
 @dataclass
 class RefuseNode(BaseNode[WorkflowState, dict, str]):
     """Returning refusal with a reason."""
@@ -14,4 +16,6 @@ class RefuseNode(BaseNode[WorkflowState, dict, str]):
         language = ctx.deps.get("language", "english")
         refusal_reason = ctx.state.refusal_info.refusal_reason if ctx.state.refusal_info else ""
         response = REFUSAL_GENERIC[language].format(refusal_reason=refusal_reason)
+        if (emitter := ctx.deps.get("stream")) is not None:
+            emitter.token(response)
         return End(response)
@@ -1,28 +1,63 @@
 from dataclasses import dataclass
 from pydantic_graph import BaseNode, GraphRunContext
 
+from app.agent.engines.routers import RoutingResponse
 from app.agent.workflows.generation_events import WorkflowState
+from app.agent.workflows.instrumentation import instrumented
+from app.agent.workflows.speculation import SpeculativeGeneration
+from app.config import settings
 from app.schemas.agent import TaskType
 from .generation import GenerateNode
 from .refusal import RefuseNode
 from .translation import TranslateNode
 
 
+@instrumented
 @dataclass
 class ClassifyNode(BaseNode[WorkflowState, dict, str]):
     """Classify task type."""
     
     async def run(self, ctx: GraphRunContext[WorkflowState, dict]) -> 'GenerateNode | RefuseNode | TranslateNode':        
         router = ctx.deps['router']
-        classification = await router.route(ctx.state.current_message)
+        if settings.speculative_generation_enabled:
+            classification = await self._route_speculatively(ctx)
+        else:
+            classification = await router.route(ctx.state.current_message)
+        task_type = None
+        try:
+            task_type = TaskType(classification.route)
+        finally:
+            # settled even when the route is invalid, so the speculation budget is given back
+            if ctx.state.speculation is not None:
+                if task_type == TaskType.conversation:
+                    ctx.state.speculation.claim()
+                else:
+                    await ctx.state.speculation.cancel()
+                    ctx.state.speculation = None
         
-        if classification.route == TaskType.refuse:
+        if task_type == TaskType.refuse:
             ctx.state.set_refusal(ctx.state.current_message, classification.reasoning)
             return RefuseNode()
         
-        ctx.state.task_type = TaskType(classification.route)
+        ctx.state.task_type = task_type
         
-        if classification.route == TaskType.translate:
+        if task_type == TaskType.translate:
             return TranslateNode()
         
         return GenerateNode()
+
+    async def _route_speculatively(self, ctx: GraphRunContext[WorkflowState, dict]) -> RoutingResponse:
+        """Route the message while the main agent already generates a response to it."""
+        router = ctx.deps['router']
+        message = ctx.state.current_message
+        if (classification := await router.route_locally(message)) is not None:
+            return classification
+
+        ctx.state.speculation = SpeculativeGeneration.start(ctx.deps, message)
+        try:
+            return await router.route_with_llm(message)
+        except BaseException:
+            if ctx.state.speculation is not None:
+                await ctx.state.speculation.cancel()
+                ctx.state.speculation = None
+            raise
@@ -2,9 +2,12 @@ from dataclasses import dataclass
 from pydantic_graph import BaseNode, GraphRunContext
 
 from app.agent.workflows.generation_events import WorkflowState
+from app.agent.workflows.instrumentation import instrumented
+from app.agent.workflows.token_stream import TokenStream
 from .guardrails import GuardrailsNode
 
 
+@instrumented
 @dataclass
 class TranslateNode(BaseNode[WorkflowState, dict, str]):
     """Node that translates text to target language."""
@@ -13,7 +16,13 @@ class TranslateNode(BaseNode[WorkflowState, dict, str]):
         
         translator = ctx.deps['translator']
         target_lang = ctx.deps.get('target_language', 'english')
-        
+
+        if ctx.deps.get('stream') is not None:
+            ctx.state.response_stream = TokenStream(
+                translator.translate_stream(ctx.state.current_message, target_lang)
+            )
+            return GuardrailsNode()
+
         result = await translator.translate(
             ctx.state.current_message,
             target_lang
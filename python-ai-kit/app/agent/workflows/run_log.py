@@ -0,0 +1,271 @@
+import json
+import logging
+import os
+import threading
+import uuid
+from dataclasses import MISSING, asdict, dataclass, fields
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Protocol
+
+from app.agent.workflows.instrumentation import NodeStats
+from app.config import settings
+from app.utils.batch_writer import BatchWriter
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RunEvent:
+    """One entry of the graph-run event log: a node run (``kind="node"``) or a whole run (``kind="run"``).
+
+    ``started_at`` is a Unix timestamp; tokens, limiter wait and cache hits of a run entry
+    are the totals of its nodes.
+    """
+
+    run_id: str
+    seq: int
+    kind: str
+    started_at: float
+    duration: float
+    outcome: str
+    node: str | None = None
+    next_node: str | None = None
+    route: str | None = None
+    error: str | None = None
+    queue_seconds: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_hits: int = 0
+
+
+RUN_EVENT_FIELDS = [field.name for field in fields(RunEvent)]
+_RUN_EVENT_DEFAULTS = {field.name: field.default for field in fields(RunEvent) if field.default is not MISSING}
+
+
+class RunLog:
+    """Events of one graph run, kept in the run's state and written out when the run ends."""
+
+    def __init__(self) -> None:
+        self.run_id = str(uuid.uuid4())
+        self.events: list[RunEvent] = []
+        self._stats: list[NodeStats] = []
+        self._finished = False
+
+    def record_node(
+        self,
+        stats: NodeStats,
+        started_at: float,
+        duration: float,
+        outcome: str,
+        next_node: str | None = None,
+        error: str | None = None,
+    ) -> None:
+        self.events.append(
+            RunEvent(
+                run_id=self.run_id,
+                seq=len(self.events),
+                kind="node",
+                started_at=started_at,
+                duration=duration,
+                outcome=outcome,
+                node=stats.node,
+                next_node=next_node,
+                error=error,
+            )
+        )
+        self._stats.append(stats)
+
+    def finish(self, outcome: str, route: str | None) -> None:
+        """Add the run entry and hand the run's events to the writer; later calls are ignored."""
+        if self._finished or not self.events:
+            return
+        self._finished = True
+        nodes = self.events
+        # read now: tokens of a response streamed after its node returned count for that node
+        for event, stats in zip(nodes, self._stats):
+            event.queue_seconds = stats.queue_seconds
+            event.input_tokens = stats.input_tokens
+            event.output_tokens = stats.output_tokens
+            event.cache_read_tokens = stats.cache_read_tokens
+            event.cache_hits = stats.cache_hits
+        started_at = nodes[0].started_at
+        last = nodes[-1]
+        self.events = [
+            *nodes,
+            RunEvent(
+                run_id=self.run_id,
+                seq=len(nodes),
+                kind="run",
+                started_at=started_at,
+                duration=last.started_at + last.duration - started_at,
+                outcome=outcome,
+                route=route,
+                error=last.error,
+                queue_seconds=sum(event.queue_seconds for event in nodes),
+                input_tokens=sum(event.input_tokens for event in nodes),
+                output_tokens=sum(event.output_tokens for event in nodes),
+                cache_read_tokens=sum(event.cache_read_tokens for event in nodes),
+                cache_hits=sum(event.cache_hits for event in nodes),
+            ),
+        ]
+        run_log_writer.submit(self.events)
+
+
+def new_run_log() -> RunLog | None:
+    """Run log of a new graph run, None when RUN_LOG_ENABLED is off."""
+    return RunLog() if settings.run_log_enabled else None
+
+
+class RunLogSink(Protocol):
+    def write(self, events: list[RunEvent]) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class JsonlSegmentSink:
+    """Appends events to JSON Lines segments in ``directory``.
+
+    A new segment is started every ``segment_events`` events. Segment names carry the
+    time they were started and the process ID, so workers never write to the same file.
+    """
+
+    def __init__(self, directory: str = settings.run_log_dir, segment_events: int = settings.run_log_segment_events):
+        self.directory = Path(directory)
+        self.segment_events = segment_events
+        self._file: Any = None
+        self._written = 0
+
+    def write(self, events: list[RunEvent]) -> None:
+        for event in events:
+            if self._file is None or self._written >= self.segment_events:
+                self._rotate()
+            # fields left at their defaults are omitted, times are kept to the microsecond
+            record = {
+                key: round(value, 6) if isinstance(value, float) else value
+                for key, value in asdict(event).items()
+                if key not in _RUN_EVENT_DEFAULTS or value != _RUN_EVENT_DEFAULTS[key]
+            }
+            self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+            self._written += 1
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _rotate(self) -> None:
+        self.close()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        name = f"runs-{datetime.now(UTC):%Y%m%dT%H%M%S}-{os.getpid()}.jsonl"
+        # stays open for the writes of the whole segment, closed by close()
+        self._file = open(self.directory / name, "a", encoding="utf-8")  # noqa: SIM115
+        self._written = 0
+
+
+class PostgresCopySink:
+    """Appends events to the ``GraphRunEvent`` table with COPY, over a connection of its own."""
+
+    def __init__(self) -> None:
+        from app.models import GraphRunEvent
+
+        self.table = GraphRunEvent.__tablename__
+        self._connection: Any = None
+
+    def write(self, events: list[RunEvent]) -> None:
+        import psycopg
+
+        if self._connection is None or self._connection.closed:
+            self._connection = psycopg.connect(
+                host=settings.db_host,
+                port=settings.db_port,
+                dbname=settings.db_name,
+                user=settings.db_user,
+                password=settings.db_password.get_secret_value(),
+            )
+        try:
+            with (
+                self._connection.cursor() as cursor,
+                cursor.copy(f"COPY {self.table} ({', '.join(RUN_EVENT_FIELDS)}) FROM STDIN") as copy,
+            ):
+                for event in events:
+                    row = asdict(event)
+                    row["started_at"] = datetime.fromtimestamp(event.started_at, UTC)
+                    copy.write_row([row[name] for name in RUN_EVENT_FIELDS])
+            self._connection.commit()
+        except Exception:
+            # reconnect for the next batch
+            self.close()
+            raise
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+class RunLogWriter:
+    """Writes run events to a sink from a background thread, off the request path.
+
+    ``submit`` only puts a finished run on a bounded queue; runs arriving while it is full
+    are dropped and counted in ``run_log_dropped_runs_total``. The thread writes queued
+    runs in batches of up to ``batch_size`` runs, at least every ``flush_interval`` seconds.
+    It is started by the first submitted run, so processes that never log start no thread.
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int = settings.run_log_queue_size,
+        batch_size: int = 200,
+        flush_interval: float = settings.run_log_flush_interval,
+    ) -> None:
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._writer: BatchWriter[list[RunEvent]] | None = None
+        self._lock = threading.Lock()
+        self._sink: RunLogSink | None = None
+
+    def submit(self, events: list[RunEvent]) -> None:
+        writer = self._writer or self._start()
+        if not writer.put(events):
+            metrics.inc("run_log_dropped_runs_total")
+
+    def shutdown(self) -> None:
+        """Write what is queued and stop the writer thread."""
+        if self._writer is not None:
+            self._writer.shutdown()
+
+    def _start(self) -> BatchWriter[list[RunEvent]]:
+        with self._lock:
+            if self._writer is None:
+                self._sink = PostgresCopySink() if settings.run_log_sink == "postgres" else JsonlSegmentSink()
+                writer = BatchWriter(
+                    self._flush,
+                    name="RunLogWriter",
+                    max_queue_size=self.max_queue_size,
+                    batch_size=self.batch_size,
+                    flush_interval=self.flush_interval,
+                    close=self._sink.close,
+                )
+                writer.start()
+                self._writer = writer
+            return self._writer
+
+    def _flush(self, runs: list[list[RunEvent]]) -> None:
+        if self._sink is None:
+            return
+        events = [event for run in runs for event in run]
+        try:
+            self._sink.write(events)
+        except Exception as e:
+            metrics.inc("run_log_write_errors_total")
+            logger.warning(f"Writing {len(events)} run log events failed: {e}")
+            return
+        metrics.inc("run_log_written_events_total", len(events))
+
+
+run_log_writer = RunLogWriter()
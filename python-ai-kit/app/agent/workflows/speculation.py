@@ -0,0 +1,76 @@
+import asyncio
+from contextlib import suppress
+from typing import Any
+
+from pydantic_ai.messages import ModelMessage
+from pydantic_ai.run import AgentRunResult
+from pydantic_ai.usage import RunUsage
+
+from app.agent.engines.agent_base import BaseAgent
+from app.agent.workflows.token_stream import TokenStream
+from app.config import settings
+from app.utils.metrics import metrics
+
+
+class SpeculativeGeneration:
+    """Main agent run started while the router is still classifying the message.
+
+    Most messages are routed to the main agent, so generating in parallel with the
+    router saves a full LLM round trip. The run is claimed when the route confirms it
+    (and then consumed by ``GenerateNode``) and cancelled otherwise; tokens of cancelled runs are counted under
+    ``speculative_generation_wasted_tokens_total``. Unconfirmed runs are limited to
+    ``settings.speculative_generation_max_in_flight`` per process to bound the extra spend.
+    """
+
+    in_flight = 0
+
+    def __init__(self, agent: BaseAgent, message: str, chat_history: list[ModelMessage], streaming: bool) -> None:
+        self.usage = RunUsage()
+        self.stream: TokenStream | None = None
+        self.task: asyncio.Task[AgentRunResult] | None = None
+        if streaming:
+            self.stream = TokenStream(agent.stream_response(message, chat_history, usage=self.usage))
+        else:
+            self.task = asyncio.create_task(agent.generate_response(message, chat_history, usage=self.usage))
+        self._settled = False
+        SpeculativeGeneration.in_flight += 1
+
+    @classmethod
+    def start(cls, deps: dict[str, Any], message: str) -> "SpeculativeGeneration | None":
+        """Start generating for the message unless the speculation budget is used up."""
+        if cls.in_flight >= settings.speculative_generation_max_in_flight:
+            metrics.inc("speculative_generation_total", outcome="skipped")
+            return None
+        return cls(deps["agent"], message, deps.get("chat_history", []), streaming=deps.get("stream") is not None)
+
+    def _settle(self, outcome: str) -> None:
+        if not self._settled:
+            self._settled = True
+            SpeculativeGeneration.in_flight -= 1
+            metrics.inc("speculative_generation_total", outcome=outcome)
+
+    def claim(self) -> None:
+        """Mark the run as confirmed by the router."""
+        self._settle("used")
+
+    async def result(self) -> AgentRunResult:
+        """Wait for the claimed (non-streaming) run, cancelling it if the caller is cancelled."""
+        if self.task is None:
+            raise RuntimeError("speculative generation is streaming; consume its stream instead")
+        try:
+            return await self.task
+        except asyncio.CancelledError:
+            self.task.cancel()
+            raise
+
+    async def cancel(self) -> None:
+        """Stop the run and wait until it has been cleaned up."""
+        if self.stream is not None:
+            await self.stream.aclose()
+        if self.task is not None:
+            self.task.cancel()
+            with suppress(asyncio.CancelledError, Exception):
+                await self.task
+        # tokens of requests that completed before the cancellation; an interrupted request is not reported
+        metrics.inc("speculative_generation_wasted_tokens_total", self.usage.total_tokens)
+        self._settle("cancelled")
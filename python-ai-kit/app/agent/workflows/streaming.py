@@ -0,0 +1,112 @@
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from dataclasses import asdict
+from typing import Any
+
+from pydantic_graph import EndMarker, Graph
+
+from app.agent.workflows.generation_events import (
+    NodeStartedEvent,
+    TokenDeltaEvent,
+    WorkflowEndEvent,
+    WorkflowState,
+    WorkflowStreamEvent,
+)
+
+
+class StreamEmitter:
+    """Queue of events emitted while a workflow graph runs in streaming mode.
+
+    Nodes find the emitter under the ``stream`` key of the graph deps; when it is
+    missing, the graph runs in its regular, non-streaming mode.
+    """
+
+    def __init__(self) -> None:
+        self._queue: asyncio.Queue[WorkflowStreamEvent | None] = asyncio.Queue()
+
+    def emit(self, event: WorkflowStreamEvent) -> None:
+        self._queue.put_nowait(event)
+
+    def token(self, delta: str) -> None:
+        self.emit(TokenDeltaEvent(delta=delta))
+
+    def close(self) -> None:
+        self._queue.put_nowait(None)
+
+    async def events(self) -> AsyncIterator[WorkflowStreamEvent]:
+        while (event := await self._queue.get()) is not None:
+            yield event
+
+
+def _split_whitespace(text: str) -> tuple[str, str]:
+    """Leading whitespace of the text and the text without surrounding whitespace."""
+    stripped = text.lstrip()
+    return text[: len(text) - len(stripped)], stripped.rstrip()
+
+
+async def iter_windows(deltas: AsyncIterator[str], min_words: int) -> AsyncIterator[tuple[str, str]]:
+    """Group a text stream into windows that end on a paragraph (or, for long paragraphs, sentence) boundary.
+
+    Args:
+        deltas: Stream of text chunks
+        min_words: Minimum number of words in every window but the last one
+
+    Yields:
+        Consecutive windows of the streamed text, each with the whitespace that preceded
+        it in the text (a paragraph break, or a space after a sentence)
+    """
+    buffer = ""
+    async for delta in deltas:
+        buffer += delta
+        boundary = buffer.rfind("\n\n")
+        if boundary == -1 and len(buffer.split()) >= 4 * min_words:
+            boundary = buffer.rfind(". ") + 1
+        if boundary > 0 and len(buffer[:boundary].split()) >= min_words:
+            window, buffer = buffer[:boundary], buffer[boundary:]
+            # whitespace trailing the window precedes the next one
+            buffer = window[len(window.rstrip()) :] + buffer
+            yield _split_whitespace(window)
+    if buffer.strip():
+        yield _split_whitespace(buffer)
+
+
+async def stream_workflow(
+    graph: Graph,
+    inputs: Any,
+    state: WorkflowState,
+    deps: dict[str, Any],
+) -> AsyncIterator[WorkflowStreamEvent]:
+    """Run a workflow graph, yielding node transitions, token deltas and the final response.
+
+    Errors raised by the graph are re-raised to the consumer once all events
+    emitted before the failure have been yielded.
+    """
+    emitter = StreamEmitter()
+
+    async def drive() -> None:
+        try:
+            async with graph.iter(inputs=inputs, state=state, deps={**deps, "stream": emitter}) as run:
+                async for step in run:
+                    if isinstance(step, EndMarker):
+                        emitter.emit(WorkflowEndEvent(response=step.value))
+                    else:
+                        for task in step:
+                            emitter.emit(NodeStartedEvent(node=str(task.node_id)))
+        finally:
+            emitter.close()
+
+    runner = asyncio.create_task(drive())
+    try:
+        async for event in emitter.events():
+            yield event
+        await runner
+    finally:
+        runner.cancel()
+        if state.response_stream is not None:
+            state.response_stream.cancel()
+
+
+def to_sse(event: WorkflowStreamEvent) -> str:
+    """Serialize a workflow event as a Server-Sent Events message."""
+    return f"event: {event.event}\ndata: {json.dumps(asdict(event))}\n\n"
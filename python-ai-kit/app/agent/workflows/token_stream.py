@@ -0,0 +1,46 @@
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import suppress
+
+
+class TokenStream:
+    """Text deltas of an agent run that is streamed in a background task.
+
+    The task owns the agent's streaming context, so a later workflow node can
+    consume the deltas while generation is still in progress.
+    """
+
+    def __init__(self, deltas: AsyncIterator[str]) -> None:
+        self.text = ""
+        self._queue: asyncio.Queue[str | None] = asyncio.Queue()
+        self._task = asyncio.create_task(self._produce(deltas))
+
+    async def _produce(self, deltas: AsyncIterator[str]) -> None:
+        try:
+            async for delta in deltas:
+                self._queue.put_nowait(delta)
+        finally:
+            self._queue.put_nowait(None)
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        while (delta := await self._queue.get()) is not None:
+            self.text += delta
+            yield delta
+        # re-raise errors from the agent run
+        await self._task
+
+    async def collect(self) -> str:
+        """Wait for the run to finish and return the full text."""
+        async for _ in self:
+            pass
+        return self.text
+
+    def cancel(self) -> None:
+        """Stop the agent run if it is still in progress."""
+        self._task.cancel()
+
+    async def aclose(self) -> None:
+        """Stop the agent run and wait until its streaming context has been closed."""
+        self._task.cancel()
+        with suppress(asyncio.CancelledError, Exception):
+            await self._task
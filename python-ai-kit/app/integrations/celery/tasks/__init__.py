@@ -1,3 +0,0 @@
-from .dummy_task import dummy_task
-
-__all__ = ["dummy_task"]
@@ -0,0 +1,23 @@
+import asyncio
+from dataclasses import asdict
+
+from app.agent.factories import WorkflowAgentFactory
+from app.agent.workflows.batch import run_batch
+from app.config import settings
+from celery import shared_task
+
+
+@shared_task
+def chat_batch(messages: list[str], language: str = settings.default_language, use_mcp: bool = False) -> list[dict]:
+    """Run the chat workflow for many messages concurrently.
+
+    Returns:
+        Per-message results (``index``, ``message``, ``response``, ``error``, ``duration_ms``) in completion order
+    """
+    return asyncio.run(_chat_batch(messages, language, use_mcp))
+
+
+async def _chat_batch(messages: list[str], language: str, use_mcp: bool) -> list[dict]:
+    # the pooled managers belong to the API event loop; the task builds one for its own loop
+    manager = await WorkflowAgentFactory.create_manager(use_mcp=use_mcp, language=language)
+    return [asdict(result) async for result in run_batch(messages, manager, language=language)]
@@ -0,0 +1,44 @@
+import asyncio
+from uuid import UUID
+
+import redis.asyncio as redis
+
+from app.agent.engines.summarizer import ConversationSummarizer
+from app.agent.factories import WorkflowAgentFactory
+from app.agent.history.store import conversation_store
+from app.config import settings
+from app.database import adb_session_ctx, async_engine
+from celery import shared_task
+
+# upper bound on how long a lock outlives a worker that died before releasing it
+COMPACTION_LOCK_TTL = 600
+
+
+def compaction_lock_key(conversation_id: UUID) -> str:
+    """Redis key held while a compaction of the conversation is queued or running."""
+    return f"compaction:{conversation_id}"
+
+
+@shared_task
+def compact_conversation(conversation_id: str, language: str) -> None:
+    """Fold older messages of a conversation into its running summary."""
+    asyncio.run(_compact(UUID(conversation_id), language))
+
+
+async def _compact(conversation_id: UUID, language: str) -> None:
+    summarizer = ConversationSummarizer(
+        language=language,
+        verbose=settings.debug_mode,
+        **WorkflowAgentFactory.model_kwargs(settings.summarizer_ai_provider, settings.summarizer_model),
+    )
+    locks = redis.from_url(settings.CELERY_BROKER_URL)
+    try:
+        async with adb_session_ctx() as db_session:
+            # an earlier task may have compacted the history already
+            if await conversation_store.needs_compaction(db_session, conversation_id):
+                await conversation_store.compact(db_session, conversation_id, summarizer)
+    finally:
+        await locks.delete(compaction_lock_key(conversation_id))
+        await locks.aclose()
+        # pooled connections are bound to this task's event loop
+        await async_engine.dispose()
@@ -1,13 +1,168 @@
 import inspect
-from collections.abc import Iterator
+import logging
+import os
+import random
+import time
+from collections.abc import Iterator, Sequence
 from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from typing import Any
 
 import mlflow
 import pydantic_ai
 import pydantic_ai.mcp
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+from pydantic_ai.models.instrumented import InstrumentationSettings
 
 from app.config import settings
+from app.utils.batch_writer import BatchWriter
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# False inside requests trace_chat sampled out
+_trace_sampled: ContextVar[bool] = ContextVar("mlflow_trace_sampled", default=True)
+
+
+@dataclass
+class TraceSamplingPolicy:
+    """Decides which chat requests are traced.
+
+    A request is sampled with the probability set for its route in ``route_rates``, or
+    ``rate`` for other routes. Requests sampled out are still logged when they fail
+    (``sample_errors``) or take at least ``slow_threshold`` seconds, as a single span
+    with the message, response and duration; their agent runs are not recorded.
+    """
+
+    rate: float = settings.MLFLOW_TRACE_SAMPLE_RATE
+    route_rates: dict[str, float] = field(default_factory=lambda: dict(settings.MLFLOW_TRACE_ROUTE_SAMPLE_RATES))
+    sample_errors: bool = settings.MLFLOW_TRACE_SAMPLE_ERRORS
+    slow_threshold: float | None = settings.MLFLOW_TRACE_SLOW_THRESHOLD
+
+    def sample(self, route: str) -> bool:
+        return random.random() < self.route_rates.get(route, self.rate)
+
+    def keep(self, failed: bool, seconds: float) -> str | None:
+        """Why a request sampled out is logged after all, None when it is not."""
+        if failed and self.sample_errors:
+            return "error"
+        if self.slow_threshold is not None and seconds >= self.slow_threshold:
+            return "slow"
+        return None
+
+
+trace_sampling = TraceSamplingPolicy()
+
+
+class _SampledInstrumentation(InstrumentationSettings):
+    """Agent instrumentation that is off in requests sampled out.
+
+    pydantic-ai checks the ``Agent.instrument_all()`` settings for truth at the start of
+    every run, so agent runs of unsampled requests skip model and tool instrumentation.
+    """
+
+    def __bool__(self) -> bool:
+        return _trace_sampled.get()
+
+
+class BufferedSpanExporter(SpanExporter):
+    """Exports spans to MLflow from a background thread, in batches, off the request path.
+
+    ``export`` only puts spans on a bounded queue, so a slow tracking server never adds
+    latency to requests; spans arriving while the queue is full are dropped and counted
+    in ``mlflow_spans_dropped_total``. The export thread passes them to the wrapped
+    exporter ``batch_size`` spans at a time, at least every ``flush_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        exporter: SpanExporter,
+        max_queue_size: int = settings.MLFLOW_EXPORT_QUEUE_SIZE,
+        batch_size: int = settings.MLFLOW_EXPORT_BATCH_SIZE,
+        flush_interval: float = settings.MLFLOW_EXPORT_INTERVAL,
+    ) -> None:
+        self.exporter = exporter
+        self._writer = BatchWriter(
+            self._flush,
+            name="MLflowTraceExport",
+            max_queue_size=max_queue_size,
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+            close=exporter.shutdown,
+        )
+        self._writer.start()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        for span in spans:
+            if not self._writer.put(span):
+                metrics.inc("mlflow_spans_dropped_total", reason="queue_full")
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        """Export what is queued and stop the export thread."""
+        self._writer.shutdown()
+
+    def _flush(self, batch: list[ReadableSpan]) -> None:
+        metrics.set("mlflow_export_queue_size", self._writer.qsize())
+        started = time.perf_counter()
+        try:
+            self.exporter.export(batch)
+        except Exception as e:
+            metrics.inc("mlflow_export_errors_total")
+            logger.warning(f"Exporting {len(batch)} spans to MLflow failed: {e}")
+        metrics.observe("mlflow_export_seconds", time.perf_counter() - started)
+        metrics.inc("mlflow_exported_spans_total", len(batch))
+
+
+def _install_buffered_export() -> None:
+    """Route the spans of MLflow's tracer provider through a ``BufferedSpanExporter``.
+
+    Relies on MLflow internals (3.14+): the MLflow span processor of the tracer provider
+    exports through its ``span_exporter`` attribute. When they change, MLflow's own
+    export is kept and a warning logged.
+    """
+    # the buffer replaces MLflow's batch processor and async queue, its exporter writes on the export thread
+    os.environ["MLFLOW_USE_BATCH_SPAN_PROCESSOR"] = "false"
+    os.environ["MLFLOW_ENABLE_ASYNC_TRACE_LOGGING"] = "false"
+    try:
+        from mlflow.tracing.provider import _get_span_processor, provider
+
+        provider.get_or_init_tracer(__name__)
+        processor = _get_span_processor()
+        exporter = getattr(processor, "span_exporter", None)
+        if exporter is None or getattr(processor, "_batch_delegate", None) is not None:
+            raise RuntimeError("the MLflow span processor has no span_exporter")
+    except Exception as e:
+        logger.warning(f"Buffered MLflow trace export is not available ({e}), exporting with MLflow's defaults")
+        return
+    processor.span_exporter = BufferedSpanExporter(exporter)
+
+
+def _sampling_ratio_override() -> ContextVar[Any] | None:
+    """MLflow's per-context override of ``MLFLOW_TRACE_SAMPLING_RATIO``, None when it is not available.
+
+    Relies on an MLflow internal (3.x).
+    """
+    try:
+        from mlflow.tracing.sampling import _SAMPLING_RATIO_OVERRIDE
+    except ImportError:
+        return None
+    return _SAMPLING_RATIO_OVERRIDE
+
+
+@contextmanager
+def _sampling_ratio(ratio: float) -> Iterator[None]:
+    """Set MLflow's trace sampling ratio within the block; without the override, MLflow's ratio applies."""
+    if (override := _sampling_ratio_override()) is None:
+        yield
+        return
+    token = override.set(ratio)
+    try:
+        yield
+    finally:
+        override.reset(token)
 
 
 def init_tracing() -> None:
@@ -24,12 +179,21 @@ def init_tracing() -> None:
     if not hasattr(pydantic_ai.mcp, "MCPServer"):
         pydantic_ai.mcp.MCPServer = pydantic_ai.mcp.MCPToolset  # ty: ignore[unresolved-attribute]
 
+    # agent runs outside of trace_chat (e.g. Celery tasks) are sampled by MLflow;
+    # trace_chat overrides the ratio with the decision of the sampling policy
+    if _sampling_ratio_override() is not None:
+        os.environ["MLFLOW_TRACE_SAMPLING_RATIO"] = str(settings.MLFLOW_TRACE_SAMPLE_RATE)
+    else:
+        # a ratio below 1 would then also drop spans of sampled requests
+        logger.warning("MLflow's sampling ratio cannot be overridden per request, agent runs are traced in full")
     mlflow.set_tracking_uri(settings.MLFLOW_TRACKING_URI)
     mlflow.set_experiment(settings.MLFLOW_EXPERIMENT)
+    if settings.MLFLOW_TRACE_EXPORT == "buffered":
+        _install_buffered_export()
     mlflow.pydantic_ai.autolog()
 
     pydantic_ai.Agent.__init__ = inspect.unwrap(pydantic_ai.Agent.__init__)
-    pydantic_ai.Agent.instrument_all()
+    pydantic_ai.Agent.instrument_all(_SampledInstrumentation())
 
 
 class _NoopSpan:
@@ -39,18 +203,76 @@ class _NoopSpan:
         pass
 
 
+class _UnsampledSpan:
+    """Stands in for the span of a request sampled out, keeping its outputs in case it is logged after all."""
+
+    def __init__(self) -> None:
+        self.outputs: Any = None
+
+    def set_outputs(self, outputs: Any) -> None:
+        self.outputs = outputs
+
+
+def _log_unsampled(
+    message: str, route: str, span: _UnsampledSpan, error: Exception | None, reason: str, started: int
+) -> None:
+    """Log a request sampled out as a single span, started at ``started`` (ns since the epoch)."""
+    try:
+        with _sampling_ratio(1.0):
+            live_span = mlflow.start_span_no_context(
+                "chat",
+                span_type="CHAIN",
+                inputs={"message": message},
+                attributes={"route": route, "sampling": reason},
+                start_time_ns=started,
+            )
+            if error is not None:
+                live_span.record_exception(error)
+            live_span.end(outputs=span.outputs)
+    except Exception as e:
+        logger.warning(f"Logging the trace of a {reason} request failed: {e}")
+
+
 @contextmanager
-def trace_chat(message: str) -> Iterator[Any]:
+def trace_chat(message: str, route: str = "chat") -> Iterator[Any]:
     """Parent span grouping all agent runs of one request into a single trace.
 
     Records the user message as the trace request; call ``set_outputs`` on the
     yielded span to record the response. Without a parent span, every
     Agent.run() inside the workflow graph becomes its own root span, so one
     chat request shows up as several separate traces.
+
+    Whether the request is traced is decided here, once, by ``trace_sampling``. In a
+    request sampled out, agents run without instrumentation and MLflow records no spans.
     """
     if not settings.MLFLOW_TRACING_ENABLED:
         yield _NoopSpan()
         return
-    with mlflow.start_span("chat", span_type="CHAIN") as span:
-        span.set_inputs({"message": message})
-        yield span
+
+    if trace_sampling.sample(route):
+        metrics.inc("mlflow_traces_total", route=route, outcome="sampled")
+        with (
+            _sampling_ratio(1.0),
+            mlflow.start_span("chat", span_type="CHAIN", attributes={"route": route, "sampling": "rate"}) as span,
+        ):
+            span.set_inputs({"message": message})
+            yield span
+        return
+
+    span = _UnsampledSpan()
+    sampled = _trace_sampled.set(False)
+    started = time.time_ns()
+    error: Exception | None = None
+    try:
+        # spans started anyway (e.g. by MLflow's Agent.run patch) are dropped by MLflow's sampler
+        with _sampling_ratio(0.0):
+            yield span
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        _trace_sampled.reset(sampled)
+        reason = trace_sampling.keep(error is not None, (time.time_ns() - started) / 1e9)
+        metrics.inc("mlflow_traces_total", route=route, outcome=reason or "sampled_out")
+        if reason is not None:
+            _log_unsampled(message, route, span, error, reason, started)
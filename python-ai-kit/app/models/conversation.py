@@ -0,0 +1,21 @@
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from sqlalchemy.orm import Mapped
+
+from app.database import BaseDbModel
+from app.mappings import OneToMany, PrimaryKey, datetime_tz
+
+if TYPE_CHECKING:
+    from app.models.message import Message
+
+
+class Conversation(BaseDbModel):
+    id: Mapped[PrimaryKey[UUID]]
+    created_at: Mapped[datetime_tz]
+    updated_at: Mapped[datetime_tz]
+    # running summary of all messages up to (and including) summary_message_id
+    summary: Mapped[str | None]
+    summary_message_id: Mapped[int | None]
+
+    messages: Mapped[OneToMany["Message"]]
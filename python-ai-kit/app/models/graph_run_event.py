@@ -0,0 +1,30 @@
+from uuid import UUID
+
+from sqlalchemy.orm import Mapped
+
+from app.database import BaseDbModel
+from app.mappings import Indexed, PrimaryKey, datetime_tz
+
+
+class GraphRunEvent(BaseDbModel):
+    """Append-only log of workflow graph runs, written with COPY by ``app.agent.workflows.run_log``.
+
+    Every run has one row per node run (``kind="node"``) and a summary row (``kind="run"``).
+    """
+
+    id: Mapped[PrimaryKey[int]]
+    run_id: Mapped[Indexed[UUID]]
+    seq: Mapped[int]
+    kind: Mapped[str]
+    started_at: Mapped[Indexed[datetime_tz]]
+    duration: Mapped[float]
+    outcome: Mapped[str]
+    node: Mapped[str | None]
+    next_node: Mapped[str | None]
+    route: Mapped[str | None]
+    error: Mapped[str | None]
+    queue_seconds: Mapped[float]
+    input_tokens: Mapped[int]
+    output_tokens: Mapped[int]
+    cache_read_tokens: Mapped[int]
+    cache_hits: Mapped[int]
@@ -0,0 +1,29 @@
+from typing import TYPE_CHECKING, Annotated
+from uuid import UUID
+
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import BaseDbModel
+from app.mappings import ManyToOne, PrimaryKey, datetime_tz
+from app.schemas.agent import MessageRole
+
+if TYPE_CHECKING:
+    from app.models.conversation import Conversation
+
+FKConversation = Annotated[UUID, mapped_column(ForeignKey("conversation.id", ondelete="CASCADE"), index=True)]
+
+
+class Message(BaseDbModel):
+    """Single pydantic-ai message of a conversation; rows are append-only."""
+
+    id: Mapped[PrimaryKey[int]]
+    conversation_id: Mapped[FKConversation]
+    role: Mapped[MessageRole]
+    content: Mapped[str]
+    # one-element ModelMessage list serialized with pydantic-ai's ModelMessagesTypeAdapter
+    payload: Mapped[str]
+    token_count: Mapped[int]
+    created_at: Mapped[datetime_tz]
+
+    conversation: Mapped[ManyToOne["Conversation"]]
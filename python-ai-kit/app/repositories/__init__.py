@@ -1,3 +0,0 @@
-from .repositories import CrudRepository
-
-__all__ = ["CrudRepository"]
\ No newline at end of file
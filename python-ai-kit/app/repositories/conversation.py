@@ -0,0 +1,44 @@
+from typing import cast
+from uuid import UUID
+
+from sqlalchemy import func, select
+
+from app.database import AsyncDbSession
+from app.models import Conversation, Message
+from app.repositories.repositories import CrudRepository
+from app.schemas import ConversationCreate, ConversationUpdate, MessageCreate, MessageUpdate
+
+
+class ConversationRepository(CrudRepository[Conversation, ConversationCreate, ConversationUpdate]):
+    pass
+
+
+class MessageRepository(CrudRepository[Message, MessageCreate, MessageUpdate]):
+    async def get_latest(
+        self, db_session: AsyncDbSession, conversation_id: UUID, limit: int, after_id: int | None = None
+    ) -> list[Message]:
+        """Return the last ``limit`` messages of a conversation (newer than ``after_id``) in chronological order."""
+        stmt = (
+            select(self.model)
+            .where(self.model.conversation_id == conversation_id, self.model.id > (after_id or 0))
+            .order_by(self.model.id.desc())
+            .limit(limit)
+        )
+        results = await db_session.execute(stmt)
+        return list(reversed(cast(list[Message], results.scalars().all())))
+
+    async def get_after(self, db_session: AsyncDbSession, conversation_id: UUID, after_id: int | None) -> list[Message]:
+        """Return all messages of a conversation newer than ``after_id`` in chronological order."""
+        stmt = (
+            select(self.model)
+            .where(self.model.conversation_id == conversation_id, self.model.id > (after_id or 0))
+            .order_by(self.model.id.asc())
+        )
+        results = await db_session.execute(stmt)
+        return cast(list[Message], results.scalars().all())
+
+    async def count_after(self, db_session: AsyncDbSession, conversation_id: UUID, after_id: int | None) -> int:
+        stmt = select(func.count()).where(
+            self.model.conversation_id == conversation_id, self.model.id > (after_id or 0)
+        )
+        return (await db_session.execute(stmt)).scalar_one()
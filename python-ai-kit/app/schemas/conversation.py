@@ -0,0 +1,22 @@
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+
+from pydantic import AwareDatetime, BaseModel, Field
+
+
+class ConversationCreate(BaseModel):
+    id: UUID = Field(default_factory=uuid4)
+    created_at: AwareDatetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: AwareDatetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class ConversationRead(BaseModel):
+    id: UUID
+    created_at: datetime
+    updated_at: datetime
+
+
+class ConversationUpdate(BaseModel):
+    summary: str | None = None
+    summary_message_id: int | None = None
+    updated_at: datetime | None = Field(default_factory=lambda: datetime.now(timezone.utc))
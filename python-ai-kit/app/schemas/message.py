@@ -1,6 +1,7 @@
+from datetime import datetime, timezone
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import AwareDatetime, BaseModel, Field
 
 from app.schemas.agent import MessageRole
 
@@ -12,4 +13,10 @@ class MessageBase(BaseModel):
 
 
 class MessageCreate(MessageBase):
+    payload: str
+    token_count: int
+    created_at: AwareDatetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class MessageUpdate(BaseModel):
     pass
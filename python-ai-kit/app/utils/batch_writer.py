@@ -0,0 +1,72 @@
+import atexit
+import queue
+import threading
+import time
+from collections.abc import Callable
+from contextlib import suppress
+
+
+class BatchWriter[T]:
+    """Hands queued items to ``write`` in batches from a background thread, off the request path.
+
+    ``put`` only adds an item to a bounded queue and reports whether it fit, so callers
+    decide how to count what is dropped. The thread calls ``write`` with up to ``batch_size``
+    items at a time, at least every ``flush_interval`` seconds while items are queued; errors
+    are left to ``write`` to handle. ``shutdown`` (also run at interpreter exit) writes what
+    is queued, calls ``close`` on the writer thread and stops it.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[list[T]], None],
+        name: str,
+        max_queue_size: int,
+        batch_size: int,
+        flush_interval: float,
+        close: Callable[[], None] | None = None,
+    ) -> None:
+        self.write = write
+        self.close = close
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue[T] = queue.Queue(maxsize=max_queue_size)
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+        atexit.register(self.shutdown)
+
+    def put(self, item: T) -> bool:
+        """Queue an item without blocking; False when the queue is full."""
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            return False
+        return True
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    def shutdown(self) -> None:
+        """Write what is queued and stop the writer thread."""
+        if not self._thread.is_alive() or self._stopped.is_set():
+            return
+        self._stopped.set()
+        self._thread.join(timeout=self.flush_interval + 30)
+
+    def _run(self) -> None:
+        batch: list[T] = []
+        deadline = time.monotonic() + self.flush_interval
+        while not (self._stopped.is_set() and self._queue.empty()):
+            with suppress(queue.Empty):
+                batch.append(self._queue.get(timeout=max(0.0, min(1.0, deadline - time.monotonic()))))
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                if batch:
+                    self.write(batch)
+                batch = []
+                deadline = time.monotonic() + self.flush_interval
+        if batch:
+            self.write(batch)
+        if self.close is not None:
+            self.close()
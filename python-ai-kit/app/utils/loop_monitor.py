@@ -0,0 +1,68 @@
+import asyncio
+import logging
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from app.config import settings
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class LoopLagMonitor:
+    """Measures how long the event loop is kept from running its callbacks.
+
+    A background task sleeps for ``interval`` seconds and records how much later than
+    scheduled it wakes up in the ``event_loop_lag_seconds`` histogram. Anything running
+    on the loop without awaiting (e.g. a synchronous call inside an async tool) shows
+    up as lag; lags above ``warn_threshold`` are logged together with the activities
+    that were running on the loop at the time.
+    """
+
+    def __init__(
+        self,
+        interval: float = settings.loop_lag_interval,
+        warn_threshold: float = settings.loop_lag_warn_threshold,
+    ) -> None:
+        self.interval = interval
+        self.warn_threshold = warn_threshold
+        self.running: Counter[str] = Counter()
+        # activities that ran on the loop since the last wake up
+        self._recent: set[str] = set()
+        self._task: asyncio.Task[None] | None = None
+
+    @contextmanager
+    def activity(self, name: str) -> Iterator[None]:
+        """Mark code running on the loop, so lags measured meanwhile are attributed to it."""
+        self.running[name] += 1
+        self._recent.add(name)
+        try:
+            yield
+        finally:
+            self.running[name] -= 1
+            if not self.running[name]:
+                del self.running[name]
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            self._recent = set(self.running)
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.monotonic() - expected)
+            metrics.observe("event_loop_lag_seconds", lag)
+            if lag >= self.warn_threshold:
+                suspects = ", ".join(sorted(self._recent)) or "unknown"
+                logger.warning(f"Event loop blocked for {lag:.3f}s, running: {suspects}")
+
+
+loop_monitor = LoopLagMonitor()
@@ -0,0 +1,138 @@
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+type MetricKey = tuple[str, tuple[tuple[str, str], ...]]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+@dataclass
+class Histogram:
+    """Observations bucketed by upper bound (the last count holds values above every bound)."""
+
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    counts: list[int] = field(default_factory=lambda: [0] * (len(DEFAULT_BUCKETS) + 1))
+    sum: float = 0.0
+    count: int = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """In-process counters, gauges and histograms shared by agent components.
+
+    Metrics are identified by a name and a set of labels, e.g.
+    ``metrics.inc("pre_router_decisions_total", outcome="hit", route="3")``.
+    """
+
+    def __init__(self) -> None:
+        self._counters: dict[MetricKey, float] = defaultdict(float)
+        self._gauges: dict[MetricKey, float] = {}
+        self._histograms: dict[MetricKey, Histogram] = {}
+        # tools and Celery tasks may record metrics from worker threads
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(name: str, labels: dict[str, str]) -> MetricKey:
+        return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def inc(self, name: str, value: float = 1.0, **labels: str) -> None:
+        """Increase a counter."""
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] += value
+
+    def set(self, name: str, value: float, **labels: str) -> None:
+        """Set a gauge to the current value."""
+        key = self._key(name, labels)
+        with self._lock:
+            self._gauges[key] = value
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """Record a value (e.g. a duration in seconds) in a histogram."""
+        key = self._key(name, labels)
+        with self._lock:
+            if (histogram := self._histograms.get(key)) is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def get(self, name: str, **labels: str) -> float:
+        """Return the current value of a counter or gauge (0 if it was never recorded)."""
+        key = self._key(name, labels)
+        return self._counters.get(key, self._gauges.get(key, 0.0))
+
+    def histogram(self, name: str, **labels: str) -> Histogram | None:
+        """Return the histogram of the given name and labels, if anything was observed."""
+        return self._histograms.get(self._key(name, labels))
+
+    def counters(self, prefix: str = "") -> dict[str, float]:
+        """Return a snapshot of counters, keyed as ``name{label="value",...}``."""
+        with self._lock:
+            items = list(self._counters.items())
+        return {_format_key(name, labels): value for (name, labels), value in sorted(items) if name.startswith(prefix)}
+
+    def gauges(self, prefix: str = "") -> dict[str, float]:
+        """Return a snapshot of gauges, keyed like ``counters``."""
+        with self._lock:
+            items = list(self._gauges.items())
+        return {_format_key(name, labels): value for (name, labels), value in sorted(items) if name.startswith(prefix)}
+
+    def prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            gauges = sorted(self._gauges.items())
+            histograms = sorted(
+                (key, (list(h.buckets), list(h.counts), h.sum, h.count)) for key, h in self._histograms.items()
+            )
+        lines: list[str] = []
+        typed: set[str] = set()
+
+        def sample(kind: str, name: str, labels: tuple[tuple[str, str], ...], value: float, family: str = "") -> None:
+            family = family or name
+            if family not in typed:
+                typed.add(family)
+                lines.append(f"# TYPE {family} {kind}")
+            lines.append(f"{_prometheus_key(name, labels)} {float(value)}")
+
+        for (name, labels), value in counters:
+            sample("counter", name, labels, value)
+        for (name, labels), value in gauges:
+            sample("gauge", name, labels, value)
+        for (name, labels), (buckets, counts, total, count) in histograms:
+            cumulative = 0
+            for bound, bucket_count in zip([*buckets, float("inf")], counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                sample("histogram", f"{name}_bucket", (*labels, ("le", le)), cumulative, family=name)
+            sample("histogram", f"{name}_sum", labels, total, family=name)
+            sample("histogram", f"{name}_count", labels, count, family=name)
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Drop all recorded values."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+
+def _format_key(name: str, labels: tuple[tuple[str, str], ...]) -> str:
+    if not labels:
+        return name
+    return name + "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+
+def _prometheus_key(name: str, labels: tuple[tuple[str, str], ...]) -> str:
+    if not labels:
+        return name
+    escaped = [(k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")) for k, v in labels]
+    return name + "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,36 @@
+import logging
+
+from opentelemetry import trace
+from pydantic_ai import Agent
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def init_telemetry() -> None:
+    """Export workflow node and agent run spans over OTLP when OTEL_ENABLED is set.
+
+    The exporter is configured by the standard ``OTEL_EXPORTER_OTLP_*`` variables. A tracer
+    provider installed before (e.g. by Logfire or an OpenTelemetry auto-instrumentation
+    agent) is kept, and spans go to its exporters instead.
+    """
+    if not settings.otel_enabled:
+        return
+    # agent and model request spans nest under the span of the workflow node running them
+    Agent.instrument_all()
+    if not isinstance(trace.get_tracer_provider(), trace.ProxyTracerProvider):
+        logger.info("Using the configured OpenTelemetry tracer provider")
+        return
+
+    try:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        from opentelemetry.sdk.resources import SERVICE_NAME, Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    except ImportError as e:
+        raise ImportError("OpenTelemetry export needs the `otel` extra, install it with `uv sync --extra otel`") from e
+
+    provider = TracerProvider(resource=Resource.create({SERVICE_NAME: settings.api_name}))
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(provider)
@@ -0,0 +1,28 @@
+import math
+import re
+import unicodedata
+from collections import Counter
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, NFKC-normalize and collapse whitespace."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text).lower()).strip()
+
+
+def char_ngrams(text: str, n: int = 3) -> Counter[str]:
+    """Count character n-grams of the normalized text (padded with spaces on both ends)."""
+    padded = f" {normalize_text(text)} "
+    return Counter(padded[i : i + n] for i in range(max(len(padded) - n + 1, 0)))
+
+
+def cosine_similarity(a: Counter[str] | dict[str, float], b: Counter[str] | dict[str, float]) -> float:
+    """Cosine similarity of two sparse vectors."""
+    if len(a) > len(b):
+        a, b = b, a
+    dot = sum(value * b.get(key, 0.0) for key, value in a.items())
+    if not dot:
+        return 0.0
+    norm = math.sqrt(sum(v * v for v in a.values())) * math.sqrt(sum(v * v for v in b.values()))
+    return dot / norm
@@ -2,12 +2,17 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
-from app.agent.tools.get_pdf import get_pdf_text  # ty: ignore[unresolved-import]
+from app.agent.tools.get_pdf import get_pdf_index_path  # ty: ignore[unresolved-import]
+from app.agent.tools.pdf_index import PDFIndex  # ty: ignore[unresolved-import]
 from pydantic_ai import RunContext
 from pydantic_ai.messages import ModelRequest, ModelResponse
 from pydantic_ai.run import AgentRunResult
 
 from app.agent.engines.agent_base import BaseAgent, BaseAgentDeps
+from app.agent.tools.tool_registry import Toolpacks, tool_manager
+
+# upper bound of pages returned by one get_pages call, keeping prompts small
+MAX_PAGES_PER_CALL = 5
 
 
 @dataclass
@@ -28,16 +33,28 @@ class PDFAgent(BaseAgent):
             **kwargs,
         )
 
+        self.pdf_index = PDFIndex(get_pdf_index_path(), tool_manager.executor(Toolpacks.GENERAL))
+
+        @self.agent.tool
+        async def search_pdf(ctx: RunContext[PDFAgentDeps], query: str, k: int = 5) -> list[dict[str, Any]]:
+            """
+            Search the pdf for passages relevant to the query, best matches first, with their page numbers
+            """
+            return await self.pdf_index.search(ctx.deps.pdf_path, query, k=min(k, 20))
+
         @self.agent.tool
-        def get_pdf(ctx: RunContext[PDFAgentDeps]) -> dict[str, Any]:
+        async def get_pages(ctx: RunContext[PDFAgentDeps], first: int, last: int) -> dict[str, Any]:
             """
-            Get pdf from path specified by user
+            Get the text of pages first to last (numbered from 1) and the number of pages of the pdf
             """
-            return get_pdf_text(pdf_path=ctx.deps.pdf_path)
+            return await self.pdf_index.get_pages(ctx.deps.pdf_path, first, min(last, first + MAX_PAGES_PER_CALL - 1))
 
         @self.agent.instructions
         def add_custom_context(ctx: RunContext[PDFAgentDeps]) -> str:
-            return f"Use the pdf path: {ctx.deps.pdf_path}"
+            return (
+                f"Use the pdf path: {ctx.deps.pdf_path}. "
+                "Find relevant passages with search_pdf and read whole pages with get_pages."
+            )
 
     async def process_request(
         self,
@@ -47,4 +64,4 @@ class PDFAgent(BaseAgent):
     ) -> AgentRunResult:
         """Your custom processing logic."""
         deps = PDFAgentDeps(language=self.language, pdf_path=pdf_path)
-        return await self.agent.run(user_prompt=query, message_history=chat_history, deps=deps)
+        return await self.run_agent(user_prompt=query, message_history=chat_history, deps=deps)
@@ -5,12 +5,20 @@ from typing import Any
 import pypdf  # ty: ignore[unresolved-import]
 from dotenv import load_dotenv
 
+from app.agent.tools.execution import cpu_bound
+
 
 def get_pdf_path() -> str | None:
     load_dotenv()
     return os.getenv("PDF_PATH")
 
 
+def get_pdf_index_path() -> str:
+    load_dotenv()
+    return os.getenv("PDF_INDEX_PATH", "pdf_index.sqlite3")
+
+
+@cpu_bound
 def get_pdf_text(pdf_path: Path | str) -> dict[str, Any]:
     reader = pypdf.PdfReader(pdf_path)
     pages_text = [page.extract_text() for page in reader.pages]
@@ -0,0 +1,178 @@
+import hashlib
+import re
+import sqlite3
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from app.agent.tools.get_pdf import get_pdf_text  # ty: ignore[unresolved-import]
+
+from app.agent.tools.execution import ToolExecutor
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    sha256 TEXT NOT NULL UNIQUE,
+    path TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    page_count INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS documents_path ON documents (path, mtime, size);
+CREATE TABLE IF NOT EXISTS pages (
+    document_id INTEGER NOT NULL REFERENCES documents (id) ON DELETE CASCADE,
+    page_number INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    PRIMARY KEY (document_id, page_number)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS chunks USING fts5 (
+    text,
+    document_id UNINDEXED,
+    page_number UNINDEXED
+);
+"""
+
+
+def file_identity(path: Path | str) -> tuple[str, float, int]:
+    """Absolute path, modification time and size of a file."""
+    resolved = Path(path).resolve()
+    stat = resolved.stat()
+    return str(resolved), stat.st_mtime, stat.st_size
+
+
+def file_sha256(path: Path | str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        while block := file.read(1 << 20):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def split_chunks(text: str, words: int = 200, overlap: int = 40) -> list[str]:
+    """Split page text into overlapping chunks of about ``words`` words."""
+    tokens = text.split()
+    step = max(1, words - overlap)
+    return [" ".join(tokens[start : start + words]) for start in range(0, max(1, len(tokens) - overlap), step)]
+
+
+def match_query(query: str) -> str:
+    """FTS5 query matching any word of a free-text query."""
+    return " OR ".join(f'"{word}"' for word in re.findall(r"\w+", query.lower()))
+
+
+class PDFIndex:
+    """On-disk index of PDF text: pages and full-text searchable chunks in SQLite.
+
+    A PDF is parsed once per content: documents are looked up by path, mtime and size,
+    then by the SHA-256 of the file (a copied or touched file is not parsed again). Tools
+    read single pages or search chunks (BM25), so neither the parse time nor the prompt
+    grows with the size of the document. Parsing runs on the executor's process pool,
+    database access on its thread pool.
+    """
+
+    def __init__(self, db_path: Path | str, executor: ToolExecutor) -> None:
+        self.db_path = str(db_path)
+        self.executor = executor
+        with self.connect() as db:
+            db.executescript(SCHEMA)
+
+    @contextmanager
+    def connect(self) -> Iterator[sqlite3.Connection]:
+        db = sqlite3.connect(self.db_path)
+        try:
+            # pages are read through the OS page cache instead of copying them into SQLite buffers
+            db.execute("PRAGMA mmap_size = 268435456")
+            db.execute("PRAGMA foreign_keys = ON")
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    async def ingest(self, pdf_path: Path | str) -> int:
+        """Return the id of the indexed document, parsing the PDF if its content is not indexed yet."""
+        path, mtime, size = await self.executor.run(file_identity, pdf_path)
+        if (document_id := await self.executor.run(self._find, path, mtime, size)) is not None:
+            return document_id
+        sha256 = await self.executor.run(file_sha256, path)
+        document_id = await self.executor.run(self._relink, sha256, path, mtime, size)
+        if document_id is not None:
+            return document_id
+        pdf = await self.executor.run(get_pdf_text, pdf_path=path)
+        return await self.executor.run(self._store, sha256, path, mtime, size, pdf["pages"])
+
+    async def search(self, pdf_path: Path | str, query: str, k: int = 5) -> list[dict[str, Any]]:
+        """Best matching chunks of the document, with their page numbers."""
+        document_id = await self.ingest(pdf_path)
+        return await self.executor.run(self._search, document_id, query, k)
+
+    async def get_pages(self, pdf_path: Path | str, first: int, last: int) -> dict[str, Any]:
+        """Text of pages ``first`` to ``last`` (1-based, inclusive) and the page count of the document."""
+        document_id = await self.ingest(pdf_path)
+        return await self.executor.run(self._get_pages, document_id, first, last)
+
+    def _find(self, path: str, mtime: float, size: int) -> int | None:
+        with self.connect() as db:
+            row = db.execute(
+                "SELECT id FROM documents WHERE path = ? AND mtime = ? AND size = ?", (path, mtime, size)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _relink(self, sha256: str, path: str, mtime: float, size: int) -> int | None:
+        with self.connect() as db:
+            row = db.execute("SELECT id FROM documents WHERE sha256 = ?", (sha256,)).fetchone()
+            if row:
+                db.execute(
+                    "UPDATE documents SET path = ?, mtime = ?, size = ? WHERE id = ?", (path, mtime, size, row[0])
+                )
+        return row[0] if row else None
+
+    def _store(self, sha256: str, path: str, mtime: float, size: int, pages: list[str]) -> int:
+        with self.connect() as db:
+            # a concurrent ingestion of the same content may have won the race
+            if row := db.execute("SELECT id FROM documents WHERE sha256 = ?", (sha256,)).fetchone():
+                return row[0]
+            # a changed file replaces its previous version
+            for (old_id,) in db.execute("SELECT id FROM documents WHERE path = ?", (path,)).fetchall():
+                db.execute("DELETE FROM chunks WHERE document_id = ?", (old_id,))
+                db.execute("DELETE FROM documents WHERE id = ?", (old_id,))
+            document_id = db.execute(
+                "INSERT INTO documents (sha256, path, mtime, size, page_count) VALUES (?, ?, ?, ?, ?)",
+                (sha256, path, mtime, size, len(pages)),
+            ).lastrowid
+            db.executemany(
+                "INSERT INTO pages (document_id, page_number, text) VALUES (?, ?, ?)",
+                [(document_id, number, text) for number, text in enumerate(pages, start=1)],
+            )
+            db.executemany(
+                "INSERT INTO chunks (text, document_id, page_number) VALUES (?, ?, ?)",
+                [
+                    (chunk, document_id, number)
+                    for number, text in enumerate(pages, start=1)
+                    for chunk in split_chunks(text)
+                    if chunk
+                ],
+            )
+        assert document_id is not None
+        return document_id
+
+    def _search(self, document_id: int, query: str, k: int) -> list[dict[str, Any]]:
+        if not (match := match_query(query)):
+            return []
+        with self.connect() as db:
+            rows = db.execute(
+                "SELECT page_number, text, bm25(chunks) AS score FROM chunks "
+                "WHERE chunks MATCH ? AND document_id = ? ORDER BY score LIMIT ?",
+                (match, document_id, k),
+            ).fetchall()
+        return [{"page": page, "text": text, "score": round(-score, 3)} for page, text, score in rows]
+
+    def _get_pages(self, document_id: int, first: int, last: int) -> dict[str, Any]:
+        with self.connect() as db:
+            (page_count,) = db.execute("SELECT page_count FROM documents WHERE id = ?", (document_id,)).fetchone()
+            rows = db.execute(
+                "SELECT page_number, text FROM pages WHERE document_id = ? AND page_number BETWEEN ? AND ? "
+                "ORDER BY page_number",
+                (document_id, first, last),
+            ).fetchall()
+        return {"page_count": page_count, "pages": {page: text for page, text in rows}}
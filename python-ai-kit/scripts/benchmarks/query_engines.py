@@ -0,0 +1,152 @@
+"""Measure build time, size, memory and query latency of the QUERY_ENGINES indexes.
+
+Run from the project root, e.g.:
+
+    uv run python -m scripts.benchmarks.query_engines --sizes 10000 100000 1000000
+
+Every size is measured in a fresh process on a synthetic corpus (Zipf-distributed
+vocabulary), so peak RSS is comparable between sizes. Vector indexes are included
+when NumPy is installed (``uv sync --extra vectors``); 1M chunks take several minutes.
+"""
+
+import argparse
+import multiprocessing
+import random
+import resource
+import statistics
+import string
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate
+from pathlib import Path
+from typing import Any
+
+from app.agent.tools.query_engines.index import DocumentIndex
+
+CHUNK_WORDS = 100
+CHUNKS_PER_DOCUMENT = 100
+VOCABULARY = 50_000
+
+
+def corpus(seed: int = 0) -> tuple[list[str], list[float]]:
+    """Vocabulary and cumulative Zipf weights of the synthetic corpus."""
+    rng = random.Random(seed)
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10))) for _ in range(VOCABULARY)]
+    return words, list(accumulate(1 / rank for rank in range(1, VOCABULARY + 1)))
+
+
+def peak_rss_mb() -> float:
+    # kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def latency(search: Any, queries: list[str]) -> tuple[float, float]:
+    timings = []
+    for query in queries:
+        started = time.perf_counter()
+        search(query)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), statistics.quantiles(timings, n=20)[-1]
+
+
+def directory_mb(path: Path) -> float:
+    return sum(file.stat().st_size for file in path.rglob("*") if file.is_file()) / 2**20
+
+
+def measure(size: int, query_count: int, vectors: bool) -> dict[str, Any]:
+    words, weights = corpus()
+    rng = random.Random(1)
+    row: dict[str, Any] = {"chunks": size, "embed_s": 0.0}
+    if vectors:
+        import numpy as np
+
+        from app.agent.tools.query_engines.vectors import HashingEmbedder, VectorIndex
+
+        embedder = HashingEmbedder(256)
+        matrix = np.zeros((size, embedder.dim), dtype=np.float32)
+
+    with tempfile.TemporaryDirectory() as directory:
+        index = DocumentIndex(directory, vector_index="none")
+        started = time.perf_counter()
+        with index.connect() as db:
+            for document in range(0, size, CHUNKS_PER_DOCUMENT):
+                chunks = [
+                    " ".join(rng.choices(words, cum_weights=weights, k=CHUNK_WORDS))
+                    for _ in range(min(CHUNKS_PER_DOCUMENT, size - document))
+                ]
+                index.add_document(db, f"doc-{document}", 0.0, 0, "", chunks)
+                if vectors:
+                    embedding_started = time.perf_counter()
+                    matrix[document : document + len(chunks)] = embedder.embed_many(chunks)
+                    row["embed_s"] += time.perf_counter() - embedding_started
+        row["bm25_build_s"] = time.perf_counter() - started - row["embed_s"]
+        row["bm25_mb"] = directory_mb(Path(directory))
+
+        with index.connect() as db:
+            # a few words of a random chunk, so every query has a clear best match
+            texts = [
+                db.execute("SELECT text FROM chunks WHERE id = ?", (chunk_id,)).fetchone()[0]
+                for chunk_id in rng.sample(range(1, size + 1), query_count)
+            ]
+            queries = [" ".join(rng.sample(text.split(), 6)) for text in texts]
+            row["bm25_p50_ms"], row["bm25_p95_ms"] = latency(lambda query: index._bm25(db, query, 10), queries)
+
+        if vectors:
+            ids = np.arange(1, size + 1, dtype=np.int64)
+            embedded = {query: embedder.embed(query) for query in queries}
+            results = {}
+            for kind in ("flat", "ivf"):
+                vector_index = VectorIndex(Path(directory) / kind, kind)
+                started = time.perf_counter()
+                vector_index.build(ids, matrix)
+                row[f"{kind}_build_s"] = time.perf_counter() - started
+                row[f"{kind}_mb"] = directory_mb(Path(directory) / kind)
+                vector_index.load()
+                results[kind] = [{i for i, _ in vector_index.search(embedded[query], 10)} for query in queries]
+                row[f"{kind}_p50_ms"], row[f"{kind}_p95_ms"] = latency(
+                    lambda query, vector_index=vector_index: vector_index.search(embedded[query], 10), queries
+                )
+            row["ivf_recall@10"] = statistics.mean(
+                len(ivf & flat) / max(1, len(flat)) for ivf, flat in zip(results["ivf"], results["flat"])
+            )
+    row["peak_rss_mb"] = peak_rss_mb()
+    return row
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000], help="Chunk counts")
+    parser.add_argument("--queries", type=int, default=200, help="Queries per index")
+    parser.add_argument("--no-vectors", action="store_true", help="Only measure the BM25 index")
+    args = parser.parse_args()
+
+    try:
+        import numpy  # noqa: F401
+
+        vectors = not args.no_vectors
+    except ImportError:
+        print("NumPy is not installed, measuring the BM25 index only")
+        vectors = False
+
+    for size in args.sizes:
+        # a fresh process per size keeps peak memory of the sizes apart
+        with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context("spawn")) as executor:
+            row = executor.submit(measure, size, args.queries, vectors).result()
+        print(f"\n{size:,} chunks (peak RSS {row['peak_rss_mb']:.0f} MB)")
+        print(f"{'index':<6} {'build s':>8} {'disk MB':>8} {'p50 ms':>8} {'p95 ms':>8}")
+        print(
+            f"{'bm25':<6} {row['bm25_build_s']:>8.1f} {row['bm25_mb']:>8.1f} "
+            f"{row['bm25_p50_ms']:>8.2f} {row['bm25_p95_ms']:>8.2f}"
+        )
+        if vectors:
+            for kind in ("flat", "ivf"):
+                print(
+                    f"{kind:<6} {row[f'{kind}_build_s']:>8.1f} {row[f'{kind}_mb']:>8.1f} "
+                    f"{row[f'{kind}_p50_ms']:>8.2f} {row[f'{kind}_p95_ms']:>8.2f}"
+                )
+            print(f"embedding {row['embed_s']:.1f}s, ivf recall@10 vs flat {row['ivf_recall@10']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
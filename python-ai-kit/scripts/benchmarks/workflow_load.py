@@ -0,0 +1,220 @@
+"""Load-test the agent workflow and the chat endpoints against the local fake model.
+
+Run from the project root, e.g.:
+
+    AI_PROVIDER=fake uv run python -m scripts.benchmarks.workflow_load --concurrency 1 10 50 --requests 200
+
+Every agent answers after FAKE_MODEL_LATENCY seconds without leaving the process, so
+the numbers show the overhead of the framework itself: agent construction, graph node
+transitions, streaming and the API layer. Targets:
+
+    graph   the workflow graph run directly, with time spent per node
+    chat    POST /chat through the FastAPI app (in-process, no network)
+    stream  POST /chat/stream, with time to the first token
+
+MCP servers (``--mcp-servers``) are replaced by local toolsets answering after the same
+latency; set FAKE_MODEL_TOOL_CALLS to make the agent call their tools.
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import time
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from functools import partial
+from typing import Any
+
+import httpx
+from pydantic_graph import EndMarker
+
+from app.agent.engines.fake_model import fake_mcp_toolset
+from app.agent.factories import WorkflowAgentFactory, agent_manager_pool
+from app.agent.toolsets.mcp import mcp_connections
+from app.agent.workflows.agent_workflow import user_assistant_graph
+from app.agent.workflows.generation_events import WorkflowState
+from app.agent.workflows.nodes import StartNode
+from app.config import settings
+from app.main import api
+
+os.environ.setdefault("PYDANTIC_AI_NO_BANNER", "1")
+
+MESSAGES = [
+    "What's the difference between a process and a thread?",
+    "Can you help me plan a three-day trip to Kraków?",
+    "Explain how a hash map handles collisions.",
+    "Write a short note inviting the team to Friday's demo.",
+    "Which is faster for lookups, a list or a set, and why?",
+]
+
+LAG_INTERVAL = 0.01
+
+
+class LagSampler:
+    """Samples event loop lag every ``interval`` seconds while the load runs."""
+
+    def __init__(self, interval: float = LAG_INTERVAL) -> None:
+        self.interval = interval
+        self.samples: list[float] = []
+        self._task: asyncio.Task[None] | None = None
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, time.perf_counter() - expected))
+
+    def __enter__(self) -> "LagSampler":
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+
+def percentile(values: list[float], q: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+async def run_graph(index: int, node_times: dict[str, list[float]]) -> None:
+    manager = await agent_manager_pool.get_manager(use_mcp=bool(settings.mcp_urls), language=settings.default_language)
+    deps = manager.to_deps(message=MESSAGES[index % len(MESSAGES)], language=settings.default_language, chat_history=[])
+    async with user_assistant_graph.iter(inputs=StartNode(), state=WorkflowState(), deps=deps) as run:
+        running: list[str] = []
+        started = time.perf_counter()
+        async for step in run:
+            now = time.perf_counter()
+            # the time until the next step is spent in the nodes started by this one
+            for node in running:
+                node_times[node].append(now - started)
+            running = [] if isinstance(step, EndMarker) else [str(task.node_id) for task in step]
+            started = now
+
+
+async def run_chat(client: httpx.AsyncClient, index: int, path: str) -> None:
+    # numbered messages, so response caches (if enabled) do not answer them
+    payload = {"message": f"{MESSAGES[index % len(MESSAGES)]} ({index})", "use_mcp": bool(settings.mcp_urls)}
+    response = await client.post(path, json=payload)
+    response.raise_for_status()
+    if error := response.json().get("error"):
+        raise RuntimeError(error)
+
+
+async def run_stream(client: httpx.AsyncClient, index: int, path: str, first_tokens: list[float]) -> None:
+    payload = {"message": f"{MESSAGES[index % len(MESSAGES)]} ({index})", "use_mcp": bool(settings.mcp_urls)}
+    started = time.perf_counter()
+    async with client.stream("POST", path, json=payload) as response:
+        response.raise_for_status()
+        first_token = False
+        async for line in response.aiter_lines():
+            if line == "event: token" and not first_token:
+                first_token = True
+                first_tokens.append(time.perf_counter() - started)
+            elif line == "event: error":
+                raise RuntimeError("workflow error")
+
+
+async def load(call: Callable[[int], Awaitable[None]], requests: int, concurrency: int) -> dict[str, Any]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    errors = 0
+
+    async def one(index: int) -> None:
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await call(index)
+            except Exception as e:
+                errors += 1
+                if errors == 1:
+                    print(f"first error: {e}")
+                return
+            latencies.append(time.perf_counter() - started)
+
+    with LagSampler() as lag:
+        started = time.perf_counter()
+        await asyncio.gather(*(one(index) for index in range(requests)))
+        elapsed = time.perf_counter() - started
+    return {
+        "throughput": len(latencies) / elapsed,
+        "errors": errors,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "lag_p99_ms": percentile(lag.samples, 99) * 1000,
+        "lag_max_ms": max(lag.samples, default=0.0) * 1000,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50], help="Concurrent requests")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per concurrency level")
+    parser.add_argument(
+        "--targets", nargs="+", choices=["graph", "chat", "stream"], default=["graph", "chat", "stream"]
+    )
+    parser.add_argument("--mcp-servers", type=int, default=0, help="Fake MCP servers connected to the agent")
+    args = parser.parse_args()
+
+    providers = [
+        settings.router_ai_provider,
+        settings.guardrails_ai_provider,
+        settings.translator_ai_provider,
+        settings.summarizer_ai_provider,
+    ]
+    if settings.ai_provider != "fake" or any(provider not in (None, "fake") for provider in providers):
+        parser.error("run with AI_PROVIDER=fake (and no other *_AI_PROVIDER) so no request reaches a real provider")
+
+    # per-request logs of the app and httpx would dominate the measurements
+    logging.disable(logging.INFO)
+    settings.mcp_urls = [f"http://fake-mcp-{index}.local/mcp" for index in range(args.mcp_servers)]
+    mcp_connections.toolset_factory = partial(fake_mcp_toolset, latency=settings.fake_model_latency)
+
+    started = time.perf_counter()
+    await WorkflowAgentFactory.create_manager(mcp_urls=settings.mcp_urls, language=settings.default_language)
+    print(f"AgentManager construction: {(time.perf_counter() - started) * 1000:.1f} ms")
+    print(f"fake model latency {settings.fake_model_latency * 1000:.0f} ms, {args.mcp_servers} MCP servers")
+
+    node_times: dict[str, list[float]] = defaultdict(list)
+    # first runs import and build what the measured requests reuse (pooled manager, validators)
+    await run_graph(0, defaultdict(list))
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=api), base_url="http://load-test") as client:
+        targets: dict[str, Callable[[int], Awaitable[None]]] = {
+            "graph": partial(run_graph, node_times=node_times),
+            "chat": partial(run_chat, client, path=api.url_path_for("chat")),
+        }
+        first_tokens: list[float] = []
+        targets["stream"] = partial(run_stream, client, path=api.url_path_for("chat_stream"), first_tokens=first_tokens)
+
+        print(
+            f"\n{'target':<7} {'conc':>5} {'req/s':>8} {'errors':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+            f"{'lag p99':>8} {'lag max':>8}"
+        )
+        for target in args.targets:
+            for concurrency in args.concurrency:
+                row = await load(targets[target], args.requests, concurrency)
+                print(
+                    f"{target:<7} {concurrency:>5} {row['throughput']:>8.1f} {row['errors']:>6} {row['p50_ms']:>8.1f} "
+                    f"{row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['lag_p99_ms']:>8.1f} {row['lag_max_ms']:>8.1f}"
+                )
+
+    if first_tokens:
+        print(
+            f"\nstream time to first token: p50 {percentile(first_tokens, 50) * 1000:.1f} ms, "
+            f"p95 {percentile(first_tokens, 95) * 1000:.1f} ms"
+        )
+    if node_times:
+        print(f"\n{'node':<20} {'runs':>6} {'mean ms':>8} {'p95 ms':>8}")
+        for node, times in sorted(node_times.items()):
+            mean_ms, p95_ms = statistics.mean(times) * 1000, percentile(times, 95) * 1000
+            print(f"{node:<20} {len(times):>6} {mean_ms:>8.1f} {p95_ms:>8.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,35 @@
+"""Index documents for the search_documents tool (QUERY_ENGINES toolpack).
+
+Run from the project root, e.g.:
+
+    uv run python -m scripts.query_engines.ingest docs/ handbook.md
+
+Re-running is incremental: unchanged files are skipped, changed ones re-indexed and
+files deleted from the given directories removed from the index.
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from app.agent.tools.query_engines import document_index
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+", help="Files and directories to index")
+    parser.add_argument("--keep-missing", action="store_true", help="Keep documents whose files no longer exist")
+    args = parser.parse_args()
+    if missing := [path for path in args.paths if not Path(path).exists()]:
+        parser.error(f"no such file or directory: {', '.join(missing)}")
+
+    started = time.perf_counter()
+    stats = document_index.ingest(args.paths, remove_missing=not args.keep_missing)
+    print(
+        f"{stats.added} added, {stats.updated} updated, {stats.unchanged} unchanged, {stats.removed} removed, "
+        f"{stats.chunks} chunks written in {time.perf_counter() - started:.1f}s to {document_index.directory}"
+    )
+
+
+if __name__ == "__main__":
+    main()
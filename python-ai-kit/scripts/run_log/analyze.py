@@ -0,0 +1,230 @@
+"""Replay and analyze the graph-run event log (RUN_LOG_ENABLED).
+
+Run from the project root, e.g.:
+
+    uv run python -m scripts.run_log.analyze routes
+    uv run python -m scripts.run_log.analyze chains --top 10
+    uv run python -m scripts.run_log.analyze replay 0b5c3f4e-...
+
+Events are read from the JSON Lines segments in RUN_LOG_DIR (``--dir``), or from the
+graphrunevent table with ``--postgres``. Commands:
+
+    routes  latency distribution, errors and token usage per route
+    nodes   time, limiter wait and tokens per node
+    chains  node chains (the nodes a run went through) by p95 latency; chains slower than
+            the p95 of all runs are flagged, with the node taking most of their time
+    replay  node timeline of one run, or of the --top slowest runs without a run ID
+"""
+
+import argparse
+import json
+import statistics
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+
+from app.agent.workflows.run_log import RUN_EVENT_FIELDS, RunEvent
+from app.config import settings
+
+LATENCY_BUCKETS = [0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0]
+
+
+@dataclass
+class Run:
+    summary: RunEvent
+    nodes: list[RunEvent]
+
+    @property
+    def chain(self) -> str:
+        return " > ".join(str(node.node) for node in self.nodes)
+
+
+def load_jsonl(directory: Path, since: float) -> list[RunEvent]:
+    events = []
+    for segment in sorted(directory.glob("runs-*.jsonl")):
+        with segment.open(encoding="utf-8") as file:
+            for line in file:
+                try:
+                    event = RunEvent(**json.loads(line))
+                except (ValueError, TypeError):
+                    # the last line of a segment may still be being written
+                    continue
+                if event.started_at >= since:
+                    events.append(event)
+    return events
+
+
+def load_postgres(since: float) -> list[RunEvent]:
+    import psycopg
+
+    from app.models import GraphRunEvent
+
+    with psycopg.connect(
+        host=settings.db_host,
+        port=settings.db_port,
+        dbname=settings.db_name,
+        user=settings.db_user,
+        password=settings.db_password.get_secret_value(),
+    ) as connection:
+        rows = connection.execute(
+            f"SELECT {', '.join(RUN_EVENT_FIELDS)} FROM {GraphRunEvent.__tablename__} WHERE started_at >= %s",
+            (datetime.fromtimestamp(since, UTC),),
+        ).fetchall()
+    events = []
+    for row in rows:
+        record = dict(zip(RUN_EVENT_FIELDS, row))
+        record["run_id"] = str(record["run_id"])
+        record["started_at"] = record["started_at"].timestamp()
+        events.append(RunEvent(**record))
+    return events
+
+
+def group_runs(events: list[RunEvent]) -> list[Run]:
+    """Runs with their node entries in order; runs whose summary was not written are skipped."""
+    nodes: dict[str, list[RunEvent]] = defaultdict(list)
+    summaries: dict[str, RunEvent] = {}
+    for event in events:
+        if event.kind == "run":
+            summaries[event.run_id] = event
+        else:
+            nodes[event.run_id].append(event)
+    return [Run(summary, sorted(nodes[run_id], key=lambda event: event.seq)) for run_id, summary in summaries.items()]
+
+
+def percentile(values: list[float], q: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+def report_routes(runs: list[Run]) -> None:
+    by_route: dict[str, list[Run]] = defaultdict(list)
+    for run in runs:
+        by_route[run.summary.route or "-"].append(run)
+
+    print(
+        f"{'route':<14} {'runs':>6} {'errors':>6} {'p50 ms':>8} {'p90 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+        f"{'max ms':>8} {'in tok':>7} {'out tok':>7}"
+    )
+    for route, route_runs in sorted(by_route.items()):
+        durations = [run.summary.duration for run in route_runs]
+        errors = sum(run.summary.outcome != "ok" for run in route_runs)
+        input_tokens = statistics.mean(run.summary.input_tokens for run in route_runs)
+        output_tokens = statistics.mean(run.summary.output_tokens for run in route_runs)
+        print(
+            f"{route:<14} {len(route_runs):>6} {errors:>6} {percentile(durations, 50) * 1000:>8.1f} "
+            f"{percentile(durations, 90) * 1000:>8.1f} {percentile(durations, 95) * 1000:>8.1f} "
+            f"{percentile(durations, 99) * 1000:>8.1f} {max(durations) * 1000:>8.1f} "
+            f"{input_tokens:>7.0f} {output_tokens:>7.0f}"
+        )
+
+    labels = [f"<{bucket:g}s" for bucket in LATENCY_BUCKETS] + [f">={LATENCY_BUCKETS[-1]:g}s"]
+    print(f"\n{'route':<14} " + " ".join(f"{label:>7}" for label in labels))
+    for route, route_runs in sorted(by_route.items()):
+        counts = [0] * len(labels)
+        for run in route_runs:
+            counts[sum(run.summary.duration >= bucket for bucket in LATENCY_BUCKETS)] += 1
+        print(f"{route:<14} " + " ".join(f"{count:>7}" for count in counts))
+
+
+def report_nodes(runs: list[Run]) -> None:
+    by_node: dict[str, list[RunEvent]] = defaultdict(list)
+    for run in runs:
+        for node in run.nodes:
+            by_node[str(node.node)].append(node)
+    total = sum(node.duration for nodes in by_node.values() for node in nodes) or 1.0
+
+    print(
+        f"{'node':<20} {'runs':>6} {'errors':>6} {'mean ms':>8} {'p95 ms':>8} {'share':>6} {'queue ms':>8} "
+        f"{'in tok':>7} {'out tok':>7} {'cache':>6}"
+    )
+    for name, nodes in sorted(by_node.items(), key=lambda item: -sum(node.duration for node in item[1])):
+        durations = [node.duration for node in nodes]
+        print(
+            f"{name:<20} {len(nodes):>6} {sum(node.outcome != 'ok' for node in nodes):>6} "
+            f"{statistics.mean(durations) * 1000:>8.1f} {percentile(durations, 95) * 1000:>8.1f} "
+            f"{sum(durations) / total:>6.0%} {statistics.mean(node.queue_seconds for node in nodes) * 1000:>8.1f} "
+            f"{statistics.mean(node.input_tokens for node in nodes):>7.0f} "
+            f"{statistics.mean(node.output_tokens for node in nodes):>7.0f} {sum(node.cache_hits for node in nodes):>6}"
+        )
+
+
+def report_chains(runs: list[Run], top: int) -> None:
+    by_chain: dict[str, list[Run]] = defaultdict(list)
+    for run in runs:
+        by_chain[run.chain].append(run)
+    overall_p95 = percentile([run.summary.duration for run in runs], 95)
+
+    rows = []
+    for chain, chain_runs in by_chain.items():
+        durations = [run.summary.duration for run in chain_runs]
+        # the node with the largest share of the chain's time
+        node_time: dict[str, float] = defaultdict(float)
+        for run in chain_runs:
+            for node in run.nodes:
+                node_time[str(node.node)] += node.duration
+        bottleneck = max(node_time, key=node_time.__getitem__)
+        share = node_time[bottleneck] / (sum(durations) or 1.0)
+        rows.append((percentile(durations, 95), chain, len(chain_runs), percentile(durations, 50), bottleneck, share))
+
+    print(f"all runs: {len(runs)}, p95 {overall_p95 * 1000:.1f} ms\n")
+    print(f"{'':<4} {'runs':>6} {'p50 ms':>8} {'p95 ms':>8}  {'slowest node':<28} chain")
+    for p95, chain, count, p50, bottleneck, share in sorted(rows, reverse=True)[:top]:
+        flag = "SLOW" if p95 > overall_p95 else ""
+        slowest = f"{bottleneck} ({share:.0%})"
+        print(f"{flag:<4} {count:>6} {p50 * 1000:>8.1f} {p95 * 1000:>8.1f}  {slowest:<28} {chain}")
+
+
+def replay(run: Run) -> None:
+    summary = run.summary
+    started = datetime.fromtimestamp(summary.started_at, UTC)
+    print(
+        f"run {summary.run_id}  {started:%Y-%m-%d %H:%M:%S}  route {summary.route or '-'}  {summary.outcome}  "
+        f"{summary.duration * 1000:.1f} ms  tokens {summary.input_tokens}/{summary.output_tokens}"
+    )
+    print(f"  {'+ms':>8} {'node':<20} {'ms':>8} {'queue ms':>8} {'in tok':>7} {'out tok':>7}  next")
+    for node in run.nodes:
+        next_node = node.next_node or (f"{node.outcome}: {node.error}" if node.error else "end")
+        offset = node.started_at - summary.started_at
+        print(
+            f"  {offset * 1000:>8.1f} {str(node.node):<20} {node.duration * 1000:>8.1f} "
+            f"{node.queue_seconds * 1000:>8.1f} {node.input_tokens:>7} {node.output_tokens:>7}  {next_node}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["routes", "nodes", "chains", "replay"])
+    parser.add_argument("run_id", nargs="?", help="Run to replay (default: the --top slowest runs)")
+    parser.add_argument("--dir", type=Path, default=Path(settings.run_log_dir), help="Directory of JSONL segments")
+    parser.add_argument("--postgres", action="store_true", help="Read events from the graphrunevent table")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="Only runs started at or after this time (ISO)")
+    parser.add_argument("--top", type=int, default=10, help="Chains or runs to show")
+    args = parser.parse_args()
+
+    since = args.since.replace(tzinfo=args.since.tzinfo or UTC).timestamp() if args.since else 0.0
+    events = load_postgres(since) if args.postgres else load_jsonl(args.dir, since)
+    runs = group_runs(events)
+    if not runs:
+        parser.exit(1, "no runs in the event log\n")
+
+    if args.command == "routes":
+        report_routes(runs)
+    elif args.command == "nodes":
+        report_nodes(runs)
+    elif args.command == "chains":
+        report_chains(runs, args.top)
+    elif args.run_id is not None:
+        matching = [run for run in runs if run.summary.run_id == args.run_id]
+        if not matching:
+            parser.exit(1, f"run {args.run_id} is not in the event log\n")
+        replay(matching[0])
+    else:
+        for run in sorted(runs, key=lambda run: -run.summary.duration)[: args.top]:
+            replay(run)
+            print()
+
+
+if __name__ == "__main__":
+    main()